@@ -1,6 +1,62 @@
 from __future__ import annotations
-from views.main_menu import MainMenu
+import argparse
+import sys
+from pathlib import Path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Centre Échecs : gestion de joueurs et de tournois.")
+    parser.add_argument("--script", help="fichier de commandes exécuté sans interface ('-' = entrée standard)")
+    parser.add_argument("--data-dir", default="data", help="dossier des données (défaut : data)")
+    parser.add_argument("--check", action="store_true", help="vérifie l'intégrité des données puis quitte")
+    parser.add_argument("--repair", action="store_true", help="avec --check : corrige les cas sans risque")
+    parser.add_argument("--dedup", action="store_true", help="cherche les doublons de joueurs et propose leur fusion")
+    parser.add_argument("--yes", action="store_true", help="avec --dedup : accepte toutes les fusions proposées")
+    args = parser.parse_args()
+
+    if args.check:
+        from storage.integrity import check_archive
+
+        issues = check_archive(Path(args.data_dir), repair=args.repair)
+        for issue in issues:
+            print(issue)
+        remaining = sum(1 for issue in issues if not issue.repaired)
+        print(f"{len(issues)} problème(s), dont {len(issues) - remaining} réparé(s).")
+        sys.exit(1 if remaining else 0)
+
+    from storage.json_store import JsonStore
+
+    data_dir = Path(args.data_dir)
+    store = JsonStore(str(data_dir / "players.json"), str(data_dir / "tournaments" / "tournaments.json"))
+    if args.dedup:
+        from controllers.player_controller import PlayerController
+        from controllers.tournament_controller import TournamentController
+        from views.dedup_view import DedupView
+
+        player_controller = PlayerController(store)
+        player_index = {player.player_id: player for player in player_controller.players}
+        tournament_controller = TournamentController(store, player_index)
+        try:
+            DedupView(player_controller, tournament_controller).run(accept_all=args.yes)
+        finally:
+            tournament_controller.close()
+        return
+
+    if args.script:
+        from controllers.batch_controller import BatchController
+
+        lines = sys.stdin if args.script == "-" else Path(args.script).read_text(encoding="utf-8").splitlines()
+        try:
+            executed = BatchController(store).run(lines)
+        except ValueError as error:
+            sys.exit(f"Erreur: {error}")
+        print(f"{executed} commandes exécutées.")
+        return
+
+    from views.main_menu import MainMenu
+
+    MainMenu(store).run()
 
 
 if __name__ == "__main__":
-    MainMenu().run()
+    main()
@@ -0,0 +1,106 @@
+"""Mode serveur : latence de saisie des petits tournois pendant l'appariement d'un grand open.
+
+Usage : python -m benchmarks.festival [--open 600] [--events 19] [--field 12] [--inline]
+Un open de N joueurs (couplage optimal) est apparié pendant que des résultats sont saisis en continu
+dans les autres tournois ; `--inline` apparie dans le fil appelant, pour comparaison.
+"""
+from __future__ import annotations
+import argparse
+import random
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+from benchmarks.loadgen import generate_players
+from controllers.server_controller import ServerController
+from storage.json_store import JsonStore
+from utils.pairing import BYE
+
+
+def _play_round(server: ServerController, name: str, rng: random.Random) -> None:
+    with server.tournament(name) as tournament:
+        round_index = len(tournament.rounds) - 1
+        matches = list(enumerate(tournament.rounds[-1].matches))
+    for index, (_, (player_b, _)) in matches:
+        if player_b != BYE:
+            server.run(name, "enter_result", round_index, index, *rng.choice([(1, 0), (0, 1)]))
+    server.run(name, "end_current_round")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--open", type=int, default=600, help="joueurs de l'open")
+    parser.add_argument("--events", type=int, default=19, help="petits tournois simultanés")
+    parser.add_argument("--field", type=int, default=12, help="joueurs par petit tournoi")
+    parser.add_argument("--inline", action="store_true", help="apparier dans le fil appelant (sans pool)")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as scratch:
+        store = JsonStore(str(Path(scratch) / "players.json"), str(Path(scratch) / "tournaments" / "t.json"))
+        players = generate_players(args.open + args.events * args.field, rng)
+        store.save_players(players)
+        server = ServerController(store, {player.player_id: player for player in players})
+        if args.inline:
+            server.controller.pairing_pool.shutdown()
+            server.controller.pairing_pool = None
+        small: List[str] = []
+        server.create_tournament("Open", "Lyon", "2025-07-01", "2025-07-03", 9, pairing_system="matching")
+        for player in players[:args.open]:
+            server.run("Open", "register_player", player.player_id)
+        for event in range(args.events):
+            name = f"Rapide {event + 1}"
+            small.append(name)
+            server.create_tournament(name, "Lyon", "2025-07-01", "2025-07-01", 9)
+            start = args.open + event * args.field
+            for player in players[start:start + args.field]:
+                server.run(name, "register_player", player.player_id)
+        for name in ["Open"] + small:
+            server.run(name, "start_next_round")
+            _play_round(server, name, rng)
+        for name in small:
+            server.run(name, "start_next_round")
+
+        # Saisie continue dans les petits tournois pendant l'appariement de l'open
+        pairing_done = threading.Event()
+        pairing_time: List[float] = []
+
+        def pair_open() -> None:
+            started = time.perf_counter()
+            server.run("Open", "start_next_round")
+            pairing_time.append(time.perf_counter() - started)
+            pairing_done.set()
+
+        latencies: List[float] = []
+        pairing = threading.Thread(target=pair_open)
+        pairing.start()
+        while not pairing_done.is_set():
+            for name in small:
+                with server.tournament(name) as tournament:
+                    round_index = len(tournament.rounds) - 1
+                    # Toutes les tables jouées, la dernière comprise ; l'exempt n'a pas de résultat
+                    boards = [
+                        index for index, (_, (player_b, _)) in enumerate(tournament.rounds[-1].matches)
+                        if player_b != BYE
+                    ]
+                started = time.perf_counter()
+                server.run(name, "enter_result", round_index, rng.choice(boards), 0.5, 0.5)
+                latencies.append(time.perf_counter() - started)
+        pairing.join()
+        server.close()
+
+    latencies.sort()
+    print(f"Appariement de l'open ({args.open} joueurs) : {pairing_time[0] * 1000:.0f} ms"
+          + (" (dans le fil appelant)" if args.inline else " (pool de processus)"))
+    print(
+        f"Saisies pendant l'appariement : {len(latencies)}, médiane {statistics.median(latencies) * 1000:.2f} ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms, max {latencies[-1] * 1000:.2f} ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,171 @@
+"""Générateur de jeux de données synthétiques : joueurs, tournois et parties à grande échelle.
+
+Usage : python -m benchmarks.loadgen --players 10000 --tournaments 200 --rounds 7 --field 120 --data-dir /tmp/charge
+Sert aussi de fixture : `generate_dataset(...)` retourne les objets sans rien écrire si `store` est None.
+"""
+from __future__ import annotations
+import argparse
+import random
+import string
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from models.player import Player
+from models.tournament import Tournament, Round
+from storage.json_store import JsonStore
+from utils.pairing import generate_round, BYE
+from utils.simulation import result_probabilities
+
+FIRST_NAMES = [
+    "Alice", "Bob", "Charlie", "Diane", "Eve", "Frank", "Grace", "Hugo", "Ivy", "Jack", "Kara", "Leo",
+    "Mona", "Nina", "Oscar", "Paul", "Quinn", "Rita", "Sam", "Tina", "Uma", "Vera", "Will", "Yann", "Zoe",
+]
+LAST_NAMES = [
+    "Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand", "Leroy", "Moreau",
+    "Simon", "Laurent", "Lefebvre", "Michel", "Garcia", "David", "Bertrand", "Roux", "Vincent", "Fournier",
+]
+TIME_CONTROLS = ["5400+30", "3600+30", "900+10", "180+2"]  # cadences PGN (base+incrément, secondes)
+CITIES = ["Paris", "Lyon", "Marseille", "Toulouse", "Lille", "Nantes", "Nice", "Bordeaux"]
+
+
+def national_id(index: int) -> str:
+    """Identifiant national unique et valide pour un index (jusqu'à 67,6 millions)."""
+    letters, number = divmod(index, 100_000)
+    first, second = divmod(letters % (26 * 26), 26)
+    return f"{string.ascii_uppercase[first]}{string.ascii_uppercase[second]}{number:05d}"
+
+
+def generate_players(count: int, rng: random.Random) -> List[Player]:
+    today = date.today()
+    return [
+        Player(
+            player_id=national_id(index),
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            birthdate=(today - timedelta(days=rng.randint(18 * 365 + 5, 80 * 365))).isoformat(),
+            rating=max(1000, min(2800, int(rng.gauss(1600, 300)))),
+        )
+        for index in range(count)
+    ]
+
+
+def play_round(round_obj: Round, ratings: dict, rng: random.Random) -> None:
+    """Tire les résultats d'un tour selon l'écart Elo des deux joueurs."""
+    for match in round_obj.matches:
+        (player_a, _), (player_b, _) = match
+        if player_b == BYE:
+            continue
+        win, draw = result_probabilities(ratings[player_a], ratings[player_b])
+        roll = rng.random()
+        if roll < win:
+            match[0][1], match[1][1] = 1.0, 0.0
+        elif roll < win + draw:
+            match[0][1], match[1][1] = 0.5, 0.5
+        else:
+            match[0][1], match[1][1] = 0.0, 1.0
+
+
+def time_round(round_obj: Round, started_at: int, time_control: str, rng: random.Random) -> None:
+    """Horodate les parties jouées d'un tour ; le tour se termine avec sa dernière partie."""
+    base, increment = (int(part) for part in time_control.split("+"))
+    finished = started_at
+    for match in round_obj.matches:
+        if match[1][0] == BYE:
+            round_obj.clocks.append([0, 0])
+            continue
+        # Une partie dure de quelques coups à presque tout le temps des deux joueurs
+        moves = rng.randint(20, 90)
+        length = int(min(2 * base + moves * 2 * increment, rng.uniform(0.2, 1.0) * 2 * (base + 40 * increment)))
+        round_obj.clocks.append([started_at, started_at + length])
+        finished = max(finished, started_at + length)
+    round_obj.end_datetime = datetime.fromtimestamp(finished).isoformat(timespec="seconds")
+
+
+def generate_tournament(
+    index: int,
+    players: List[Player],
+    num_rounds: int,
+    field_size: int,
+    rng: random.Random,
+    pairing_system: str = "swiss",
+) -> Tournament:
+    """Tournoi terminé : inscrits tirés au hasard, tours appariés par le moteur réel puis joués."""
+    start = date(2015, 1, 1) + timedelta(days=rng.randint(0, 3650))
+    entrants = rng.sample(players, min(field_size, len(players)))
+    tournament = Tournament(
+        name=f"Open {rng.choice(CITIES)} {index}",
+        location=rng.choice(CITIES),
+        start_date=start.isoformat(),
+        end_date=(start + timedelta(days=num_rounds // 3)).isoformat(),
+        num_rounds=num_rounds,
+        players=[player.player_id for player in entrants],
+        seed=rng.getrandbits(32),
+        pairing_system=pairing_system,
+    )
+    timing = random.Random(tournament.seed)  # tirage à part : les résultats restent ceux des versions précédentes
+    tournament.time_control = timing.choice(TIME_CONTROLS)
+    ratings = {player.player_id: player.rating for player in entrants}
+    clock = datetime.combine(start, datetime.min.time()) + timedelta(hours=9)
+    for round_number in range(num_rounds):
+        matches, _ = generate_round(pairing_system, tournament.players, tournament.rounds, tournament.seed)
+        round_obj = Round(
+            name=f"Round {round_number + 1}",
+            start_datetime=clock.isoformat(timespec="seconds"),
+            end_datetime=(clock + timedelta(hours=4)).isoformat(timespec="seconds"),
+            matches=matches,
+        )
+        play_round(round_obj, ratings, rng)
+        time_round(round_obj, int(clock.timestamp()), tournament.time_control, timing)
+        tournament.rounds.append(round_obj)
+        clock += timedelta(hours=5)
+    tournament.current_round_index = num_rounds
+    return tournament
+
+
+def generate_dataset(
+    store: Optional[JsonStore],
+    players: int,
+    tournaments: int,
+    num_rounds: int,
+    field_size: int,
+    seed: int = 0,
+) -> Tuple[List[Player], List[Tournament]]:
+    """Construit tout le jeu de données puis l'écrit en une fois via la couche de stockage."""
+    rng = random.Random(seed)
+    player_list = generate_players(players, rng)
+    tournament_list = [
+        generate_tournament(index, player_list, num_rounds, field_size, rng) for index in range(1, tournaments + 1)
+    ]
+    if store is not None:
+        store.save_players(player_list)
+        store.save_tournaments(tournament_list)
+    return player_list, tournament_list
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=1_000)
+    parser.add_argument("--tournaments", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--field", type=int, default=60, help="joueurs par tournoi")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", required=True, help="dossier cible (jamais les données réelles par défaut)")
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    store = JsonStore(str(data_dir / "players.json"), str(data_dir / "tournaments" / "tournaments.json"))
+    started = time.perf_counter()
+    player_list, tournament_list = generate_dataset(
+        store, args.players, args.tournaments, args.rounds, args.field, args.seed
+    )
+    games = sum(len(round_obj.matches) for tournament in tournament_list for round_obj in tournament.rounds)
+    print(
+        f"{len(player_list)} joueurs, {len(tournament_list)} tournois, {games} parties "
+        f"écrits dans {data_dir} en {time.perf_counter() - started:.1f} s."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""Propriétés du moteur d'appariement, vérifiées tour par tour sur des milliers de tournois aléatoires.
+
+Usage : python -m benchmarks.pairing_check [--tournaments 2000] [--min-players 2] [--max-players 400]
+        [--rounds 9] [--systems swiss,matching,round_robin,double_round_robin] [--budget-ms 1000]
+        [--workers N] [--seed 1] [--case K]
+Chaque tournoi est tiré de la graine et de son numéro (rejouable seul avec --case) : effectif,
+système, résultats, forfaits et abandons. Les tournois sont répartis sur les cœurs ; le script
+affiche la durée d'appariement par taille et échoue (code 1) sur toute violation d'une propriété
+et sur tout appariement plus lent que le budget.
+"""
+from __future__ import annotations
+import argparse
+import math
+import os
+import random
+import statistics
+import time
+from collections import Counter
+from functools import partial
+from typing import Dict, List, Optional, Set, Tuple
+
+from benchmarks.loadgen import play_round
+from models.tournament import Round
+from utils.matching import max_weight_matching
+from utils.pairing import (
+    BYE, PAIRING_SYSTEMS, ROUND_ROBIN_SYSTEMS, berger_table, bye_recipients, colour_history, generate_round,
+    opponents, scheduled_round,
+)
+
+# Propriétés promises par chaque système, au-delà de la couverture (chacun joue ou est exempt, une fois).
+# Le suisse simple apparie les voisins au classement en évitant les revanches, sans promesse de couleurs.
+# Revanche et second exempt comptent autant : « repeats » vérifie qu'un tour n'en fait pas plus que le
+# minimum possible, toutes confondues.
+CONTRACTS = {
+    "swiss": ("byes", "repeats"),
+    "matching": ("repeats", "colour_claims"),
+    "round_robin": ("schedule", "colour_limits"),
+    "double_round_robin": ("schedule", "colour_limits"),
+}
+ROUND_ROBIN_MAX_PLAYERS = 30  # au-delà, le toutes-rondes n'a guère de sens (et le tour dure trop)
+FORFEIT_RATE = 0.02  # part des parties perdues par forfait (jouables à nouveau plus tard)
+WITHDRAWAL_RATE = 0.1  # probabilité qu'un joueur abandonne après un tour
+SIZE_BUCKETS = (8, 16, 32, 64, 128, 256, 512, 1024, 2048)
+
+Timing = Tuple[str, int, float]  # (système, joueurs appariés, secondes)
+
+
+def _colour_claim(history: str) -> Tuple[Optional[str], int]:
+    """Couleur due et force de la demande : 2 impérative, 1 préférence, 0 aucune.
+
+    Écrit indépendamment du moteur : la couleur la moins jouée, sinon l'alternance ; impérative
+    après deux fois la même couleur ou avec deux parties d'écart.
+    """
+    if not history:
+        return None, 0
+    gap = 2 * history.count("W") - len(history)
+    colour = ("B" if gap > 0 else "W") if gap else ("B" if history[-1] == "W" else "W")
+    absolute = abs(gap) >= 2 or (len(history) >= 2 and history[-1] == history[-2])
+    return colour, 2 if absolute else 1
+
+
+def _fewest_repeats(active: List[str], met: Dict[str, Set[str]], had_bye: Set[str]) -> int:
+    """Plus petit nombre de revanches et de seconds exempts possible pour ce tour (couplage exact)."""
+    count = len(active)
+    # Poids 2 pour une paire inédite, 1 pour une revanche : le couplage parfait le plus lourd en a le moins
+    edges = [
+        (i, j, 1 if active[j] in met.get(active[i], ()) else 2)
+        for i in range(count)
+        for j in range(i + 1, count)
+    ]
+    if count % 2:
+        edges.extend((i, count, 1 if active[i] in had_bye else 2) for i in range(count))
+    mate = max_weight_matching(edges, maxcardinality=True)
+    weights = {(i, j): weight for i, j, weight in edges}
+    best = sum(weights[(i, j)] for i, j in enumerate(mate) if i < j)
+    return (count + count % 2) - best
+
+
+def check_round(system: str, active: List[str], previous: List[Round], matches: List) -> List[str]:
+    """Violations des propriétés de `system` pour un tour généré à partir de `previous`."""
+    problems: List[str] = []
+    seen = Counter()
+    byes: List[str] = []
+    for (player_a, _), (player_b, _) in matches:
+        if player_a == BYE:
+            problems.append("exempt placé aux Blancs")
+        seen[player_a] += 1
+        if player_b == BYE:
+            byes.append(player_a)
+        else:
+            seen[player_b] += 1
+    expected = set(active)
+    missing = expected - set(seen)
+    if missing:
+        problems.append(f"joueurs oubliés : {', '.join(sorted(missing))}")
+    unknown = set(seen) - expected - {BYE}
+    if unknown:
+        problems.append(f"joueurs non inscrits appariés : {', '.join(sorted(unknown))}")
+    twice = sorted(player_id for player_id, count in seen.items() if count > 1 and player_id != BYE)
+    if twice:
+        problems.append(f"joueurs appariés deux fois : {', '.join(twice)}")
+    if len(byes) != len(active) % 2:
+        problems.append(f"{len(byes)} exempt(s) pour {len(active)} joueurs")
+
+    contract = CONTRACTS[system]
+    had_bye = bye_recipients(previous)
+    repeated_byes = [player_id for player_id in byes if player_id in had_bye]
+    if "byes" in contract and repeated_byes and not expected <= had_bye:
+        problems.append(f"second exempt évitable : {', '.join(repeated_byes)}")
+    games = [(player_a, player_b) for (player_a, _), (player_b, _) in matches if player_b != BYE]
+    if "repeats" in contract:
+        # Revanche et second exempt pèsent autant : seul compte leur nombre total, s'il pouvait être moindre
+        met = opponents(previous)
+        repeats = [f"{white}-{black}" for white, black in games if black in met.get(white, ())]
+        repeats += [f"exempt {player_id}" for player_id in repeated_byes]
+        if repeats and len(repeats) > _fewest_repeats(sorted(active), met, had_bye):
+            problems.append(f"revanches ou seconds exempts évitables : {', '.join(repeats)}")
+    if "colour_claims" in contract or "colour_limits" in contract:
+        histories = colour_history(previous)
+        for white, black in games:
+            (white_due, white_claim), (black_due, black_claim) = (
+                _colour_claim(histories.get(white, "")), _colour_claim(histories.get(black, ""))
+            )
+            if "colour_claims" in contract:
+                # Une demande non satisfaite doit céder devant une demande au moins aussi forte de l'adversaire
+                if white_due == "B" and white_claim > (black_claim if black_due == "B" else 0):
+                    problems.append(f"{white} avait droit aux Noirs contre {black}")
+                if black_due == "W" and black_claim > (white_claim if white_due == "W" else 0):
+                    problems.append(f"{black} avait droit aux Blancs contre {white}")
+            if "colour_limits" in contract:
+                for player_id, colour in ((white, "W"), (black, "B")):
+                    history = histories.get(player_id, "") + colour
+                    if history.endswith(colour * 3) or abs(2 * history.count("W") - len(history)) > 2:
+                        problems.append(f"{player_id} : couleurs {history}")
+    return problems
+
+
+def check_schedule(system: str, player_ids: List[str], rounds: List[Round]) -> List[str]:
+    """Toutes-rondes complet : chaque paire se rencontre une fois par cycle, couleurs inversées au retour."""
+    meetings: Dict[frozenset, List[str]] = {}
+    byes: Counter = Counter()
+    for round_obj in rounds:
+        for (player_a, _), (player_b, _) in round_obj.matches:
+            if player_b == BYE:
+                byes[player_a] += 1
+            else:
+                meetings.setdefault(frozenset((player_a, player_b)), []).append(player_a)
+    cycles = 2 if ROUND_ROBIN_SYSTEMS[system] else 1
+    problems: List[str] = []
+    expected_pairs = len(player_ids) * (len(player_ids) - 1) // 2
+    if len(meetings) != expected_pairs:
+        problems.append(f"{len(meetings)} paires rencontrées sur {expected_pairs}")
+    for pair, whites in meetings.items():
+        if len(whites) != cycles or len(set(whites)) != cycles:
+            problems.append(f"{'-'.join(sorted(pair))} : {len(whites)} partie(s), Blancs {', '.join(whites)}")
+    if len(player_ids) % 2 and set(byes.values()) != {cycles}:
+        problems.append("exempts inégaux entre les joueurs")
+    return problems
+
+
+def _field_size(rng: random.Random, low: int, high: int) -> int:
+    # Répartition log-uniforme : beaucoup de petits tournois, quelques très grands
+    return min(high, max(low, int(math.exp(rng.uniform(math.log(low), math.log(high + 1))))))
+
+
+def run_case(case: int, seed: int, systems: Tuple[str, ...], min_players: int, max_players: int, max_rounds: int):
+    """Un tournoi aléatoire apparié et joué de bout en bout ; (violations, durées d'appariement)."""
+    rng = random.Random(f"{seed}:{case}")
+    system = rng.choice(systems)
+    if system in ROUND_ROBIN_SYSTEMS:
+        size = _field_size(rng, min_players, min(max_players, ROUND_ROBIN_MAX_PLAYERS))
+    else:
+        size = _field_size(rng, min_players, max_players)
+    player_ids = [f"P{index:04d}" for index in range(size)]
+    ratings = {player_id: rng.randint(1000, 2700) for player_id in player_ids}
+    tournament_seed = rng.getrandbits(32)
+    problems: List[str] = []
+    timings: List[Timing] = []
+    rounds: List[Round] = []
+
+    if system in ROUND_ROBIN_SYSTEMS:
+        started = time.perf_counter()
+        table = berger_table(size, ROUND_ROBIN_SYSTEMS[system])
+        build = time.perf_counter() - started
+        for number, flat in enumerate(table, start=1):
+            started = time.perf_counter()
+            matches = scheduled_round(flat, player_ids)
+            timings.append((system, size, time.perf_counter() - started + (build if number == 1 else 0.0)))
+            # Couleurs vérifiées sur tout le calendrier, jonction des deux cycles comprise
+            problems.extend(
+                f"ronde {number} : {problem}" for problem in check_round(system, player_ids, rounds, matches)
+            )
+            rounds.append(_play(matches, ratings, rng, forfeits=False))
+        problems.extend(check_schedule(system, player_ids, rounds))
+    else:
+        active = player_ids[:]
+        for number in range(1, rng.randint(1, max_rounds) + 1):
+            matches, elapsed = generate_round(system, active, rounds, tournament_seed)
+            timings.append((system, len(active), elapsed))
+            problems.extend(f"ronde {number} : {problem}" for problem in check_round(system, active, rounds, matches))
+            rounds.append(_play(matches, ratings, rng))
+            if len(active) > 2 and rng.random() < WITHDRAWAL_RATE:
+                active.remove(rng.choice(active))
+    return [f"tournoi {case} ({system}, {size} joueurs) : {problem}" for problem in problems], timings
+
+
+def _play(matches: List, ratings: Dict[str, int], rng: random.Random, forfeits: bool = True) -> Round:
+    """Résultats tirés selon l'écart Elo ; quelques parties perdues par forfait (systèmes suisses)."""
+    round_obj = Round(name="", start_datetime="", matches=matches)
+    play_round(round_obj, ratings, rng)
+    if not forfeits:
+        return round_obj
+    for index, (side_a, side_b) in enumerate(round_obj.matches):
+        if side_b[0] != BYE and rng.random() < FORFEIT_RATE:
+            side_a[1], side_b[1] = rng.choice([(1.0, 0.0), (0.0, 1.0)])
+            round_obj.forfeits.append(index)
+    return round_obj
+
+
+def _bucket(size: int) -> int:
+    return next((limit for limit in SIZE_BUCKETS if size <= limit), size)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tournaments", type=int, default=2000, help="tournois aléatoires à vérifier")
+    parser.add_argument("--min-players", type=int, default=2)
+    parser.add_argument("--max-players", type=int, default=400)
+    parser.add_argument("--rounds", type=int, default=9, help="tours au plus (systèmes suisses)")
+    parser.add_argument(
+        "--systems", default=",".join([*PAIRING_SYSTEMS, *ROUND_ROBIN_SYSTEMS]),
+        help="systèmes, séparés par des virgules",
+    )
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="durée maximale d'un appariement")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processus (1 = sans pool)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--case", type=int, help="ne rejouer que ce tournoi (régression)")
+    args = parser.parse_args()
+
+    systems = tuple(name.strip() for name in args.systems.split(",") if name.strip())
+    unknown = [name for name in systems if name not in CONTRACTS]
+    if unknown or args.min_players < 2 or args.max_players < args.min_players:
+        parser.error(f"systèmes inconnus : {', '.join(unknown)}" if unknown else "effectifs invalides")
+    check = partial(
+        run_case, seed=args.seed, systems=systems, min_players=args.min_players,
+        max_players=args.max_players, max_rounds=args.rounds,
+    )
+    cases = [args.case] if args.case is not None else list(range(args.tournaments))
+
+    started = time.perf_counter()
+    if args.workers < 2 or len(cases) < 2:
+        results = [check(case) for case in cases]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(check, cases, chunksize=max(1, len(cases) // (args.workers * 8))))
+    wall = time.perf_counter() - started
+
+    problems: List[str] = []
+    by_bucket: Dict[Tuple[str, int], List[float]] = {}
+    slow: List[str] = []
+    for case, (case_problems, timings) in zip(cases, results):
+        problems.extend(case_problems)
+        for system, size, elapsed in timings:
+            by_bucket.setdefault((system, _bucket(size)), []).append(elapsed)
+            if elapsed * 1000 > args.budget_ms:
+                slow.append(f"tournoi {case} ({system}, {size} joueurs) : {elapsed * 1000:.1f} ms")
+
+    pairings = sum(len(timings) for _, timings in results)
+    print(f"{len(cases)} tournois, {pairings} appariements vérifiés en {wall:.1f} s ({args.workers} processus)")
+    print(f"{'système':<20}{'joueurs':>9}{'tours':>8}{'médiane ms':>12}{'max ms':>10}")
+    order = {system: index for index, system in enumerate(systems)}
+    for (system, bucket), durations in sorted(by_bucket.items(), key=lambda item: (order[item[0][0]], item[0][1])):
+        print(
+            f"{system:<20}{'≤ ' + str(bucket):>9}{len(durations):>8}"
+            f"{statistics.median(durations) * 1000:>12.2f}{max(durations) * 1000:>10.2f}"
+        )
+    for problem in problems[:50]:
+        print(f"VIOLATION {problem}")
+    if len(problems) > 50:
+        print(f"... et {len(problems) - 50} autres violations")
+    for line in slow[:20]:
+        print(f"TROP LENT (budget {args.budget_ms:g} ms) {line}")
+    if problems or slow:
+        # Un tournoi dépend de la graine, des systèmes et des effectifs : les mêmes options le rejouent
+        print(
+            "Rejouer un tournoi : python -m benchmarks.pairing_check"
+            f" --seed {args.seed} --systems {','.join(systems)} --min-players {args.min_players}"
+            f" --max-players {args.max_players} --rounds {args.rounds} --case <numéro>"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
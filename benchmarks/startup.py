@@ -0,0 +1,98 @@
+"""Mesure du temps de démarrage : délai jusqu'au premier menu et modules les plus lents à importer.
+
+Usage : python -m benchmarks.startup [--budget-ms 250] [--runs 5] [--top 10]
+Le script échoue (code 1) si le délai médian jusqu'au premier prompt dépasse le budget.
+"""
+from __future__ import annotations
+import argparse
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+FIRST_PROMPT = "> "
+
+
+def time_to_first_prompt(data_dir: Path) -> float:
+    """Lance l'application, attend l'affichage du menu principal puis quitte (choix 0)."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "app.py", "--data-dir", str(data_dir)],
+        cwd=ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        bufsize=0,
+    )
+    seen = ""
+    while not seen.endswith(FIRST_PROMPT):
+        char = process.stdout.read(1)
+        if not char:
+            raise RuntimeError("L'application s'est arrêtée avant d'afficher le menu.")
+        seen += char
+    elapsed = time.perf_counter() - started
+    process.communicate("0\n")
+    return elapsed
+
+
+def slowest_imports(data_dir: Path, top: int) -> List[Tuple[int, str]]:
+    """Modules les plus coûteux (temps cumulé en µs) d'après `python -X importtime`, sur le vrai démarrage.
+
+    `app.py` n'importe presque rien au niveau du module : on lance donc l'application jusqu'au
+    menu principal (puis choix 0) pour voir les modules réellement chargés au démarrage.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "app.py", "--data-dir", str(data_dir)],
+        cwd=ROOT,
+        input="0\n",
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: List[Tuple[int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        timings.append((int(cumulative), module.strip()))
+    return sorted(timings, reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="délai maximal jusqu'au premier menu")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="nombre de modules affichés")
+    args = parser.parse_args()
+
+    samples = []
+    for _ in range(args.runs):
+        # Chaque lancement part d'une copie neuve : quitter l'application enregistre (et archive)
+        with tempfile.TemporaryDirectory() as scratch:
+            data_dir = Path(scratch) / "data"
+            shutil.copytree(ROOT / "data", data_dir)
+            samples.append(time_to_first_prompt(data_dir) * 1000)
+    median = statistics.median(samples)
+    print(f"Premier menu : médiane {median:.0f} ms (min {min(samples):.0f}, max {max(samples):.0f})")
+    print("Imports les plus lents (cumulé) :")
+    with tempfile.TemporaryDirectory() as scratch:
+        data_dir = Path(scratch) / "data"
+        shutil.copytree(ROOT / "data", data_dir)
+        imports = slowest_imports(data_dir, args.top)
+    for cumulative, module in imports:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+    if median > args.budget_ms:
+        print(f"ÉCHEC : budget de {args.budget_ms:.0f} ms dépassé.")
+        return 1
+    print(f"OK : sous le budget de {args.budget_ms:.0f} ms.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+from __future__ import annotations
+import json
+import random
+import re
+import shlex
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from storage.json_store import JsonStore
+from controllers.player_controller import PlayerController
+from controllers.tournament_controller import TournamentController
+from models.tournament import Tournament
+from utils.pairing import BYE
+from utils.teams import UNPLAYED
+
+RESULTS = {"1-0": (1.0, 0.0), "0-1": (0.0, 1.0), "0.5-0.5": (0.5, 0.5), "1/2-1/2": (0.5, 0.5)}
+FORFEITS = {"+/-": (1.0, 0.0), "-/+": (0.0, 1.0), "-/-": (0.0, 0.0)}  # parties non jouées
+# Options reconnues (clé=valeur) ; tout autre argument, même avec un « = », reste positionnel
+OPTIONS = {"rounds", "description", "system", "sections", "boards", "tc", "section", "seed"}
+OPTION = re.compile(r"([a-z_]+)=(.*)", re.DOTALL)
+
+
+class BatchController:
+    """Run a command script against the controllers, without views, saving once at the end.
+
+    One command per line, arguments split like a shell (quotes allowed), `#` starts a comment.
+    Only `key=value` with a known key (OPTIONS) is an option; any other argument is positional:
+
+        player AB12345 Jean Dupont 1990-05-01 [elo]
+        tournament "Open de Lyon" Lyon 2025-06-01 2025-06-02 [rounds=5] [system=matching] [sections=A:1800,B:0]
+                   [tc=5400+30]   (cadence PGN : base+incrément en secondes)
+        tournament "Ligue" Lyon 2025-09-01 2026-05-31 boards=4   (épreuve par équipes, 4 échiquiers)
+        register "Open de Lyon" AB12345 [section=A]
+        team "Ligue" "Lyon Échecs" AB12345 CD67890 ...   (joueurs dans l'ordre des échiquiers)
+        lineup "Ligue" <tour> <match> 1|2 AB12345 ...    (composition d'une équipe, avant tout résultat)
+        board "Ligue" <tour> <match> 1N0+   (un caractère par échiquier : 1 0 N + - *, . inchangé)
+        withdraw "Open de Lyon" AB12345      (abandon : plus apparié, partie en cours perdue par forfait)
+        start "Open de Lyon"
+        result "Open de Lyon" <tour> <table> 1-0|0-1|0.5-0.5|+/-|-/+|-/- [section=A]
+        simulate "Open de Lyon" [seed=1]     (résultats aléatoires pour les tables encore sans résultat)
+        end "Open de Lyon"
+        pgn "Open de Lyon" parties.pgn [section=A]   (rattache chaque partie à sa table : balises Round/Board ou noms)
+        export "Open de Lyon" chemin.json   (ou chemin.pgn : toutes les parties du tournoi)
+    """
+
+    def __init__(self, store: JsonStore) -> None:
+        self.player_controller = PlayerController(store)
+        self.player_index = {player.player_id: player for player in self.player_controller.players}
+        self.tournament_controller = TournamentController(store, self.player_index)
+        self.player_controller.autosave = False
+        self.tournament_controller.autosave = False
+
+    def run(self, lines: Iterable[str]) -> int:
+        """Execute every command, then persist; returns the number of commands run."""
+        executed = 0
+        for line_number, line in enumerate(lines, start=1):
+            tokens = shlex.split(line, comments=True)
+            if not tokens:
+                continue
+            command, arguments = tokens[0].lower(), tokens[1:]
+            handler = getattr(self, f"_cmd_{command}", None)
+            if handler is None:
+                raise ValueError(f"Ligne {line_number} : commande inconnue « {command} ».")
+            positional: List[str] = []
+            options: Dict[str, str] = {}
+            for arg in arguments:
+                option = OPTION.fullmatch(arg)
+                if option and option.group(1) in OPTIONS:
+                    options[option.group(1)] = option.group(2)
+                else:
+                    positional.append(arg)
+            try:
+                handler(positional, options)
+            except (ValueError, IndexError, KeyError) as error:
+                raise ValueError(f"Ligne {line_number} ({command}) : {error}") from error
+            executed += 1
+        self.player_controller.save()
+        self.tournament_controller.save()
+        return executed
+
+    def _tournament(self, name: str) -> Tournament:
+        tournament = self.tournament_controller.get_by_name(name)
+        if tournament is None:
+            raise ValueError(f"Tournoi introuvable : {name}.")
+        return tournament
+
+    def _cmd_player(self, args: List[str], options: Dict[str, str]) -> None:
+        player_id, first_name, last_name, birthdate = args[:4]
+        rating = int(args[4]) if len(args) > 4 else 0
+        player = self.player_controller.create_player(player_id.upper(), first_name, last_name, birthdate, rating)
+        self.player_index[player.player_id] = player
+
+    def _cmd_tournament(self, args: List[str], options: Dict[str, str]) -> None:
+        name, location, start_date, end_date = args[:4]
+        sections: Optional[List[Tuple[str, int]]] = None
+        if "sections" in options:
+            sections = [
+                (section_name, int(floor))
+                for section_name, floor in (item.split(":") for item in options["sections"].split(","))
+            ]
+        self.tournament_controller.create_tournament(
+            name,
+            location,
+            start_date,
+            end_date,
+            num_rounds=int(options.get("rounds", 4)),
+            description=options.get("description", ""),
+            pairing_system=options.get("system", "swiss"),
+            sections=sections,
+            boards=int(options.get("boards", 0)),
+            time_control=options.get("tc", ""),
+        )
+
+    def _cmd_register(self, args: List[str], options: Dict[str, str]) -> None:
+        tournament = self._tournament(args[0])
+        for player_id in args[1:]:
+            self.tournament_controller.register_player(tournament, player_id.upper(), options.get("section"))
+
+    def _cmd_team(self, args: List[str], options: Dict[str, str]) -> None:
+        self.tournament_controller.register_team(
+            self._tournament(args[0]), args[1], [player_id.upper() for player_id in args[2:]]
+        )
+
+    def _cmd_lineup(self, args: List[str], options: Dict[str, str]) -> None:
+        self.tournament_controller.set_lineup(
+            self._tournament(args[0]), int(args[1]) - 1, int(args[2]) - 1, int(args[3]) - 1,
+            [player_id.upper() for player_id in args[4:]],
+        )
+
+    def _cmd_board(self, args: List[str], options: Dict[str, str]) -> None:
+        tournament = self._tournament(args[0])
+        for board, result in enumerate(args[3]):
+            if result != UNPLAYED:
+                self.tournament_controller.enter_board_result(
+                    tournament, int(args[1]) - 1, int(args[2]) - 1, board, result
+                )
+
+    def _cmd_withdraw(self, args: List[str], options: Dict[str, str]) -> None:
+        tournament = self._tournament(args[0])
+        for player_id in args[1:]:
+            self.tournament_controller.remove_player(tournament, player_id.upper())
+
+    def _cmd_start(self, args: List[str], options: Dict[str, str]) -> None:
+        self.tournament_controller.start_next_round(self._tournament(args[0]))
+
+    def _cmd_result(self, args: List[str], options: Dict[str, str]) -> None:
+        tournament = self._tournament(args[0])
+        if args[3] not in RESULTS and args[3] not in FORFEITS:
+            raise ValueError(f"Résultat invalide : {args[3]}.")
+        score_a, score_b = RESULTS.get(args[3]) or FORFEITS[args[3]]
+        self.tournament_controller.enter_result(
+            tournament, int(args[1]) - 1, int(args[2]) - 1, score_a, score_b,
+            section=options.get("section"), forfeit=args[3] in FORFEITS,
+        )
+
+    def _cmd_simulate(self, args: List[str], options: Dict[str, str]) -> None:
+        tournament = self._tournament(args[0])
+        rng = random.Random(options.get("seed"))
+        round_index = len(tournament.rounds) - 1
+        if round_index < 0 or tournament.rounds[-1].end_datetime is not None:
+            raise ValueError("Aucun tour en cours.")
+        if tournament.boards:
+            for match_index, results in enumerate(tournament.rounds[round_index].boards):
+                for board, result in enumerate(results):
+                    if result == UNPLAYED:
+                        self.tournament_controller.enter_board_result(
+                            tournament, round_index, match_index, board, rng.choice("10N")
+                        )
+            return
+        for section_name, division in tournament.divisions():
+            round_obj = division.rounds[round_index]
+            for match_index, ((_, score_a), (player_b, score_b)) in enumerate(round_obj.matches):
+                # Un double forfait (0-0) est déjà un résultat
+                if player_b == BYE or match_index in round_obj.forfeits or float(score_a) + float(score_b) > 0:
+                    continue
+                score_a, score_b = rng.choice([(1.0, 0.0), (0.0, 1.0), (0.5, 0.5)])
+                self.tournament_controller.enter_result(
+                    tournament, round_index, match_index, score_a, score_b, section=section_name or None
+                )
+
+    def _cmd_end(self, args: List[str], options: Dict[str, str]) -> None:
+        self.tournament_controller.end_current_round(self._tournament(args[0]))
+
+    def _cmd_pgn(self, args: List[str], options: Dict[str, str]) -> None:
+        self.tournament_controller.import_pgn(
+            self._tournament(args[0]), Path(args[1]).read_text(encoding="utf-8"), options.get("section")
+        )
+
+    def _cmd_export(self, args: List[str], options: Dict[str, str]) -> None:
+        tournament = self._tournament(args[0])
+        if args[1].lower().endswith(".pgn"):
+            with Path(args[1]).open("wb") as handle:
+                self.tournament_controller.export_pgn(tournament, handle)
+            return
+        export = tournament.to_dict()
+        if tournament.boards:
+            export["standings"] = self.tournament_controller.team_standings(tournament)
+        else:
+            export["standings"] = sorted(
+                self.tournament_controller.tournament_scores(tournament).items(),
+                key=lambda item: (-item[1], item[0]),
+            )
+        with Path(args[1]).open("w", encoding="utf-8") as handle:
+            json.dump(export, handle, ensure_ascii=False, indent=2)
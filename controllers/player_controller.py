@@ -1,10 +1,9 @@
 from __future__ import annotations
-import re
-from typing import List, Optional
+from typing import Dict, List, Optional
 from storage.json_store import JsonStore
 from models.player import Player
-
-NATIONAL_ID_PATTERN = re.compile(r"^[A-Z]{2}\d{5}$")
+from utils.parsing import is_valid_national_id
+from utils.search import PlayerSearchIndex
 
 
 class PlayerController:
@@ -12,9 +11,22 @@ class PlayerController:
 
     def __init__(self, store: JsonStore) -> None:
         self.store = store
+        self.autosave = True  # False : l'appelant enregistre lui-même (mode script)
         self.players: List[Player] = store.load_players()
+        self._by_id: Dict[str, Player] = {player.player_id: player for player in self.players}
+        self._search_index: Optional[PlayerSearchIndex] = None  # construit à la première recherche
+
+    @property
+    def search_index(self) -> PlayerSearchIndex:
+        if self._search_index is None:
+            self._search_index = PlayerSearchIndex(self.players)
+        return self._search_index
 
     def _save(self) -> None:
+        if self.autosave:
+            self.save()
+
+    def save(self) -> None:
         self.store.save_players(self.players)
 
     def list_players_alpha(self) -> List[Player]:
@@ -29,37 +41,69 @@ class PlayerController:
         first_name: str,
         last_name: str,
         birthdate: str,
+        rating: int = 0,
     ) -> Player:
-        if not NATIONAL_ID_PATTERN.match(player_id):
+        if not is_valid_national_id(player_id):
             raise ValueError("Identifiant national invalide (format AB12345).")
-        if any(player.player_id == player_id for player in self.players):
+        if player_id in self._by_id:
             raise ValueError("Un joueur avec cet identifiant existe déjà.")
         new_player = Player(
             player_id=player_id,
             first_name=first_name,
             last_name=last_name,
             birthdate=birthdate,
+            rating=rating,
         )
         self.players.append(new_player)
+        self._by_id[player_id] = new_player
+        if self._search_index is not None:
+            self._search_index.add(new_player)
         self._save()
         return new_player
 
     def get(self, player_id: str) -> Optional[Player]:
-        return next((player for player in self.players if player.player_id == player_id), None)
+        return self._by_id.get(player_id)
+
+    def search(self, query: str, limit: int = 10) -> List[Player]:
+        """Ranked players matching a name or ID prefix, then close spellings."""
+        return [self.get(player_id) for player_id in self.search_index.search(query, limit)]
+
+    def find_duplicate(self, first_name: str, last_name: str, birthdate: str) -> Optional[Player]:
+        for player_id in self.search_index.exact(f"{last_name} {first_name}"):
+            player = self.get(player_id)
+            if player.birthdate == birthdate:
+                return player
+        return None
 
     def exists(self, player_id: str) -> bool:
-        return any(player.player_id == player_id for player in self.players)
+        return player_id in self._by_id
 
     def update_player(self, player_id: str, **kwargs) -> Optional[Player]:
         player = self.get(player_id)
         if not player:
             return None
+        if self._search_index is not None:
+            self._search_index.remove(player)
+        del self._by_id[player_id]
         for key, value in kwargs.items():
             if hasattr(player, key):
                 setattr(player, key, value)
+        self._by_id[player.player_id] = player
+        if self._search_index is not None:
+            self._search_index.add(player)
         self._save()
         return player
 
+    def remove_players(self, player_ids) -> None:
+        """Drop player records (after a merge: their results now belong to another record)."""
+        removed = {player_id for player_id in player_ids if player_id in self._by_id}
+        for player_id in removed:
+            player = self._by_id.pop(player_id)
+            if self._search_index is not None:
+                self._search_index.remove(player)
+        self.players = [player for player in self.players if player.player_id not in removed]
+        self._save()
+
     def print_all(self) -> None:
         for player in self.players:
             print(player)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from controllers.tournament_controller import TournamentController
+from models.player import Player
+from models.tournament import Tournament
+from storage.json_store import JsonStore
+
+ACTION_THREADS = 32  # actions traitées en même temps, tous tournois confondus
+
+
+class ServerController:
+    """Run many tournaments at once in one process (festival mode).
+
+    Every action on a tournament runs under that tournament's own lock. Actions on
+    different tournaments proceed in parallel, and actions on the same tournament are
+    serialized in arrival order. Between checkpoints, persistence is the per-tournament
+    journal, written by the background writer. Large pairings run in a shared process
+    pool, so pairing a big open does not hold the GIL while the other events enter
+    results.
+
+    Operations that touch the whole set (creation, checkpoint, player merges) take every
+    lock, in a fixed order.
+    """
+
+    def __init__(self, store: JsonStore, player_index: Dict[str, Player], workers: Optional[int] = None) -> None:
+        from concurrent.futures import ProcessPoolExecutor  # multiprocessing n'est chargé qu'en mode serveur
+
+        self.controller = TournamentController(store, player_index)
+        self.controller.start_background_writer()
+        self.controller.pairing_pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self._locks: Dict[str, threading.RLock] = {}
+        self._registry = threading.Lock()  # protège `_locks` et la liste des tournois
+        self._actions: Optional[ThreadPoolExecutor] = None
+
+    def _lock(self, name: str) -> threading.RLock:
+        with self._registry:
+            return self._locks.setdefault(name, threading.RLock())
+
+    @contextmanager
+    def tournament(self, name: str) -> Iterator[Tournament]:
+        """Exclusive access to one active tournament for the duration of the block."""
+        with self._lock(name):
+            tournament = next((t for t in self.controller.tournaments if t.name == name), None)
+            if tournament is None:
+                raise ValueError(f"Tournoi introuvable : {name}.")
+            yield tournament
+
+    @contextmanager
+    def _everything(self) -> Iterator[None]:
+        # Ordre fixe (par nom) : deux opérations globales ne peuvent pas s'interbloquer
+        with ExitStack() as stack:
+            for name in sorted(t.name for t in list(self.controller.tournaments)):
+                stack.enter_context(self._lock(name))
+            with self._registry:
+                yield
+
+    def run(self, name: str, action: str, *args: Any, **kwargs: Any) -> Any:
+        """Call `TournamentController.<action>(tournament, ...)` under the tournament's lock."""
+        with self.tournament(name) as tournament:
+            return getattr(self.controller, action)(tournament, *args, **kwargs)
+
+    def submit(self, name: str, action: str, *args: Any, **kwargs: Any) -> "Future[Any]":
+        """Same as `run`, on the action thread pool; the caller waits on the future if it needs to."""
+        if self._actions is None:
+            with self._registry:
+                if self._actions is None:
+                    self._actions = ThreadPoolExecutor(max_workers=ACTION_THREADS, thread_name_prefix="tournoi")
+        return self._actions.submit(self.run, name, action, *args, **kwargs)
+
+    def create_tournament(self, *args: Any, **kwargs: Any) -> Tournament:
+        with self._everything():
+            if any(t.name == (kwargs.get("name") or args[0]) for t in self.controller.tournaments):
+                raise ValueError("Un tournoi porte déjà ce nom.")
+            return self.controller.create_tournament(*args, **kwargs)
+
+    def merge_players(self, mapping: Dict[str, str]) -> int:
+        with self._everything():
+            return self.controller.merge_players(mapping)
+
+    def checkpoint(self) -> None:
+        """Full checkpoint of every active tournament (finished ones go to the archive)."""
+        with self._everything():
+            self.controller.save()
+            active = {t.name for t in self.controller.tournaments}
+            for name in [name for name in self._locks if name not in active]:
+                del self._locks[name]  # tournoi archivé : plus aucune action possible
+
+    def close(self) -> None:
+        """Finish queued actions, write a last checkpoint, then stop the pools and the writer."""
+        if self._actions is not None:
+            self._actions.shutdown(wait=True)
+            self._actions = None
+        try:
+            with self._everything():
+                self.controller.close()
+        finally:
+            if self.controller.pairing_pool is not None:
+                self.controller.pairing_pool.shutdown(wait=True)
+                self.controller.pairing_pool = None
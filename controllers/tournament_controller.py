@@ -1,9 +1,29 @@
 from __future__ import annotations
-from typing import List, Dict
+import dataclasses
+import json
+import os
+from datetime import datetime
+from typing import Any, BinaryIO, List, Dict, Optional, Tuple
+from storage.archive import ArchivedTournament
+from storage.games import GameKey
 from storage.json_store import JsonStore
-from models.tournament import Tournament, Round
+from models.tournament import Tournament, Round, Section
 from models.player import Player
-from utils.pairing import first_round, next_round, compute_scores
+from models.events import Event, apply_event, rebuild_schedule
+from utils.clocks import TimingTable, now_epoch, parse_time_control
+from utils.memo import VersionedMemo
+from utils.stats import PlayerStats, ResultsTable, leaderboard
+from utils.pgn import RESULTS, UNKNOWN_RESULT, read_tags, result_token, round_and_board, split_games, stub_game
+from utils.pairing import (
+    PAIRING_SYSTEMS, ROUND_ROBIN_SYSTEMS, BYE, scheduled_round, compute_scores, generate_round,
+    pairing_audit, inputs_hash, colour_history, opponents, bye_recipients, tie_breaks,
+)
+from utils.teams import BOARD_RESULTS, UNPLAYED, TeamStandings, default_lineup, validate_lineup
+
+# En dessous, apparier les sections en série coûte moins que démarrer des processus
+PARALLEL_PAIRING_MIN_PLAYERS = 400
+SNAPSHOT_INTERVAL = 50  # un instantané complet tous les N événements d'un tournoi
+DERIVED_CACHE_SIZE = 512  # vues dérivées (scores, départages...) gardées toutes versions confondues
 
 
 class TournamentController:
@@ -11,13 +31,206 @@ class TournamentController:
 
     def __init__(self, store: JsonStore, player_index: Dict[str, Player]) -> None:
         self.store = store
+        self.autosave = True  # False : l'appelant enregistre lui-même (mode script)
         self.tournaments: List[Tournament] = store.load_tournaments()
         self.player_index = player_index
+        self._events: Dict[str, List[Event]] = {}  # journal en mémoire, chargé au premier besoin
+        # Sans autosave, lignes de journal et instantanés restent en mémoire jusqu'à save() : un script
+        # qui échoue ne laisse rien sur disque
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self._pending_snapshots: Dict[str, Dict[int, str]] = {}  # clé -> seq -> état encodé
+        self.writer = None  # BackgroundWriter : écritures du journal hors de la boucle interactive
+        self._standings: Dict[str, TeamStandings] = {}  # classements par équipes, tenus à jour échiquier par échiquier
+        self._derived = VersionedMemo(DERIVED_CACHE_SIZE)
+        self._results: Optional[ResultsTable] = None  # parties de tous les tournois en colonnes (statistiques)
+        self.pairing_pool = None  # Executor de processus fourni par le mode serveur (voir ServerController)
+        for tournament in self.tournaments:
+            # Le point de contrôle peut être en retard sur le journal (arrêt sans enregistrement)
+            if store.events.head(tournament.storage_key) != tournament.event_seq:
+                events, head = self._history(tournament)
+                try:
+                    self._move_to(tournament, head)
+                except ValueError:
+                    pass  # journal incomplet : le point de contrôle fait foi
 
     def _save(self) -> None:
+        if self.autosave:
+            self._flush_journal()
+            self.store.save_tournaments(self.tournaments)
+
+    def save(self) -> None:
+        """Write a full checkpoint of the active tournaments, archiving the finished ones first."""
+        self._flush_journal()
+        self.flush()
+        self.archive_finished()
         self.store.save_tournaments(self.tournaments)
 
-    def list_tournaments(self) -> List[Tournament]:
+    def start_background_writer(self) -> None:
+        """Hand journal writes to a worker thread (interactive use); see storage.writer."""
+        if self.writer is None:
+            from storage.writer import BackgroundWriter
+
+            self.writer = BackgroundWriter(self.store.events)
+
+    def flush(self) -> None:
+        """Block until every journal write queued so far is on disk."""
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self) -> None:
+        """Final checkpoint, then stop the background writer."""
+        try:
+            self.save()
+        finally:
+            if self.writer is not None:
+                self.writer.close()
+                self.writer = None
+
+    def archive_finished(self) -> int:
+        """Move tournaments whose last round is closed to the compressed archive."""
+        finished = [t for t in self.tournaments if t.rounds and t.current_round_index >= t.num_rounds]
+        if finished:
+            self.store.archive_tournaments(finished)
+            archived = {id(t) for t in finished}
+            self.tournaments = [t for t in self.tournaments if id(t) not in archived]
+            for tournament in finished:
+                self._events.pop(tournament.storage_key, None)
+        return len(finished)
+
+    def _flush_journal(self) -> None:
+        # Instantanés d'abord : une ligne du journal n'est jamais sur disque sans son état de départ
+        for key, snapshots in self._pending_snapshots.items():
+            for seq, text in snapshots.items():
+                self.store.events.write_snapshot_text(key, seq, text)
+        self._pending_snapshots.clear()
+        by_key: Dict[str, List[Dict[str, Any]]] = {}
+        for key, record in self._pending:
+            by_key.setdefault(key, []).append(record)
+        for key, records in by_key.items():
+            self.store.events.append(key, records)
+        self._pending.clear()
+
+    def _journal(self, tournament: Tournament, record: Dict[str, Any]) -> None:
+        if self.autosave and self.writer is not None:
+            self.writer.append(tournament.storage_key, record)
+        elif self.autosave:
+            self.store.events.append(tournament.storage_key, [record])
+        else:
+            self._pending.append((tournament.storage_key, record))
+
+    def _history(self, tournament: Tournament) -> Tuple[List[Event], int]:
+        key = tournament.storage_key
+        if key not in self._events:
+            self.flush()
+            events, head = self.store.events.load(key)
+            # Lignes pas encore écrites (sans autosave) : appliquées comme EventLog.load les lirait
+            for pending_key, record in self._pending:
+                if pending_key != key:
+                    continue
+                if "head" in record:
+                    head = record["head"]
+                    continue
+                del events[record["seq"] - 1:]
+                events.append(record)
+                head = record["seq"]
+            self._events[key] = events
+            return events, head
+        return self._events[key], tournament.event_seq
+
+    def _record(self, tournament: Tournament, kind: str, **payload) -> None:
+        """Apply a new event to the tournament and append it to its journal (O(1) on disk)."""
+        if isinstance(tournament, ArchivedTournament):
+            # L'archive compressée n'est jamais réécrite : la modification serait perdue
+            raise ValueError(f"Tournoi archivé « {tournament.name} » : lecture seule.")
+        events, _ = self._history(tournament)
+        key = tournament.storage_key
+        if not events and not (self._pending_snapshots.get(key) or self.store.events.has_snapshot(key)):
+            # État de départ du journal : la reconstruction ne remonte jamais plus loin
+            tournament.event_seq = 0
+            self._write_snapshot(tournament)
+        del events[tournament.event_seq:]  # une nouvelle action efface les actions annulées
+        event = {"seq": tournament.event_seq + 1, "type": kind, **payload}
+        apply_event(tournament, event)
+        events.append(event)
+        self._journal(tournament, event)
+        if event["seq"] % SNAPSHOT_INTERVAL == 0:
+            self._write_snapshot(tournament)
+
+    def _write_snapshot(self, tournament: Tournament) -> None:
+        # Encodé ici, tant que l'état est cohérent ; seule l'écriture part sur le thread
+        text = json.dumps(tournament.to_dict(), ensure_ascii=False)
+        if not self.autosave:
+            self._pending_snapshots.setdefault(tournament.storage_key, {})[tournament.event_seq] = text
+        elif self.writer is not None:
+            self.writer.call(self.store.events.write_snapshot_text, tournament.storage_key, tournament.event_seq, text)
+        else:
+            self.store.events.write_snapshot_text(tournament.storage_key, tournament.event_seq, text)
+
+    def _snapshot_before(self, key: str, seq: int) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Nearest snapshot at or before `seq`, those still held in memory included."""
+        on_disk = self.store.events.snapshot_before(key, seq)
+        pending = [candidate for candidate in self._pending_snapshots.get(key, {}) if candidate <= seq]
+        if pending and (on_disk is None or max(pending) >= on_disk[0]):
+            best = max(pending)
+            return best, json.loads(self._pending_snapshots[key][best])
+        return on_disk
+
+    def state_at(self, tournament: Tournament, seq: int) -> Tournament:
+        """Rebuild the tournament as it was after event `seq`: nearest snapshot plus replay of the tail."""
+        events, _ = self._history(tournament)
+        self.flush()
+        snapshot = self._snapshot_before(tournament.storage_key, seq)
+        if snapshot is None:
+            raise ValueError("Aucun instantané antérieur : historique indisponible.")
+        snapshot_seq, state = snapshot
+        rebuilt = Tournament.from_dict(state)
+        for event in events[snapshot_seq:seq]:
+            apply_event(rebuilt, event)
+        return rebuilt
+
+    def _move_to(self, tournament: Tournament, seq: int) -> None:
+        events, _ = self._history(tournament)
+        if seq > tournament.event_seq:
+            # En avant : rejoue simplement les événements manquants sur l'état courant
+            for event in events[tournament.event_seq:seq]:
+                apply_event(tournament, event)
+            return
+        rebuilt = self.state_at(tournament, seq)
+        for field in dataclasses.fields(Tournament):
+            setattr(tournament, field.name, getattr(rebuilt, field.name))
+        for section in tournament.sections:
+            section.dirty = True
+
+    def can_undo(self, tournament: Tournament) -> bool:
+        self.flush()
+        return tournament.event_seq > 0 and self._snapshot_before(
+            tournament.storage_key, tournament.event_seq - 1
+        ) is not None
+
+    def can_redo(self, tournament: Tournament) -> bool:
+        events, _ = self._history(tournament)
+        return tournament.event_seq < len(events)
+
+    def undo(self, tournament: Tournament) -> bool:
+        """Cancel the last action on the tournament; False when there is nothing to undo."""
+        if not self.can_undo(tournament):
+            return False
+        self._move_to(tournament, tournament.event_seq - 1)
+        self._journal(tournament, {"head": tournament.event_seq})
+        return True
+
+    def redo(self, tournament: Tournament) -> bool:
+        """Re-apply the last undone action; False when there is nothing to redo."""
+        if not self.can_redo(tournament):
+            return False
+        self._move_to(tournament, tournament.event_seq + 1)
+        self._journal(tournament, {"head": tournament.event_seq})
+        return True
+
+    def list_tournaments(self, include_archived: bool = False) -> List[Tournament]:
+        """Active tournaments, followed by read-only archived ones when asked."""
+        if include_archived:
+            return list(self.tournaments) + self.store.archive.entries()
         return list(self.tournaments)
 
     def create_tournament(
@@ -28,7 +241,23 @@ class TournamentController:
         end_date: str,
         num_rounds: int = 4,
         description: str = "",
+        pairing_system: str = "swiss",
+        sections: Optional[List[Tuple[str, int]]] = None,
+        boards: int = 0,
+        time_control: str = "",
     ) -> Tournament:
+        """Create a tournament; `boards` > 0 makes it a team event with that many boards per match.
+
+        `time_control` is the PGN TimeControl tag ("5400+30": base and increment in seconds).
+        """
+        if pairing_system not in PAIRING_SYSTEMS and pairing_system not in ROUND_ROBIN_SYSTEMS:
+            raise ValueError(f"Système d'appariement inconnu : {pairing_system}.")
+        if pairing_system in ROUND_ROBIN_SYSTEMS and sections:
+            raise ValueError("Les sections ne sont pas disponibles en toutes-rondes.")
+        if boards < 0 or (boards and sections):
+            raise ValueError("Une épreuve par équipes n'a pas de sections.")
+        if time_control:
+            parse_time_control(time_control)
         tournament = Tournament(
             name=name,
             location=location,
@@ -36,17 +265,94 @@ class TournamentController:
             end_date=end_date,
             num_rounds=num_rounds,
             description=description,
+            pairing_system=pairing_system,
+            sections=[Section(name=label.strip().upper(), rating_floor=floor) for label, floor in sections or []],
+            boards=boards,
+            time_control=time_control.strip(),
         )
+        rebuild_schedule(tournament)
         self.tournaments.append(tournament)
         self._save()
         return tournament
 
-    def register_player(self, tournament: Tournament, player_id: str) -> None:
+    @staticmethod
+    def _section_name(tournament: Tournament, section: Optional[str]) -> Optional[str]:
+        """Stored name of a section as typed (case and surrounding spaces ignored); None when empty.
+
+        Every public method taking a section goes through here, so views and scripts pass names as entered.
+        """
+        if not section or not section.strip():
+            return None
+        wanted = section.strip().upper()
+        for candidate in tournament.sections:
+            if candidate.name.upper() == wanted:
+                return candidate.name
+        raise ValueError(f"Section introuvable : {section.strip()}.")
+
+    def _division(self, tournament: Tournament, section: Optional[str]):
+        """Players and rounds to act on: the named section, or the tournament itself."""
+        if section:
+            return tournament.get_section(section)
+        if tournament.sections:
+            raise ValueError("Préciser la section.")
+        return tournament
+
+    def register_player(self, tournament: Tournament, player_id: str, section: Optional[str] = None) -> None:
+        if tournament.boards:
+            raise ValueError("Épreuve par équipes : inscrire des équipes.")
         if player_id not in self.player_index:
             raise ValueError("Joueur introuvable.")
-        if player_id not in tournament.players:
-            tournament.players.append(player_id)
-            self._save()  # Sauvegarde automatique après ajout
+        section = self._section_name(tournament, section)
+        if tournament.schedule and tournament.rounds:
+            raise ValueError("Inscriptions closes : le calendrier toutes-rondes est en cours.")
+        if player_id in tournament.withdrawn:
+            # Retour après abandon : le joueur reprend sa place dans sa section
+            self._record(tournament, "player_registered", player_id=player_id)
+        elif player_id not in tournament.players:
+            if tournament.sections:
+                # Sans section explicite, le joueur est placé selon son classement Elo
+                section = (
+                    section if section
+                    else tournament.section_for_rating(getattr(self.player_index[player_id], "rating", 0)).name
+                )
+            self._record(tournament, "player_registered", player_id=player_id, section=section)
+
+    def register_team(self, tournament: Tournament, name: str, players: List[str]) -> None:
+        """Register a team (players in board order) or bring back a team that withdrew."""
+        if not tournament.boards:
+            raise ValueError("Ce tournoi n'est pas une épreuve par équipes.")
+        if name in tournament.withdrawn:
+            self._record(tournament, "team_registered", team=name, players=tournament.get_team(name).players)
+            return
+        if not name or name == BYE or name in tournament.players:
+            raise ValueError(f"Nom d'équipe invalide ou déjà inscrit : {name}.")
+        if tournament.schedule and tournament.rounds:
+            raise ValueError("Inscriptions closes : le calendrier toutes-rondes est en cours.")
+        if len(players) < tournament.boards or len(set(players)) != len(players):
+            raise ValueError(f"Une équipe compte au moins {tournament.boards} joueurs différents.")
+        unknown = [player_id for player_id in players if player_id not in self.player_index]
+        if unknown:
+            raise ValueError(f"Joueur introuvable : {', '.join(unknown)}.")
+        taken = {player_id for team in tournament.teams for player_id in team.players}.intersection(players)
+        if taken:
+            raise ValueError(f"Déjà dans une autre équipe : {', '.join(sorted(taken))}.")
+        self._record(tournament, "team_registered", team=name, players=list(players))
+
+    def _team_payload(self, tournament: Tournament, matches: List) -> Dict[str, Any]:
+        """Empty board results and default lineups for the matches of a new team round."""
+        if not tournament.boards:
+            return {}
+        boards, lineups = [], []
+        for (team_a, _), (team_b, _) in matches:
+            if team_b == BYE:
+                boards.append("")
+                lineups.append([])
+                continue
+            boards.append(UNPLAYED * tournament.boards)
+            lineups.append([
+                default_lineup(tournament.get_team(team).players, tournament.boards) for team in (team_a, team_b)
+            ])
+        return {"boards": boards, "lineups": lineups}
 
     def start_next_round(self, tournament: Tournament) -> Round:
         # Les rounds sont séquentiels : on ne peut pas démarrer un nouveau round si le précédent n'est pas terminé
@@ -54,14 +360,100 @@ class TournamentController:
             raise ValueError("Tous les tours ont déjà été joués.")
         if tournament.rounds and tournament.rounds[-1].end_datetime is None:
             raise ValueError("Le tour précédent n'est pas terminé.")
-        round_obj = tournament.start_new_round()
-        # Le matchmaking dépend des résultats précédents (next_round trie selon les scores)
-        if tournament.current_round_index == 0:
-            round_obj.matches = first_round(tournament.players)
-        else:
-            round_obj.matches = next_round(tournament.players, tournament.rounds)
-        self._save()
-        return round_obj
+        if tournament.pairing_system in ROUND_ROBIN_SYSTEMS:
+            return self._start_scheduled_round(tournament)
+        divisions = tournament.divisions()
+        views = {name: self._pairing_views(tournament, name) for name, _ in divisions}
+        tasks = [
+            (
+                tournament.pairing_system, tournament.active_players(division), list(division.rounds),
+                tournament.seed, name, views[name],
+            )
+            for name, division in divisions
+        ]
+        results = self._pair_all(tasks)
+        now = datetime.now()
+        self._record(
+            tournament,
+            "round_started",
+            start_datetime=now.isoformat(timespec="seconds"),
+            started_at=int(now.timestamp()),
+            divisions={
+                name: {
+                    "matches": matches,
+                    "audit": pairing_audit(tournament.seed, task[1], task[2], matches, elapsed, views[name]["scores"]),
+                    **self._team_payload(tournament, matches),
+                }
+                for (name, _), task, (matches, elapsed) in zip(divisions, tasks, results)
+            },
+        )
+        round_obj = tournament.rounds[-1]
+        if not tournament.sections:
+            return round_obj
+        # Vue combinée (non enregistrée) des tables de toutes les sections
+        return Round(
+            name=round_obj.name,
+            start_datetime=round_obj.start_datetime,
+            matches=[match for _, section in divisions for match in section.rounds[-1].matches],
+        )
+
+    def _start_scheduled_round(self, tournament: Tournament) -> Round:
+        """Serve the next round straight from the precomputed Berger table."""
+        if len(tournament.players) < 2:
+            raise ValueError("Il faut au moins 2 joueurs.")
+        matches = scheduled_round(tournament.schedule[tournament.current_round_index], tournament.players)
+        # La table reste celle du départ : les parties d'un joueur qui a abandonné sont perdues par forfait
+        withdrawn = set(tournament.withdrawn)
+        forfeits = []
+        for index, ((player_a, _), (player_b, _)) in enumerate(matches):
+            if player_b != BYE and withdrawn & {player_a, player_b}:
+                matches[index] = [
+                    [player_a, 0.0 if player_a in withdrawn else 1.0],
+                    [player_b, 0.0 if player_b in withdrawn else 1.0],
+                ]
+                forfeits.append(index)
+        now = datetime.now()
+        self._record(
+            tournament,
+            "round_started",
+            start_datetime=now.isoformat(timespec="seconds"),
+            started_at=int(now.timestamp()),
+            divisions={"": {"matches": matches, "forfeits": forfeits, **self._team_payload(tournament, matches)}},
+        )
+        return tournament.rounds[-1]
+
+    def _pair_all(self, tasks: List[tuple]) -> List[Tuple[list, float]]:
+        """Pair every division, spreading sections over processes when the field is large."""
+        total_players = sum(len(task[1]) for task in tasks)
+        if self.pairing_pool is not None and total_players >= PARALLEL_PAIRING_MIN_PLAYERS:
+            # Mode serveur : le calcul part dans le pool partagé, le fil appelant ne garde pas le GIL
+            return list(self.pairing_pool.map(generate_round, *zip(*tasks)))
+        workers = min(len(tasks), os.cpu_count() or 1)
+        if workers < 2 or total_players < PARALLEL_PAIRING_MIN_PLAYERS:
+            return [generate_round(*task) for task in tasks]
+        from concurrent.futures import ProcessPoolExecutor  # multiprocessing n'est chargé qu'au besoin
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(generate_round, *zip(*tasks)))
+
+    def verify_round(self, tournament: Tournament, round_index: int, section: Optional[str] = None) -> bool:
+        """Replay a recorded round from its seed and check it yields the same pairings."""
+        section = self._section_name(tournament, section)
+        division = self._division(tournament, section)
+        round_obj = division.rounds[round_index]
+        previous_rounds = division.rounds[:round_index]
+        # Joueurs appariés à ce tour (exempt compris) : les abandons ultérieurs ne comptent pas
+        participants = {player_id for match in round_obj.matches for player_id, _ in match}
+        player_ids = [player_id for player_id in division.players if player_id in participants]
+        if not round_obj.audit:
+            raise ValueError("Aucune trace d'audit pour ce tour.")
+        if inputs_hash(tournament.seed, player_ids, previous_rounds) != round_obj.audit["inputs_hash"]:
+            raise ValueError("Les inscrits ou les résultats ont changé depuis la génération du tour.")
+        replayed, _ = generate_round(
+            tournament.pairing_system, player_ids, previous_rounds, tournament.seed, section or ""
+        )
+        recorded = [(match[0][0], match[1][0]) for match in round_obj.matches]
+        return recorded == [(match[0][0], match[1][0]) for match in replayed]
 
     def enter_result(
         self,
@@ -70,35 +462,386 @@ class TournamentController:
         match_index: int,
         score_player_a: float,
         score_player_b: float,
+        section: Optional[str] = None,
+        forfeit: bool = False,
+    ) -> None:
+        """Record a game result; `forfeit` marks it as not played (no colour, rematch allowed)."""
+        if tournament.boards:
+            raise ValueError("Épreuve par équipes : saisir les résultats par échiquier.")
+        section = self._section_name(tournament, section)
+        division = self._division(tournament, section)
+        round_obj = division.rounds[round_index]
+        (player_a_id, previous_a), (player_b_id, previous_b) = round_obj.matches[match_index]
+        if BYE in (player_a_id, player_b_id):
+            raise ValueError("Un exempt n'a pas de résultat à saisir.")
+        # Un double forfait (0-0) est un résultat saisi : le forfait le distingue d'une partie en attente
+        corrected = match_index in round_obj.forfeits or float(previous_a) + float(previous_b) > 0
+        # Une correction garde l'heure de fin de la partie
+        timing = {} if corrected else {"finished_at": now_epoch()}
+        self._record(
+            tournament,
+            "result_corrected" if corrected else "result_entered",
+            section=section,
+            round_index=round_index,
+            match_index=match_index,
+            scores=[float(score_player_a), float(score_player_b)],
+            forfeit=forfeit,
+            **timing,
+        )
+
+    def start_game(
+        self, tournament: Tournament, round_index: int, match_index: int, section: Optional[str] = None
     ) -> None:
+        """Start a game's clock now instead of at the start of the round (late start)."""
+        section = self._section_name(tournament, section)
+        division = self._division(tournament, section)
+        round_obj = division.rounds[round_index]
+        (_, score_a), (player_b, score_b) = round_obj.matches[match_index]
+        if player_b == BYE or match_index in round_obj.forfeits:
+            raise ValueError("Aucune partie à jouer à cette table.")
+        if float(score_a) + float(score_b) > 0:
+            raise ValueError("Partie déjà terminée.")
+        self._record(
+            tournament, "game_started",
+            section=section, round_index=round_index, match_index=match_index, started_at=now_epoch(),
+        )
+
+    def _team_match(self, tournament: Tournament, round_index: int, match_index: int) -> Round:
+        if not tournament.boards:
+            raise ValueError("Ce tournoi n'est pas une épreuve par équipes.")
         round_obj = tournament.rounds[round_index]
-        player_a_id, _ = round_obj.matches[match_index][0]
-        player_b_id, _ = round_obj.matches[match_index][1]
-        round_obj.matches[match_index] = [
-            [player_a_id, float(score_player_a)],
-            [player_b_id, float(score_player_b)],
-        ]
-        self._save()  # Sauvegarde automatique après saisie du résultat
+        if round_obj.matches[match_index][1][0] == BYE:
+            raise ValueError("Une équipe exempte n'a pas de match à jouer.")
+        return round_obj
+
+    def set_lineup(
+        self, tournament: Tournament, round_index: int, match_index: int, side: int, players: List[str]
+    ) -> None:
+        """Field `players` (board order) for one team of a match, before its first board result."""
+        round_obj = self._team_match(tournament, round_index, match_index)
+        if round_obj.boards[match_index] != UNPLAYED * tournament.boards:
+            raise ValueError("Composition figée : des résultats sont déjà saisis pour ce match.")
+        team = round_obj.matches[match_index][side][0]
+        validate_lineup(tournament.get_team(team).players, players, tournament.boards)
+        standings = self._current_standings(tournament)
+        self._record(
+            tournament, "lineup_set",
+            round_index=round_index, match_index=match_index, side=side, players=list(players),
+        )
+        if standings is not None:
+            standings.version = tournament.version  # une composition ne change aucun total
+
+    def enter_board_result(
+        self, tournament: Tournament, round_index: int, match_index: int, board: int, result: str
+    ) -> None:
+        """Record one board of a team match (codes in utils.teams.BOARD_RESULTS); O(boards) standings update."""
+        self._team_match(tournament, round_index, match_index)
+        if result not in BOARD_RESULTS:
+            raise ValueError(f"Résultat d'échiquier invalide : {result}.")
+        if not 0 <= board < tournament.boards:
+            raise ValueError(f"Échiquier hors limites : {board + 1}.")
+        standings = self._current_standings(tournament)
+        self._record(
+            tournament, "board_result",
+            round_index=round_index, match_index=match_index, board=board, result=result, finished_at=now_epoch(),
+        )
+        if standings is not None:
+            standings.update_match(tournament, round_index, match_index)
+
+    def _current_standings(self, tournament: Tournament) -> Optional[TeamStandings]:
+        """Cached team standings, if they match the tournament's current version."""
+        standings = self._standings.get(tournament.storage_key)
+        return standings if standings is not None and standings.version == tournament.version else None
+
+    def team_standings(self, tournament: Tournament) -> List[Tuple[str, float, float]]:
+        """(team, match points, game points), best first."""
+        standings = self._standings.get(tournament.storage_key)
+        if standings is None:
+            standings = self._standings[tournament.storage_key] = TeamStandings(tournament)
+        elif standings.version != tournament.version:
+            standings.rebuild(tournament)  # autre action (tour, annulation...) : recalcul complet
+        return self._view(tournament, "team_standings", "", standings.ranking)
 
     def end_current_round(self, tournament: Tournament) -> None:
-        tournament.end_current_round()
-        self._save()  # Sauvegarde automatique après clôture du round
+        if tournament.current_round_index >= len(tournament.rounds):
+            raise ValueError("Aucun tour en cours.")
+        self._record(tournament, "round_ended", end_datetime=datetime.now().isoformat(timespec="seconds"))
+        self.flush()  # fin de tour : tout le tour est sur disque avant de continuer
+
+    def _view(self, tournament: Tournament, kind: str, section: str, compute):
+        """Derived data computed once per tournament version; the result is shared, read-only."""
+        return self._derived.get((tournament.version, kind, section), compute)
+
+    def _pairing_views(self, tournament: Tournament, section: str = "") -> Dict[str, Any]:
+        """Everything the pairing engine derives from past rounds (see utils.pairing.derived_views)."""
+        rounds = self._division(tournament, section or None).rounds
+        return {
+            "scores": self._view(tournament, "scores", section, lambda: compute_scores(rounds)),
+            "colours": self._view(tournament, "colours", section, lambda: colour_history(rounds)),
+            "opponents": self._view(tournament, "opponents", section, lambda: opponents(rounds)),
+            "byes": self._view(tournament, "byes", section, lambda: bye_recipients(rounds)),
+        }
+
+    def tournament_scores(self, tournament: Tournament, section: Optional[str] = None) -> Dict[str, float]:
+        """Points per player (read-only, cached until the tournament changes)."""
+        section = self._section_name(tournament, section)
+        if section or not tournament.sections:
+            return self._pairing_views(tournament, section or "")["scores"]
+
+        def merged() -> Dict[str, float]:
+            # Chaque joueur n'appartient qu'à une section : les scores se fusionnent sans conflit
+            scores: Dict[str, float] = {}
+            for name, _ in tournament.divisions():
+                scores.update(self._pairing_views(tournament, name)["scores"])
+            return scores
+
+        return self._view(tournament, "scores", "*", merged)
 
-    def tournament_scores(self, tournament: Tournament) -> Dict[str, float]:
-        return compute_scores(tournament.rounds)
+    def standings(
+        self, tournament: Tournament, section: Optional[str] = None
+    ) -> List[Tuple[str, float, float, float]]:
+        """(player, points, Buchholz, Sonneborn-Berger), best first; cached until the tournament changes."""
+        section = self._section_name(tournament, section)
+        division = self._division(tournament, section)
+
+        def compute() -> List[Tuple[str, float, float, float]]:
+            scores = self.tournament_scores(tournament, section)
+            breaks = tie_breaks(division.rounds, scores)
+            rows = [(pid, scores.get(pid, 0.0), *breaks.get(pid, (0.0, 0.0))) for pid in division.players]
+            return sorted(rows, key=lambda row: (-row[1], -row[2], -row[3], row[0]))
+
+        return self._view(tournament, "standings", section or "", compute)
+
+    def ranks(self, tournament: Tournament, section: Optional[str] = None) -> Dict[str, int]:
+        """Rank (1 = first) of each player in `standings`."""
+        section = self._section_name(tournament, section)
+        return self._view(
+            tournament, "ranks", section or "",
+            lambda: {row[0]: rank for rank, row in enumerate(self.standings(tournament, section), start=1)},
+        )
+
+    def forecast(
+        self,
+        tournament: Tournament,
+        simulations: int = 10_000,
+        seed=None,
+        section: Optional[str] = None,
+    ) -> Dict[str, List[float]]:
+        """Simulate the remaining rounds and return each player's final-rank distribution."""
+        from utils.simulation import forecast_standings
+
+        if simulations < 1:
+            raise ValueError("Il faut au moins une simulation.")
+        section = self._section_name(tournament, section)
+        division = self._division(tournament, section)
+        if isinstance(division, Section):
+            tournament = dataclasses.replace(
+                tournament, players=division.players, rounds=division.rounds, sections=[]
+            )
+        ratings = {pid: getattr(self.player_index.get(pid), "rating", 0) for pid in tournament.players}
+        return forecast_standings(tournament, ratings, simulations=simulations, seed=seed, stream=section or "")
 
     def remove_player(self, tournament: Tournament, player_id: str) -> None:
-        if player_id in tournament.players:
-            tournament.players.remove(player_id)
-            self._save()  # Sauvegarde automatique après suppression
+        """Unregister before round 1; afterwards the player is marked as withdrawn."""
+        if player_id in tournament.players and player_id not in tournament.withdrawn:
+            self._record(tournament, "player_withdrawn", player_id=player_id)
 
     def reset_tournament(self, tournament: Tournament) -> None:
-        tournament.current_round_index = 0
-        tournament.rounds.clear()
-        self._save()  # Sauvegarde automatique après reset
+        # Réversible : le journal garde tous les tours effacés (voir undo)
+        self._record(tournament, "tournament_reset")
+
+    def merge_players(self, mapping: Dict[str, str]) -> int:
+        """Rewrite references to merged players ({old id: kept id}) in every tournament.
+
+        Active tournaments get a journaled event (undoable like any other action); archived
+        ones are rewritten in place. Returns the number of tournaments changed.
+        """
+        changed = 0
+        for tournament in self.tournaments:
+            registered = set(tournament.players).union(*(team.players for team in tournament.teams))
+            relevant = {old: kept for old, kept in mapping.items() if old in registered}
+            if relevant:
+                self._record(tournament, "players_merged", mapping=relevant)
+                changed += 1
+        changed += self.store.archive.merge_players(mapping)
+        self._results = None  # les identifiants des joueurs de la table ont changé
+        self._save()
+        return changed
+
+    def timing_report(self, slowest: int = 10) -> Dict[str, Any]:
+        """Round durations, slowest games and mean game length per time control, archive included.
+
+        One pass over every tournament fills a columnar TimingTable (see utils.clocks).
+        """
+        return TimingTable(slowest).add(self.list_tournaments(include_archived=True)).report()
+
+    def results_table(self) -> ResultsTable:
+        """Columnar table of every game played, archive included, refreshed incrementally.
+
+        Archived tournaments are read once; an active tournament's block is rebuilt only when
+        its version changed since the last call.
+        """
+        if self._results is None:
+            self._results = ResultsTable()
+        table = self._results
+        for tournament in self.tournaments:
+            if not tournament.boards and table.version(tournament.storage_key) != tournament.version:
+                table.set_tournament(
+                    tournament.storage_key, tournament.version, tournament.start_date, self._played_rounds(tournament)
+                )
+        for summary in self.store.archive.summaries():
+            if table.version(summary["storage_key"]) is None:
+                archived = self.store.archive.load(summary["storage_key"])
+                if not archived.boards:
+                    # Un tournoi archivé ne change plus : version 0, jamais reconstruit
+                    table.set_tournament(archived.storage_key, 0, archived.start_date, self._played_rounds(archived))
+        return table
+
+    @staticmethod
+    def _played_rounds(tournament: Tournament):
+        for round_index, round_obj in enumerate(tournament.rounds):
+            for _, division in tournament.divisions():
+                yield round_obj.start_datetime, division.rounds[round_index]
+
+    def _ratings(self) -> Dict[str, int]:
+        return {player_id: player.rating for player_id, player in self.player_index.items()}
+
+    def player_stats(self, player_id: str, tournament=None) -> Optional[PlayerStats]:
+        """Performance, colour split, results, streaks and opponent strength of a player.
+
+        Over every tournament, or only `tournament`; None when the player has no game played.
+        """
+        table = self.results_table()
+        key = tournament.storage_key if tournament is not None else None
+        return table.stats(self._ratings(), key).get(player_id)
+
+    def leaderboard(
+        self, metric: str = "performance", min_games: int = 9, limit: int = 20, since: Optional[str] = None
+    ) -> List[PlayerStats]:
+        """Federation-wide ranking on one statistic (see utils.stats.LEADERBOARD_METRICS)."""
+        return leaderboard(self.results_table().stats(self._ratings(), since=since), metric, min_games, limit)
+
+    def _pgn_name(self, player_id: str) -> str:
+        player = self.player_index.get(player_id)
+        return f"{player.last_name}, {player.first_name}" if player else player_id
+
+    def _game_tags(
+        self, tournament, round_index: int, match_index: int, section: Optional[str]
+    ) -> List[Tuple[str, str]]:
+        round_obj = self._division(tournament, section).rounds[round_index]
+        (player_a, score_a), (player_b, score_b) = round_obj.matches[match_index]
+        tags = [
+            ("Event", tournament.name + (f" — section {section}" if section else "")),
+            ("Site", tournament.location),
+            ("Date", round_obj.start_datetime[:10].replace("-", ".")),
+            ("Round", f"{round_index + 1}.{match_index + 1}"),
+            ("White", self._pgn_name(player_a)),
+            ("Black", self._pgn_name(player_b)),
+            ("Result", result_token(float(score_a), float(score_b))),
+        ]
+        if tournament.time_control:
+            tags.append(("TimeControl", tournament.time_control))
+        if match_index in round_obj.forfeits:
+            tags.append(("Termination", "forfeit"))
+        return tags
+
+    def _game_division(self, tournament, round_index: int, match_index: int, section: Optional[str]) -> Round:
+        if tournament.boards:
+            raise ValueError("Épreuve par équipes : les parties ne sont pas enregistrées par match.")
+        round_obj = self._division(tournament, section).rounds[round_index]
+        if round_obj.matches[match_index][1][0] == BYE:
+            raise ValueError("Un exempt n'a pas de partie.")
+        return round_obj
+
+    @staticmethod
+    def _game_key(section: Optional[str], round_index: int, match_index: int, match) -> GameKey:
+        # Les joueurs font partie de la clé : une table réappariée (remise à zéro, annulation) ne
+        # retrouve pas la partie de l'appariement précédent
+        (player_a, _), (player_b, _) = match
+        return section or "", round_index + 1, match_index + 1, player_a, player_b
+
+    def attach_game(
+        self, tournament: Tournament, round_index: int, match_index: int, text: str, section: Optional[str] = None
+    ) -> None:
+        """Store the PGN of one game (replacing any earlier one); fills in the result if none is entered yet."""
+        section = self._section_name(tournament, section)
+        round_obj = self._game_division(tournament, round_index, match_index, section)
+        games = split_games(text)
+        if len(games) != 1:
+            raise ValueError(f"Une seule partie attendue, {len(games)} trouvée(s).")
+        result = read_tags(games[0]).get("Result", UNKNOWN_RESULT)
+        (_, score_a), (_, score_b) = round_obj.matches[match_index]
+        entered = result_token(float(score_a), float(score_b))
+        if result in RESULTS and entered != UNKNOWN_RESULT and result != entered:
+            raise ValueError(f"Résultat de la partie ({result}) différent du résultat saisi ({entered}).")
+        game = self._game_key(section, round_index, match_index, round_obj.matches[match_index])
+        self.store.games.add(tournament.storage_key, game, games[0])
+        if result in RESULTS and entered == UNKNOWN_RESULT:
+            self.enter_result(tournament, round_index, match_index, *RESULTS[result], section=section)
+
+    def import_pgn(self, tournament: Tournament, text: str, section: Optional[str] = None) -> int:
+        """Attach every game of a PGN file to its match, found from the Round/Board tags or the player names.
+
+        Returns the number of games imported; raises ValueError on the first game that matches nothing.
+        """
+        section = self._section_name(tournament, section)
+        division = self._division(tournament, section)
+        games = split_games(text)
+        for number, game in enumerate(games, start=1):
+            tags = read_tags(game)
+            round_number, board = round_and_board(tags)
+            if round_number is None or not 1 <= round_number <= len(division.rounds):
+                raise ValueError(f"Partie {number} : ronde absente ou inconnue ({tags.get('Round', '?')}).")
+            matches = division.rounds[round_number - 1].matches
+            if board is None:
+                names = (tags.get("White"), tags.get("Black"))
+                board = next(
+                    (
+                        index for index, ((player_a, _), (player_b, _)) in enumerate(matches, start=1)
+                        if (self._pgn_name(player_a), self._pgn_name(player_b)) == names
+                    ),
+                    None,
+                )
+            if board is None or not 1 <= board <= len(matches):
+                raise ValueError(f"Partie {number} : aucune table de la ronde {round_number} ne correspond.")
+            self.attach_game(tournament, round_number - 1, board - 1, game, section)
+        return len(games)
+
+    def game_pgn(
+        self, tournament: Tournament, round_index: int, match_index: int, section: Optional[str] = None
+    ) -> str:
+        """PGN of one game: the stored text if any (read by seek), else its tags and result only."""
+        section = self._section_name(tournament, section)
+        round_obj = self._game_division(tournament, round_index, match_index, section)
+        game = self._game_key(section, round_index, match_index, round_obj.matches[match_index])
+        stored = self.store.games.read(tournament.storage_key, game)
+        return stored or stub_game(self._game_tags(tournament, round_index, match_index, section))
+
+    def export_pgn(self, tournament, out: BinaryIO) -> int:
+        """Write every game of the tournament, round by round, to a binary stream.
+
+        Stored games are copied byte for byte from the game file; games without moves are
+        written with their tags and result. Returns the number of stored games copied.
+        """
+        if tournament.boards:
+            raise ValueError("Épreuve par équipes : les parties ne sont pas enregistrées par match.")
+
+        def games():
+            for round_index in range(len(tournament.rounds)):
+                for name, division in tournament.divisions():
+                    for match_index, match in enumerate(division.rounds[round_index].matches):
+                        if match[1][0] == BYE:
+                            continue
+                        yield self._game_key(name, round_index, match_index, match), (
+                            lambda r=round_index, m=match_index, s=name or None: stub_game(
+                                self._game_tags(tournament, r, m, s)
+                            )
+                        )
+
+        return self.store.games.stream(tournament.storage_key, games(), out)
 
     def get_by_name(self, name: str):
         for t in self.tournaments:
             if t.name == name:
                 return t
-        return None
+        return self.store.archive.find(name)
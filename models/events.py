@@ -0,0 +1,209 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+
+from models.tournament import Round, Team, Tournament
+from utils.clocks import NO_CLOCK, initial_clocks
+from utils.pairing import BYE, ROUND_ROBIN_SYSTEMS, berger_table
+from utils.teams import match_result
+
+Event = Dict[str, Any]  # {"seq": n, "type": ..., données propres au type}
+
+
+def rebuild_schedule(tournament: Tournament) -> None:
+    """Precompute the Berger table of a round-robin event for its current field."""
+    if tournament.pairing_system not in ROUND_ROBIN_SYSTEMS:
+        return
+    tournament.schedule = berger_table(len(tournament.players), ROUND_ROBIN_SYSTEMS[tournament.pairing_system])
+    tournament.num_rounds = len(tournament.schedule)
+
+
+def _copy_matches(matches: List) -> List:
+    # L'état vivant est modifié en place : il ne doit jamais partager ses listes avec le journal
+    return [[list(side_a), list(side_b)] for side_a, side_b in matches]
+
+
+def _division(tournament: Tournament, section):
+    return tournament.get_section(section) if section else tournament
+
+
+def _set_clock(round_obj: Round, index: int, start: Optional[int] = None, finish: Optional[int] = None) -> None:
+    # Tours enregistrés avant l'horodatage des parties : rien à mettre à jour
+    if index >= len(round_obj.clocks):
+        return
+    if start is not None:
+        round_obj.clocks[index][0] = start
+    if finish is not None:
+        round_obj.clocks[index][1] = finish
+
+
+def _withdraw(tournament: Tournament, player_id: str) -> None:
+    """Withdrawal after the start: the player stays in the history and is no longer paired.
+
+    An unplayed game of the current round is lost by forfeit, and a bye of that round is
+    cancelled.
+    """
+    tournament.withdrawn.append(player_id)
+    if tournament.rounds[-1].end_datetime is not None:
+        return
+    for name, division in tournament.divisions():
+        round_obj = division.rounds[-1]
+        for index, ((player_a, score_a), (player_b, score_b)) in enumerate(round_obj.matches):
+            if player_id not in (player_a, player_b):
+                continue
+            if player_b == BYE:
+                round_obj.matches[index] = [[player_a, 0.0], [BYE, 0.0]]
+            elif float(score_a) + float(score_b) == 0 and index not in round_obj.forfeits:
+                won_by_a = player_b == player_id
+                round_obj.matches[index] = [[player_a, 1.0 if won_by_a else 0.0], [player_b, 0.0 if won_by_a else 1.0]]
+                round_obj.forfeits = sorted(set(round_obj.forfeits) | {index})
+                _set_clock(round_obj, index, NO_CLOCK, NO_CLOCK)
+            if name:
+                division.dirty = True
+            return
+
+
+def _replace_ids(player_ids: List[str], mapping: Dict[str, str]) -> List[str]:
+    # Si les deux fiches étaient inscrites au même tournoi, il n'en reste qu'une
+    merged: List[str] = []
+    for player_id in player_ids:
+        player_id = mapping.get(player_id, player_id)
+        if player_id not in merged:
+            merged.append(player_id)
+    return merged
+
+
+def merge_player_ids(tournament: Tournament, mapping: Dict[str, str]) -> bool:
+    """Rewrite every reference to a merged player ({old id: kept id}) in one pass.
+
+    Covers the field, withdrawals, sections, team rosters and lineups and all match
+    records; returns whether anything changed.
+    """
+    changed = False
+    for division in [tournament, *tournament.sections]:
+        players = _replace_ids(division.players, mapping)
+        division_changed = players != division.players
+        division.players = players
+        for round_obj in division.rounds:
+            for side_a, side_b in round_obj.matches:
+                for side in (side_a, side_b):
+                    if side[0] in mapping:
+                        side[0] = mapping[side[0]]
+                        division_changed = True
+        if division_changed and division is not tournament:
+            division.dirty = True
+        changed = changed or division_changed
+    for team in tournament.teams:
+        players = _replace_ids(team.players, mapping)
+        changed = changed or players != team.players
+        team.players = players
+    for round_obj in tournament.rounds:
+        for lineup in round_obj.lineups:
+            for side in lineup:
+                for board, player_id in enumerate(side):
+                    if player_id in mapping:
+                        side[board], changed = mapping[player_id], True
+    withdrawn = _replace_ids(tournament.withdrawn, mapping)
+    changed = changed or withdrawn != tournament.withdrawn
+    tournament.withdrawn = withdrawn
+    if changed and not tournament.rounds:
+        rebuild_schedule(tournament)
+    return changed
+
+
+def _board_result(tournament: Tournament, event: Event) -> None:
+    round_obj = tournament.rounds[event["round_index"]]
+    index, board = event["match_index"], event["board"]
+    results = round_obj.boards[index]
+    round_obj.boards[index] = results = results[:board] + event["result"] + results[board + 1:]
+    # Le match n'a de résultat (et ne compte pour l'appariement) qu'une fois tous les échiquiers joués
+    score_a, score_b = match_result(results) or (0.0, 0.0)
+    (team_a, _), (team_b, _) = round_obj.matches[index]
+    round_obj.matches[index] = [[team_a, score_a], [team_b, score_b]]
+    round_obj.forfeits = [forfeit for forfeit in round_obj.forfeits if forfeit != index]
+    if score_a + score_b and event.get("finished_at"):
+        _set_clock(round_obj, index, finish=event["finished_at"])  # dernier échiquier joué
+
+
+def apply_event(tournament: Tournament, event: Event) -> None:
+    """Apply one journal event to a tournament state (used both live and on replay)."""
+    kind = event["type"]
+    if kind == "player_registered" and event["player_id"] in tournament.withdrawn:
+        tournament.withdrawn.remove(event["player_id"])  # retour d'un joueur qui avait abandonné
+    elif kind == "player_registered":
+        tournament.players.append(event["player_id"])
+        if event.get("section"):
+            section = tournament.get_section(event["section"])
+            section.players.append(event["player_id"])
+            section.dirty = True
+        rebuild_schedule(tournament)
+    elif kind == "player_withdrawn" and tournament.rounds:
+        _withdraw(tournament, event["player_id"])
+    elif kind == "player_withdrawn":
+        tournament.players.remove(event["player_id"])
+        tournament.teams = [team for team in tournament.teams if team.name != event["player_id"]]
+        for section in tournament.sections:
+            if event["player_id"] in section.players:
+                section.players.remove(event["player_id"])
+                section.dirty = True
+        if not tournament.rounds:
+            rebuild_schedule(tournament)
+    elif kind == "round_started":
+        tournament.start_new_round(event["start_datetime"])
+        for name, payload in event["divisions"].items():
+            round_obj = _division(tournament, name).rounds[-1]
+            round_obj.matches = _copy_matches(payload["matches"])
+            round_obj.audit = payload.get("audit")
+            round_obj.forfeits = list(payload.get("forfeits", []))
+            round_obj.boards = list(payload.get("boards", []))
+            round_obj.lineups = [[list(side) for side in lineup] for lineup in payload.get("lineups", [])]
+            if event.get("started_at"):
+                round_obj.clocks = initial_clocks(round_obj.matches, round_obj.forfeits, event["started_at"])
+    elif kind == "game_started":
+        division = _division(tournament, event.get("section"))
+        _set_clock(division.rounds[event["round_index"]], event["match_index"], start=event["started_at"])
+        if division is not tournament:
+            division.dirty = True
+    elif kind in ("result_entered", "result_corrected"):
+        division = _division(tournament, event.get("section"))
+        round_obj = division.rounds[event["round_index"]]
+        match = round_obj.matches[event["match_index"]]
+        score_a, score_b = event["scores"]
+        round_obj.matches[event["match_index"]] = [[match[0][0], score_a], [match[1][0], score_b]]
+        forfeits = set(round_obj.forfeits)
+        if event.get("forfeit"):
+            forfeits.add(event["match_index"])
+            _set_clock(round_obj, event["match_index"], NO_CLOCK, NO_CLOCK)  # partie non jouée
+        else:
+            forfeits.discard(event["match_index"])
+            _set_clock(round_obj, event["match_index"], finish=event.get("finished_at"))
+        round_obj.forfeits = sorted(forfeits)
+        if division is not tournament:
+            division.dirty = True
+    elif kind == "team_registered" and event["team"] in tournament.withdrawn:
+        tournament.withdrawn.remove(event["team"])
+    elif kind == "team_registered":
+        tournament.teams.append(Team(name=event["team"], players=list(event["players"])))
+        tournament.players.append(event["team"])
+        rebuild_schedule(tournament)
+    elif kind == "lineup_set":
+        lineup = tournament.rounds[event["round_index"]].lineups[event["match_index"]]
+        lineup[event["side"]] = list(event["players"])
+    elif kind == "board_result":
+        _board_result(tournament, event)
+    elif kind == "round_ended":
+        tournament.end_current_round(event["end_datetime"])
+    elif kind == "players_merged":
+        merge_player_ids(tournament, event["mapping"])
+    elif kind == "tournament_reset":
+        tournament.current_round_index = 0
+        tournament.rounds.clear()
+        # Abandons et forfaits (portés par les tours effacés) repartent de zéro : tout le monde est réapparié
+        tournament.withdrawn.clear()
+        for section in tournament.sections:
+            section.rounds.clear()
+            section.dirty = True
+        rebuild_schedule(tournament)
+    else:
+        raise ValueError(f"Événement inconnu : {kind}.")
+    tournament.event_seq = event["seq"]
+    tournament.touch()
@@ -11,6 +11,7 @@ class Player:
     first_name: str
     last_name: str
     birthdate: str  # YYYY-MM-DD
+    rating: int = 0  # Elo, 0 = non classé
 
     def to_dict(self) -> Dict:
         return asdict(self)
@@ -26,6 +27,7 @@ class Player:
             first_name=data["first_name"],
             last_name=data["last_name"],
             birthdate=data["birthdate"],
+            rating=data["rating"],
         )
 
     def __str__(self) -> str:
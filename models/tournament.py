@@ -2,6 +2,23 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import List, Tuple, Dict, Any, Optional
 from datetime import datetime
+import itertools
+import random
+import zlib
+
+_VERSIONS = itertools.count(1)  # numéros d'état uniques dans tout le processus
+
+
+def legacy_seed(name: str, start_date: str) -> int:
+    """Seed given to tournaments stored before seeds existed, stable across loads."""
+    return zlib.crc32(f"{name}|{start_date}".encode("utf-8"))
+
+
+def make_storage_key(name: str, seed: int) -> str:
+    """Stable identifier used to name the files that belong to a tournament."""
+    slug = "".join(char if char.isalnum() else "-" for char in name.lower()).strip("-")
+    return f"{slug or 'tournoi'}-{seed:08x}"
+
 
 Match = Tuple[List[object], List[object]]  # ([player_id, score], [player_id, score])
 
@@ -12,6 +29,14 @@ class Round:
     start_datetime: str
     end_datetime: Optional[str] = None
     matches: List[Match] = field(default_factory=list)
+    audit: Optional[Dict[str, Any]] = None  # Trace de l'appariement (empreinte, groupes, flotteurs, durée)
+    forfeits: List[int] = field(default_factory=list)  # indices des matchs gagnés/perdus par forfait
+    # Épreuve par équipes, un élément par match : résultats des échiquiers (un caractère chacun,
+    # voir utils.teams) et compositions des deux équipes (identifiants dans l'ordre des échiquiers)
+    boards: List[str] = field(default_factory=list)
+    lineups: List[List[List[str]]] = field(default_factory=list)
+    # Horodatage (secondes epoch, 0 = inconnu) du début et de la fin de chaque partie : [[début, fin], ...]
+    clocks: List[List[int]] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -19,15 +44,72 @@ class Round:
             "start_datetime": self.start_datetime,
             "end_datetime": self.end_datetime,
             "matches": self.matches,
+            "audit": self.audit,
+            "forfeits": self.forfeits,
+            "boards": self.boards,
+            "lineups": self.lineups,
+            "clocks": self.clocks,
         }
 
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> "Round":
+        # Décodage strict : les fichiers sont au schéma courant (voir storage.migrations)
         return Round(
             name=data["name"],
             start_datetime=data["start_datetime"],
-            end_datetime=data.get("end_datetime"),
-            matches=[tuple(match) for match in data.get("matches", [])],
+            end_datetime=data["end_datetime"],
+            matches=[tuple(match) for match in data["matches"]],
+            audit=data["audit"],
+            forfeits=data["forfeits"],
+            boards=data["boards"],
+            lineups=data["lineups"],
+            clocks=data["clocks"],
+        )
+
+
+@dataclass
+class Team:
+    """Team of a team event: its players in board order (board 1 first)."""
+
+    name: str
+    players: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "players": self.players}
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "Team":
+        return Team(name=data["name"], players=data["players"])
+
+
+@dataclass
+class Section:
+    """Rating band of a tournament with its own players, rounds and standings."""
+
+    name: str
+    rating_floor: int = 0  # Elo minimal pour être placé dans cette section
+    players: List[str] = field(default_factory=list)
+    rounds: List[Round] = field(default_factory=list)
+    dirty: bool = field(default=True, compare=False, repr=False)  # à réécrire au prochain enregistrement
+
+    def header(self) -> Dict[str, Any]:
+        return {"name": self.name, "rating_floor": self.rating_floor}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.header(),
+            "players": self.players,
+            "rounds": [round_obj.to_dict() for round_obj in self.rounds],
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "Section":
+        return Section(
+            name=data["name"],
+            rating_floor=data["rating_floor"],
+            players=data["players"],
+            rounds=[Round.from_dict(round_dict) for round_dict in data["rounds"]],
+            dirty=False,
         )
 
 
@@ -42,8 +124,27 @@ class Tournament:
     rounds: List[Round] = field(default_factory=list)
     players: List[str] = field(default_factory=list)
     description: str = ""
+    seed: int = field(default_factory=lambda: random.SystemRandom().getrandbits(32))
+    # "swiss" (voisins au classement), "matching" (couplage optimal), "round_robin", "double_round_robin"
+    pairing_system: str = "swiss"
+    # Avec des sections, `rounds` ne garde que la chronologie (noms, horaires) ; les matchs sont par section
+    sections: List[Section] = field(default_factory=list)
+    # Toutes-rondes : table de Berger précalculée (indices dans `players`, -1 = exempt)
+    schedule: List[List[int]] = field(default_factory=list)
+    # Joueurs ayant abandonné en cours de tournoi : gardés dans `players` pour l'historique, plus appariés
+    withdrawn: List[str] = field(default_factory=list)
+    event_seq: int = 0  # dernier événement du journal intégré à cet état
+    # Épreuve par équipes : nombre d'échiquiers par match (0 = individuelle). `players` contient
+    # alors les noms des équipes, qui sont appariées comme des joueurs ; `teams` donne leurs joueurs
+    boards: int = 0
+    teams: List[Team] = field(default_factory=list)
+    time_control: str = ""  # cadence au format PGN, « base+incrément » en secondes (voir utils.clocks)
+    # Numéro de l'état en mémoire (non enregistré) : change à chaque modification et n'est jamais
+    # réutilisé, même après une annulation ; c'est la clé du cache des vues dérivées
+    version: int = field(default_factory=lambda: next(_VERSIONS), compare=False, repr=False)
 
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, with_sections: bool = True) -> Dict[str, Any]:
+        """Serialize; without `with_sections`, sections are reduced to their header."""
         return {
             "name": self.name,
             "location": self.location,
@@ -54,23 +155,89 @@ class Tournament:
             "rounds": [round_obj.to_dict() for round_obj in self.rounds],
             "players": self.players,
             "description": self.description,
+            "seed": self.seed,
+            "pairing_system": self.pairing_system,
+            "sections": [
+                section.to_dict() if with_sections else section.header() for section in self.sections
+            ],
+            "schedule": self.schedule,
+            "withdrawn": self.withdrawn,
+            "event_seq": self.event_seq,
+            "boards": self.boards,
+            "teams": [team.to_dict() for team in self.teams],
+            "time_control": self.time_control,
         }
 
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> "Tournament":
+        """Strict decoder: every key of the current schema must be present (see storage.migrations).
+
+        Sections must be complete; JsonStore joins the headers of tournaments.json with the
+        section files before decoding.
+        """
         return Tournament(
             name=data["name"],
             location=data["location"],
             start_date=data["start_date"],
             end_date=data["end_date"],
-            num_rounds=data.get("num_rounds", 4),
-            current_round_index=data.get("current_round_index", 0),
-            rounds=[Round.from_dict(round_dict) for round_dict in data.get("rounds", [])],
-            players=list(data.get("players", [])),
-            description=data.get("description", ""),
+            num_rounds=data["num_rounds"],
+            current_round_index=data["current_round_index"],
+            rounds=[Round.from_dict(round_dict) for round_dict in data["rounds"]],
+            players=data["players"],
+            description=data["description"],
+            seed=data["seed"],
+            pairing_system=data["pairing_system"],
+            sections=[Section.from_dict(section_dict) for section_dict in data["sections"]],
+            schedule=data["schedule"],
+            withdrawn=data["withdrawn"],
+            event_seq=data["event_seq"],
+            boards=data["boards"],
+            teams=[Team.from_dict(team_dict) for team_dict in data["teams"]],
+            time_control=data["time_control"],
         )
 
-    def start_new_round(self) -> Round:
+    def touch(self) -> None:
+        """Mark the state as changed: every view derived from the previous version is stale."""
+        self.version = next(_VERSIONS)
+
+    @property
+    def storage_key(self) -> str:
+        return make_storage_key(self.name, self.seed)
+
+    def divisions(self) -> List[Tuple[str, Any]]:
+        """Pairing units: each section, or the tournament itself when it has none."""
+        if self.sections:
+            return [(section.name, section) for section in self.sections]
+        return [("", self)]
+
+    def active_players(self, division: Any = None) -> List[str]:
+        """Players of the tournament (or of one division) still to be paired."""
+        players = (division or self).players
+        if not self.withdrawn:
+            return list(players)
+        withdrawn = set(self.withdrawn)
+        return [player_id for player_id in players if player_id not in withdrawn]
+
+    def get_team(self, name: str) -> Team:
+        for team in self.teams:
+            if team.name == name:
+                return team
+        raise ValueError(f"Équipe introuvable : {name}.")
+
+    def get_section(self, name: str) -> Section:
+        for section in self.sections:
+            if section.name == name:
+                return section
+        raise ValueError(f"Section introuvable : {name}.")
+
+    def section_for_rating(self, rating: int) -> Section:
+        """Highest section whose rating floor the player reaches (the lowest one otherwise)."""
+        eligible = [section for section in self.sections if rating >= section.rating_floor]
+        if not eligible:
+            return min(self.sections, key=lambda section: section.rating_floor)
+        return max(eligible, key=lambda section: section.rating_floor)
+
+    def start_new_round(self, start_datetime: Optional[str] = None) -> Round:
         if self.current_round_index >= self.num_rounds:
             raise ValueError("Le tournoi est déjà terminé.")
         # Vérifie qu'il n'y a pas de round en cours (non terminé)
@@ -79,13 +246,20 @@ class Tournament:
         round_name = f"Round {self.current_round_index + 1}"
         round_obj = Round(
             name=round_name,
-            start_datetime=datetime.now().isoformat(timespec="seconds"),
+            start_datetime=start_datetime or datetime.now().isoformat(timespec="seconds"),
         )
         self.rounds.append(round_obj)
+        for section in self.sections:
+            section.rounds.append(Round(name=round_name, start_datetime=round_obj.start_datetime))
+            section.dirty = True
         return round_obj
 
-    def end_current_round(self) -> None:
+    def end_current_round(self, end_datetime: Optional[str] = None) -> None:
         if self.current_round_index >= len(self.rounds):
             raise ValueError("Aucun tour en cours.")
-        self.rounds[self.current_round_index].end_datetime = datetime.now().isoformat(timespec="seconds")
+        end_datetime = end_datetime or datetime.now().isoformat(timespec="seconds")
+        self.rounds[self.current_round_index].end_datetime = end_datetime
+        for section in self.sections:
+            section.rounds[self.current_round_index].end_datetime = end_datetime
+            section.dirty = True
         self.current_round_index += 1
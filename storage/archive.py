@@ -0,0 +1,113 @@
+from __future__ import annotations
+import gzip
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from models.tournament import Tournament
+
+SUMMARY_FIELDS = ("name", "location", "start_date", "end_date", "num_rounds", "pairing_system", "description")
+
+
+@lru_cache(maxsize=8)
+def _read_archived(path: str) -> Tournament:
+    # Les archives sont en lecture seule : un tournoi relu reste valable tant que le programme tourne
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        return Tournament.from_dict(json.load(handle))
+
+
+class ArchivedTournament:
+    """Read-only stand-in for an archived tournament.
+
+    Summary fields are available at once; any other attribute (players, rounds, sections...)
+    loads the full record from its compressed file on first access.
+    """
+
+    def __init__(self, archive: "TournamentArchive", summary: Dict[str, Any]) -> None:
+        self._archive = archive
+        self.__dict__.update(summary)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or name == "_archive":
+            raise AttributeError(name)
+        return getattr(self._archive.load(self.storage_key), name)
+
+
+class TournamentArchive:
+    """Cold tier for finished tournaments: one gzip file each plus a summary index."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.index_path = self.directory / "index.json"
+        self._summaries: Optional[List[Dict[str, Any]]] = None
+
+    def _file(self, storage_key: str) -> Path:
+        return self.directory / f"{storage_key}.json.gz"
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        if self._summaries is None:
+            if self.index_path.exists():
+                with self.index_path.open("r", encoding="utf-8") as handle:
+                    self._summaries = json.load(handle)
+            else:
+                self._summaries = []
+        return self._summaries
+
+    def entries(self) -> List[ArchivedTournament]:
+        return [ArchivedTournament(self, summary) for summary in self.summaries()]
+
+    def find(self, name: str) -> Optional[ArchivedTournament]:
+        for summary in self.summaries():
+            if summary["name"] == name:
+                return ArchivedTournament(self, summary)
+        return None
+
+    def load(self, storage_key: str) -> Tournament:
+        return _read_archived(str(self._file(storage_key)))
+
+    def add(self, tournaments: List[Tournament]) -> None:
+        """Compress each tournament (sections included), then publish them in the index."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        summaries = list(self.summaries())
+        for tournament in tournaments:
+            with gzip.open(self._file(tournament.storage_key), "wt", encoding="utf-8") as handle:
+                json.dump(tournament.to_dict(), handle, ensure_ascii=False, separators=(",", ":"))
+            summaries.append({
+                **{name: getattr(tournament, name) for name in SUMMARY_FIELDS},
+                "storage_key": tournament.storage_key,
+                "player_count": len(tournament.players),
+            })
+        # L'index n'est remplacé qu'une fois toutes les archives écrites
+        temporary = self.index_path.with_suffix(".json.tmp")
+        with temporary.open("w", encoding="utf-8") as handle:
+            json.dump(summaries, handle, ensure_ascii=False, indent=2)
+        os.replace(temporary, self.index_path)
+        self._summaries = summaries
+
+    def merge_players(self, mapping: Dict[str, str]) -> int:
+        """Rewrite merged player ids ({old: kept}) in every archive that mentions them."""
+        from models.events import merge_player_ids
+
+        changed = 0
+        for summary in self.summaries():
+            path = self._file(summary["storage_key"])
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                tournament = Tournament.from_dict(json.load(handle))
+            if not merge_player_ids(tournament, mapping):
+                continue
+            # Fichier complet écrit à côté puis substitué : une archive n'est jamais à moitié écrite
+            temporary = path.with_suffix(".tmp")
+            with gzip.open(temporary, "wt", encoding="utf-8") as handle:
+                json.dump(tournament.to_dict(), handle, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temporary, path)
+            summary["player_count"] = len(tournament.players)
+            changed += 1
+        if changed:
+            temporary = self.index_path.with_suffix(".json.tmp")
+            with temporary.open("w", encoding="utf-8") as handle:
+                json.dump(self.summaries(), handle, ensure_ascii=False, indent=2)
+            os.replace(temporary, self.index_path)
+            _read_archived.cache_clear()
+        return changed
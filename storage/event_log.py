@@ -0,0 +1,98 @@
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class EventLog:
+    """Append-only journal of tournament events, with periodic full-state snapshots.
+
+    Each tournament has a `<key>.events.jsonl` file holding event lines (`{"seq": n, ...}`)
+    and head markers (`{"head": n}`) written by undo/redo, plus `<key>.snap-<seq>.json` files.
+    An event with seq n discards any undone events from n on, so the last line always
+    gives the current head.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _events_path(self, key: str) -> Path:
+        return self.directory / f"{key}.events.jsonl"
+
+    def _snapshot_path(self, key: str, seq: int) -> Path:
+        return self.directory / f"{key}.snap-{seq}.json"
+
+    def append(self, key: str, records: Iterable[Dict[str, Any]]) -> None:
+        """Append events or head markers; a single write per call."""
+        payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        if payload:
+            with self._events_path(key).open("a", encoding="utf-8") as handle:
+                handle.write(payload)
+
+    def head(self, key: str) -> int:
+        """Current head, read from the last line only (0 when there is no journal)."""
+        path = self._events_path(key)
+        if not path.exists() or path.stat().st_size == 0:
+            return 0
+        with path.open("rb") as handle:
+            handle.seek(0, os.SEEK_END)
+            position = handle.tell() - 1
+            # Recule jusqu'au début de la dernière ligne (le fichier finit par un saut de ligne)
+            while position > 0:
+                handle.seek(position - 1)
+                if handle.read(1) == b"\n":
+                    break
+                position -= 1
+            handle.seek(position)
+            record = json.loads(handle.readline())
+        return record.get("head", record.get("seq", 0))
+
+    def load(self, key: str) -> Tuple[List[Dict[str, Any]], int]:
+        """All valid events (including undone ones that can be redone) and the head."""
+        events: List[Dict[str, Any]] = []
+        head = 0
+        path = self._events_path(key)
+        if not path.exists():
+            return events, head
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                record = json.loads(line)
+                if "head" in record:
+                    head = record["head"]
+                    continue
+                del events[record["seq"] - 1:]
+                events.append(record)
+                head = record["seq"]
+        return events, head
+
+    def write_snapshot(self, key: str, seq: int, state: Dict[str, Any]) -> None:
+        self.write_snapshot_text(key, seq, json.dumps(state, ensure_ascii=False))
+
+    def write_snapshot_text(self, key: str, seq: int, text: str) -> None:
+        """Write an already encoded snapshot (encoded by the caller while the state is consistent)."""
+        with self._snapshot_path(key, seq).open("w", encoding="utf-8") as handle:
+            handle.write(text)
+
+    def has_snapshot(self, key: str) -> bool:
+        return any(self.directory.glob(f"{key}.snap-*.json"))
+
+    def snapshot_before(self, key: str, seq: int) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Most recent snapshot taken at or before `seq`, as (seq, state)."""
+        candidates = [
+            int(path.name[len(key) + len(".snap-"):-len(".json")])
+            for path in self.directory.glob(f"{key}.snap-*.json")
+        ]
+        candidates = [candidate for candidate in candidates if candidate <= seq]
+        if not candidates:
+            return None
+        best = max(candidates)
+        with self._snapshot_path(key, best).open("r", encoding="utf-8") as handle:
+            return best, json.load(handle)
+
+    def discard(self, key: str) -> None:
+        """Delete a tournament's journal and snapshots (once it is archived)."""
+        for path in self.directory.glob(f"{key}.snap-*.json"):
+            path.unlink()
+        self._events_path(key).unlink(missing_ok=True)
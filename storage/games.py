@@ -0,0 +1,88 @@
+from __future__ import annotations
+import json
+import mmap
+from contextlib import ExitStack
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, Optional, Tuple
+
+GameKey = Tuple[str, int, int, str, str]  # (section, ronde, table, Blancs, Noirs), "" sans section
+
+
+class GameStore:
+    """Append-only PGN file per tournament, with a byte-offset index.
+
+    `<key>.pgn` holds the game texts back to back; `<key>.pgn-index.jsonl` has one line
+    `[section, round, board, white, black, offset, length]` per stored game. Replacing a game
+    appends the new text and a new index line (the last line wins), so nothing is ever rewritten.
+    The key holds the player pair: after a reset or an undo, a board paired differently no longer
+    finds the old game. Tournament records never hold game text: it is read on request, by seek.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self._indexes: Dict[str, Dict[GameKey, Tuple[int, int]]] = {}
+
+    def _pgn_path(self, key: str) -> Path:
+        return self.directory / f"{key}.pgn"
+
+    def _index_path(self, key: str) -> Path:
+        return self.directory / f"{key}.pgn-index.jsonl"
+
+    def index(self, key: str) -> Dict[GameKey, Tuple[int, int]]:
+        """(section, round, board, white, black) -> (offset, length), read once per tournament."""
+        if key not in self._indexes:
+            index: Dict[GameKey, Tuple[int, int]] = {}
+            path = self._index_path(key)
+            if path.exists():
+                with path.open("r", encoding="utf-8") as handle:
+                    for line in handle:
+                        section, round_number, board, white, black, offset, length = json.loads(line)
+                        index[(section, round_number, board, white, black)] = (offset, length)
+            self._indexes[key] = index
+        return self._indexes[key]
+
+    def add(self, key: str, game: GameKey, text: str) -> None:
+        """Append one game and index it; an earlier text for the same board and players is superseded."""
+        index = self.index(key)
+        data = text.encode("utf-8")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._pgn_path(key).open("ab") as handle:
+            offset = handle.seek(0, 2)
+            handle.write(data)
+        # L'index n'est écrit qu'après le texte : une ligne d'index pointe toujours sur des octets présents
+        with self._index_path(key).open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps([*game, offset, len(data)]) + "\n")
+        index[game] = (offset, len(data))
+
+    def read(self, key: str, game: GameKey) -> Optional[str]:
+        location = self.index(key).get(game)
+        if location is None:
+            return None
+        offset, length = location
+        with self._pgn_path(key).open("rb") as handle:
+            handle.seek(offset)
+            return handle.read(length).decode("utf-8")
+
+    def stream(self, key: str, games: Iterable[Tuple[GameKey, Callable[[], str]]], out: BinaryIO) -> int:
+        """Write each game to `out` in order: its stored bytes as they are, else the fallback text.
+
+        Stored games are copied from a memory map of the PGN file, without decoding or parsing.
+        Returns the number of stored games copied.
+        """
+        index = self.index(key)
+        path = self._pgn_path(key)
+        with ExitStack() as stack:
+            view = None
+            if index and path.stat().st_size:
+                handle = stack.enter_context(path.open("rb"))
+                view = stack.enter_context(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+            copied = 0
+            for game, fallback in games:
+                location = index.get(game) if view is not None else None
+                if location is None:
+                    out.write(fallback().encode("utf-8"))
+                    continue
+                offset, length = location
+                out.write(view[offset:offset + length])
+                copied += 1
+        return copied
@@ -0,0 +1,419 @@
+from __future__ import annotations
+import gzip
+import json
+import os
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from models.player import Player
+from models.tournament import Tournament, legacy_seed, make_storage_key
+from utils.parsing import is_valid_national_id, parse_iso_date
+from utils.pairing import BYE
+from utils.teams import BOARD_RESULTS, UNPLAYED
+
+CHUNK_SIZE = 1 << 20  # lecture du fichier par blocs de 1 Mo
+MAX_IN_FLIGHT = 64  # tournois en attente de vérification : borne la mémoire en mode parallèle
+VALID_SCORES = {0.0, 0.5, 1.0}
+REQUIRED_FIELDS = ("name", "location", "start_date", "end_date")
+
+
+@dataclass
+class Issue:
+    """One integrity problem, with where it was found and whether it was repaired."""
+
+    location: str
+    message: str
+    repaired: bool = False
+
+    def __str__(self) -> str:
+        return f"{self.location} : {self.message}" + (" [réparé]" if self.repaired else "")
+
+
+def iter_json_array(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one at a time, without loading the whole file."""
+    decoder = json.JSONDecoder()
+    with path.open("r", encoding="utf-8") as handle:
+        buffer, position = handle.read(chunk_size), 0
+        started = False
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position >= len(buffer):
+                more = handle.read(chunk_size)
+                if not more:
+                    raise ValueError(f"{path.name} : tableau JSON non terminé.")
+                buffer, position = more, 0
+                continue
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError(f"{path.name} : un tableau JSON est attendu.")
+                started, position = True, position + 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Élément coupé en fin de bloc : on lit au moins autant que ce qui est déjà en attente
+                more = handle.read(max(chunk_size, len(buffer) - position))
+                if not more:
+                    raise
+                buffer, position = buffer[position:] + more, 0
+                continue
+            yield value
+            position = end
+            if position > chunk_size:
+                buffer, position = buffer[position:], 0
+
+
+def check_players(path: Path, repair: bool = False) -> Tuple[Set[str], List[Issue], Optional[List[Dict]]]:
+    """Known player IDs, issues, and the repaired player list (None when nothing was repaired)."""
+    known: Dict[str, Dict] = {}
+    issues: List[Issue] = []
+    kept: List[Dict] = []
+    dropped = False
+    for index, data in enumerate(iter_json_array(path)):
+        location = f"{path.name}[{index}]"
+        player_id = data.get("player_id") if isinstance(data, dict) else None
+        if not player_id:
+            issues.append(Issue(location, "joueur sans identifiant"))
+            kept.append(data)
+            continue
+        location += f" {player_id}"
+        if not is_valid_national_id(player_id):
+            issues.append(Issue(location, "identifiant national invalide"))
+        if parse_iso_date(str(data.get("birthdate", ""))) is None:
+            issues.append(Issue(location, f"date de naissance invalide : {data.get('birthdate')!r}"))
+        if player_id in known:
+            # Un doublon strictement identique peut être supprimé sans perte
+            identical = known[player_id] == data
+            issues.append(Issue(location, "identifiant en double", repaired=repair and identical))
+            if repair and identical:
+                dropped = True
+                continue
+        else:
+            known[player_id] = data
+        _check_schema(location, Player.from_dict, data, issues)
+        kept.append(data)
+    return set(known), issues, kept if dropped else None
+
+
+def _check_schema(location: str, decode: Callable[[Dict], Any], data: Dict, issues: List[Issue]) -> None:
+    """Decode the record as the loader would: a record it rejects makes the whole load fail."""
+    try:
+        decode(data)
+    except KeyError as error:
+        issues.append(Issue(location, f"champ requis absent au schéma courant : {error}"))
+    except (TypeError, ValueError, AttributeError) as error:
+        issues.append(Issue(location, f"enregistrement illisible au chargement : {error}"))
+
+
+def _check_round(
+    location: str,
+    round_data: Dict,
+    field: Set[str],
+    known_players: Set[str],
+    finished: bool,
+    repair: bool,
+    issues: List[Issue],
+) -> bool:
+    """Check one round in place; returns True when something was repaired."""
+    repaired = False
+    matches = round_data.get("matches", [])
+    seen: Set[str] = set()
+    forfeits = round_data.get("forfeits", [])
+    valid_forfeits = [index for index in forfeits if isinstance(index, int) and 0 <= index < len(matches)]
+    if len(valid_forfeits) != len(forfeits):
+        issues.append(Issue(f"{location}", "indices de forfait hors limites", repaired=repair))
+        if repair:
+            round_data["forfeits"], repaired = valid_forfeits, True
+    clocks = round_data.get("clocks", [])
+    if clocks and (len(clocks) != len(matches) or any(not isinstance(c, list) or len(c) != 2 for c in clocks)):
+        issues.append(Issue(location, "horodatages des parties incohérents avec les matchs", repaired=repair))
+        if repair:
+            # La clé reste présente : le décodeur strict l'exige (voir storage.migrations)
+            round_data["clocks"], repaired = [], True
+    elif any(start and finish and finish < start for start, finish in clocks):
+        issues.append(Issue(location, "partie terminée avant d'avoir commencé"))
+    for table, match in enumerate(matches, start=1):
+        where = f"{location} / table {table}"
+        try:
+            (player_a, score_a), (player_b, score_b) = match
+            score_a, score_b = float(score_a), float(score_b)
+        except (TypeError, ValueError):
+            issues.append(Issue(where, "match mal formé"))
+            continue
+        for player_id in (player_a, player_b):
+            if player_id == BYE:
+                continue
+            if player_id in seen:
+                issues.append(Issue(where, f"{player_id} apparié deux fois dans le tour"))
+            seen.add(player_id)
+            if player_id not in known_players:
+                issues.append(Issue(where, f"joueur inconnu : {player_id}"))
+            elif player_id not in field:
+                issues.append(Issue(where, f"{player_id} n'est pas inscrit au tournoi"))
+        if score_a not in VALID_SCORES or score_b not in VALID_SCORES:
+            issues.append(Issue(where, f"score invalide : {score_a}-{score_b}"))
+        elif player_b != BYE and score_a + score_b not in (0.0, 1.0):
+            issues.append(Issue(where, f"les scores ne totalisent pas 1 : {score_a}-{score_b}"))
+        elif player_b != BYE and score_a + score_b == 0.0 and finished and table - 1 not in valid_forfeits:
+            issues.append(Issue(where, "résultat manquant dans un tour clôturé"))
+    return repaired
+
+
+def _check_teams(location: str, data: Dict, known_players: Set[str], issues: List[Issue]) -> Set[str]:
+    """Check team rosters and board results of a team event; returns the team names."""
+    teams = {team.get("name"): team.get("players", []) for team in data.get("teams", [])}
+    for name, roster in teams.items():
+        if len(roster) < data["boards"]:
+            issues.append(Issue(location, f"équipe {name} : moins de {data['boards']} joueurs"))
+        for player_id in set(roster) - known_players:
+            issues.append(Issue(location, f"équipe {name} : joueur inconnu : {player_id}"))
+    codes = set(BOARD_RESULTS) | {UNPLAYED}
+    for round_data in data.get("rounds", []):
+        for table, results in enumerate(round_data.get("boards", []), start=1):
+            if results and (len(results) != data["boards"] or set(results) - codes):
+                where = f"{location} / {round_data.get('name')} / match {table}"
+                issues.append(Issue(where, f"résultats d'échiquiers invalides : {results!r}"))
+    return set(teams)
+
+
+def check_tournament(
+    index: int,
+    data: Dict,
+    sections_path: Path,
+    known_players: Set[str],
+    repair: bool = False,
+    location: Optional[str] = None,
+) -> Tuple[List[Issue], Optional[Dict]]:
+    """Check one tournament record and its section files; returns issues and the repaired record, if any.
+
+    Archived records carry their sections inline (no section files) and are never repaired.
+    """
+    if location is None:
+        location = f"tournois[{index}]"
+    if isinstance(data, dict):
+        location += f" « {data.get('name', '?')} »"
+    issues: List[Issue] = []
+    missing = [name for name in REQUIRED_FIELDS if not isinstance(data, dict) or name not in data]
+    if missing:
+        return [Issue(location, f"champs manquants : {', '.join(missing)}")], None
+    repaired = False
+
+    players = data.get("players", [])
+    unique_players = list(dict.fromkeys(players))
+    if len(unique_players) != len(players):
+        issues.append(Issue(location, "joueurs inscrits en double", repaired=repair))
+        if repair:
+            data["players"], players, repaired = unique_players, unique_players, True
+    field = set(players)
+    if data.get("boards"):
+        # Épreuve par équipes : les inscrits sont des équipes, leurs joueurs doivent exister
+        known_players = known_players | _check_teams(location, data, known_players, issues)
+    for player_id in field - known_players:
+        issues.append(Issue(location, f"inscrit inconnu : {player_id}"))
+    withdrawn = data.get("withdrawn", [])
+    if any(player_id not in field for player_id in withdrawn):
+        issues.append(Issue(location, "abandon d'un joueur non inscrit", repaired=repair))
+        if repair:
+            data["withdrawn"], repaired = [player_id for player_id in withdrawn if player_id in field], True
+
+    rounds = data.get("rounds", [])
+    ended = 0
+    for position, round_data in enumerate(rounds):
+        if round_data.get("end_datetime") is not None:
+            if ended != position:
+                issues.append(Issue(f"{location} / {round_data.get('name')}", "tour clôturé après un tour ouvert"))
+            ended += 1
+        elif position != len(rounds) - 1:
+            issues.append(Issue(f"{location} / {round_data.get('name')}", "tour non clôturé avant le dernier"))
+    if data.get("current_round_index", 0) != ended:
+        issues.append(Issue(
+            location, f"current_round_index = {data.get('current_round_index', 0)}, tours clôturés : {ended}",
+            repaired=repair,
+        ))
+        if repair:
+            data["current_round_index"], repaired = ended, True
+    if data.get("num_rounds", 4) < len(rounds):
+        issues.append(Issue(location, f"num_rounds = {data.get('num_rounds')} < {len(rounds)} tours", repaired=repair))
+        if repair:
+            data["num_rounds"], repaired = len(rounds), True
+
+    if not data.get("sections"):
+        for round_data in rounds:
+            repaired |= _check_round(
+                f"{location} / {round_data.get('name')}", round_data, field, known_players,
+                round_data.get("end_datetime") is not None, repair, issues,
+            )
+        _check_schema(location, Tournament.from_dict, data, issues)
+        return issues, data if repaired else None
+
+    # Tournoi par sections : chaque section est dans son propre fichier
+    storage_key = make_storage_key(data["name"], data.get("seed", legacy_seed(data["name"], data["start_date"])))
+    in_sections: Set[str] = set()
+    loaded: List[Dict] = []  # sections telles que le chargement les joint à l'en-tête
+    for header in data["sections"]:
+        section_file = sections_path / storage_key / f"{header['name']}.json"
+        where = f"{location} / section {header['name']}"
+        if "rounds" in header:  # archive : section complète dans l'enregistrement
+            section, section_file = header, None
+        elif not section_file.exists():
+            issues.append(Issue(where, f"fichier absent : {section_file}"))
+            loaded.append({**header, "players": [], "rounds": []})
+            continue
+        else:
+            with section_file.open("r", encoding="utf-8") as handle:
+                section = json.load(handle)
+        loaded.append(section)
+        section_repaired = False
+        overlap = in_sections & set(section.get("players", []))
+        if overlap:
+            issues.append(Issue(where, f"joueurs présents dans plusieurs sections : {', '.join(sorted(overlap))}"))
+        in_sections.update(section.get("players", []))
+        if len(section.get("rounds", [])) != len(rounds):
+            issues.append(Issue(where, f"{len(section.get('rounds', []))} tours pour {len(rounds)} au tournoi"))
+        for position, round_data in enumerate(section.get("rounds", [])):
+            finished = position < len(rounds) and rounds[position].get("end_datetime") is not None
+            section_repaired |= _check_round(
+                f"{where} / {round_data.get('name')}", round_data, set(section.get("players", [])),
+                known_players, finished, repair, issues,
+            )
+        if section_repaired and section_file is not None:
+            with section_file.open("w", encoding="utf-8") as handle:
+                json.dump(section, handle, ensure_ascii=False, indent=2)
+    for player_id in field - in_sections:
+        issues.append(Issue(location, f"{player_id} n'est dans aucune section"))
+    _check_schema(location, Tournament.from_dict, {**data, "sections": loaded}, issues)
+    return issues, data if repaired else None
+
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(sections_path: Path, known_players: Set[str], repair: bool) -> None:
+    # L'ensemble des identifiants n'est transmis qu'une fois par processus
+    _worker_state.update(sections_path=sections_path, known_players=known_players, repair=repair)
+
+
+def _check_in_worker(index: int, data: Dict) -> Tuple[List[Issue], Optional[Dict]]:
+    return check_tournament(
+        index, data, _worker_state["sections_path"], _worker_state["known_players"], _worker_state["repair"]
+    )
+
+
+class JsonArrayWriter:
+    """Write a JSON array element by element to a temporary file, swapped in on commit."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.temporary = path.with_suffix(path.suffix + ".tmp")
+        self.handle = self.temporary.open("w", encoding="utf-8")
+        self.handle.write("[")
+        self.count = 0
+
+    def write(self, item: Any) -> None:
+        self.handle.write(",\n" if self.count else "\n")
+        self.handle.write(json.dumps(item, ensure_ascii=False, indent=2))
+        self.count += 1
+
+    def close(self, commit: bool) -> None:
+        self.handle.write("\n]\n")
+        self.handle.close()
+        if commit:
+            os.replace(self.temporary, self.path)
+        else:
+            self.temporary.unlink()
+
+
+def check_cold_archive(archive_path: Path, sections_path: Path, known_players: Set[str]) -> List[Issue]:
+    """Check the archive index against its gzip files, then each archived tournament, one at a time.
+
+    Archives are read-only (a file is only ever replaced whole): problems are reported, never repaired.
+    """
+    issues: List[Issue] = []
+    index_path = archive_path / "index.json"
+    summaries: List[Dict] = []
+    if index_path.exists():
+        with index_path.open("r", encoding="utf-8") as handle:
+            summaries = json.load(handle)
+    indexed = set()
+    for position, summary in enumerate(summaries):
+        key = summary.get("storage_key", "?")
+        location = f"archive/{key}.json.gz"
+        indexed.add(key)
+        path = archive_path / f"{key}.json.gz"
+        if not path.exists():
+            issues.append(Issue(f"archive/index.json[{position}]", f"fichier absent : {path.name}"))
+            continue
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, EOFError, ValueError) as error:
+            issues.append(Issue(location, f"archive illisible : {error}"))
+            continue
+        if data.get("name") != summary.get("name"):
+            issues.append(Issue(location, f"nom « {data.get('name')} », « {summary.get('name')} » dans l'index"))
+        found, _ = check_tournament(position, data, sections_path, known_players, repair=False, location=location)
+        issues.extend(found)
+    for path in sorted(archive_path.glob("*.json.gz")):
+        if path.name[:-len(".json.gz")] not in indexed:
+            issues.append(Issue(f"archive/{path.name}", "archive absente de l'index (invisible pour le programme)"))
+    return issues
+
+
+def check_archive(data_dir: Path, repair: bool = False, workers: Optional[int] = None) -> List[Issue]:
+    """Verify players.json, tournaments.json, section files and archived tournaments in one streaming pass.
+
+    Tournaments are checked in worker processes when more than one CPU is available,
+    with a bounded number in flight. With `repair`, safe fixes are written back; the
+    repaired archive is streamed to a temporary file, so memory stays bounded.
+    """
+    data_dir = Path(data_dir)
+    players_path = data_dir / "players.json"
+    tournaments_path = data_dir / "tournaments" / "tournaments.json"
+    sections_path = tournaments_path.parent / "sections"
+    known_players, issues, repaired_players = check_players(players_path, repair)
+    if repaired_players is not None:
+        writer = JsonArrayWriter(players_path)
+        for player in repaired_players:
+            writer.write(player)
+        writer.close(commit=True)
+
+    writer = JsonArrayWriter(tournaments_path) if repair else None
+    changed = False
+
+    def collect(original: Optional[Dict], found: List[Issue], fixed: Optional[Dict]) -> None:
+        nonlocal changed
+        issues.extend(found)
+        if writer:
+            writer.write(fixed or original)
+            changed |= fixed is not None
+
+    workers = workers or os.cpu_count() or 1
+    try:
+        if workers < 2:
+            for index, data in enumerate(iter_json_array(tournaments_path)):
+                collect(data, *check_tournament(index, data, sections_path, known_players, repair))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(sections_path, known_players, repair)
+            ) as pool:
+                pending: deque = deque()
+                for index, data in enumerate(iter_json_array(tournaments_path)):
+                    pending.append((data if repair else None, pool.submit(_check_in_worker, index, data)))
+                    # Résultats consommés dans l'ordre : le fichier réparé garde l'ordre des tournois
+                    while len(pending) >= MAX_IN_FLIGHT or (pending and pending[0][1].done()):
+                        original, future = pending.popleft()
+                        collect(original, *future.result())
+                for original, future in pending:
+                    collect(original, *future.result())
+    finally:
+        if writer:
+            writer.close(commit=changed)
+    issues.extend(check_cold_archive(tournaments_path.parent / "archive", sections_path, known_players))
+    return issues
@@ -1,10 +1,15 @@
 from __future__ import annotations
 import json
-from typing import List, Any
+import shutil
+from typing import Any, Dict, List
 from pathlib import Path
 
 from models.player import Player
-from models.tournament import Tournament
+from models.tournament import Tournament, Section, make_storage_key
+from storage.archive import TournamentArchive
+from storage.event_log import EventLog
+from storage.games import GameStore
+from storage.migrations import migrate, write_version
 
 
 class JsonStore:
@@ -17,8 +22,17 @@ class JsonStore:
     ) -> None:
         self.players_path = Path(players_file)
         self.tournaments_path = Path(tournaments_file)
+        self.sections_path = self.tournaments_path.parent / "sections"
+        self.events = EventLog(self.tournaments_path.parent / "events")
+        self.archive = TournamentArchive(self.tournaments_path.parent / "archive")
+        self.games = GameStore(self.tournaments_path.parent / "games")
         self.players_path.parent.mkdir(parents=True, exist_ok=True)
         self.tournaments_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.players_path.exists() and not self.tournaments_path.exists():
+            write_version(self.tournaments_path.parent)  # nouveau dossier : directement au schéma courant
+        else:
+            # Fichiers d'une version antérieure : mis à niveau une fois, les chargements restent stricts
+            migrate(self.players_path, self.tournaments_path)
         if not self.players_path.exists():
             self._write_json(self.players_path, [])
         if not self.tournaments_path.exists():
@@ -41,9 +55,40 @@ class JsonStore:
     def save_players(self, players: List[Player]) -> None:
         self._write_json(self.players_path, [player.to_dict() for player in players])
 
+    def _section_file(self, tournament: Tournament, section: Section) -> Path:
+        return self.sections_path / tournament.storage_key / f"{section.name}.json"
+
     def load_tournaments(self) -> List[Tournament]:
         raw_tournaments = self._read_json(self.tournaments_path)
+        for data in raw_tournaments:
+            # Les joueurs et les tours de chaque section sont dans leur propre fichier
+            if data["sections"]:
+                directory = self.sections_path / make_storage_key(data["name"], data["seed"])
+                data["sections"] = [self._read_section(directory, header) for header in data["sections"]]
         return [Tournament.from_dict(tournament_dict) for tournament_dict in raw_tournaments]
 
+    def _read_section(self, directory: Path, header: Dict[str, Any]) -> Dict[str, Any]:
+        section_file = directory / f"{header['name']}.json"
+        if section_file.exists():
+            return self._read_json(section_file)
+        return {**header, "players": [], "rounds": []}
+
     def save_tournaments(self, tournaments: List[Tournament]) -> None:
-        self._write_json(self.tournaments_path, [tournament.to_dict() for tournament in tournaments])
+        for tournament in tournaments:
+            for section in tournament.sections:
+                if section.dirty:
+                    section_file = self._section_file(tournament, section)
+                    section_file.parent.mkdir(parents=True, exist_ok=True)
+                    self._write_json(section_file, section.to_dict())
+                    section.dirty = False
+        self._write_json(
+            self.tournaments_path,
+            [tournament.to_dict(with_sections=False) for tournament in tournaments],
+        )
+
+    def archive_tournaments(self, tournaments: List[Tournament]) -> None:
+        """Move finished tournaments to the archive; the caller then saves the remaining ones."""
+        self.archive.add(tournaments)
+        for tournament in tournaments:
+            shutil.rmtree(self.sections_path / tournament.storage_key, ignore_errors=True)
+            self.events.discard(tournament.storage_key)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from models.tournament import legacy_seed
+
+SCHEMA_VERSION = 1
+SCHEMA_FILE = "schema.json"  # {"version": n}, à côté de tournaments.json ; absent = version 0
+
+Record = Dict[str, Any]
+
+
+def _round_v1(data: Record) -> None:
+    for key, default in (
+        ("end_datetime", None), ("matches", []), ("audit", None), ("forfeits", []),
+        ("boards", []), ("lineups", []), ("clocks", []),
+    ):
+        data.setdefault(key, default)
+
+
+def _section_v1(data: Record) -> None:
+    data.setdefault("rating_floor", 0)
+    if "players" in data or "rounds" in data:  # section complète (fichier, archive, instantané)
+        data.setdefault("players", [])
+        data.setdefault("rounds", [])
+        for round_data in data["rounds"]:
+            _round_v1(round_data)
+
+
+def _tournament_v1(data: Record) -> None:
+    """Version 0 → 1: every key the decoders used to default is written out explicitly."""
+    for key, default in (
+        ("num_rounds", 4), ("current_round_index", 0), ("rounds", []), ("players", []), ("description", ""),
+        ("pairing_system", "swiss"), ("sections", []), ("schedule", []), ("withdrawn", []), ("event_seq", 0),
+        ("boards", 0), ("teams", []), ("time_control", ""),
+    ):
+        data.setdefault(key, default)
+    data.setdefault("seed", legacy_seed(data["name"], data["start_date"]))
+    for round_data in data["rounds"]:
+        _round_v1(round_data)
+    for section in data["sections"]:
+        _section_v1(section)
+    for team in data["teams"]:
+        team.setdefault("players", [])
+
+
+def _player_v1(data: Record) -> None:
+    data.setdefault("rating", 0)
+
+
+# MIGRATIONS[n] fait passer chaque sorte d'enregistrement de la version n à n + 1. Une étape
+# doit pouvoir être rejouée sans dommage : une migration interrompue reprend depuis le début.
+MIGRATIONS: List[Dict[str, Callable[[Record], None]]] = [
+    {"player": _player_v1, "tournament": _tournament_v1, "section": _section_v1},
+]
+
+
+def upgrade(kind: str, record: Record, version: int) -> Record:
+    """Bring one record ("player", "tournament" or "section") from `version` to SCHEMA_VERSION, in place."""
+    for step in MIGRATIONS[version:]:
+        step[kind](record)
+    return record
+
+
+def read_version(directory: Path) -> int:
+    path = Path(directory) / SCHEMA_FILE
+    if not path.exists():
+        return 0
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)["version"]
+
+
+def write_version(directory: Path, version: int = SCHEMA_VERSION) -> None:
+    with (Path(directory) / SCHEMA_FILE).open("w", encoding="utf-8") as handle:
+        json.dump({"version": version}, handle)
+
+
+def _upgrade_array(path: Path, kind: str, version: int) -> None:
+    from storage.integrity import JsonArrayWriter, iter_json_array  # lecteur et écrivain en flux
+
+    # Un enregistrement à la fois : la mémoire ne dépend pas de la taille du fichier
+    writer = JsonArrayWriter(path)
+    try:
+        for record in iter_json_array(path):
+            writer.write(upgrade(kind, record, version))
+    except BaseException:
+        writer.close(commit=False)
+        raise
+    writer.close(commit=True)
+
+
+def _upgrade_json(path: Path, kind: str, version: int, compressed: bool = False, **dump_options: Any) -> None:
+    # Même mise en forme que l'écrivain habituel du fichier (voir l'appelant)
+    opener: Callable[..., Any] = gzip.open if compressed else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        record = upgrade(kind, json.load(handle), version)
+    temporary = path.with_name(path.name + ".tmp")
+    with opener(temporary, "wt", encoding="utf-8") as handle:
+        json.dump(record, handle, ensure_ascii=False, **dump_options)
+    os.replace(temporary, path)
+
+
+def migrate(players_path: Path, tournaments_path: Path) -> int:
+    """Upgrade every stored file to SCHEMA_VERSION, once; returns the version found before.
+
+    Each file is rewritten next to itself and swapped in. The version file is written last,
+    so an interrupted migration simply runs again (the steps are idempotent).
+    """
+    directory = tournaments_path.parent
+    version = read_version(directory)
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Données au schéma {version}, plus récent que ce programme ({SCHEMA_VERSION}).")
+    if version == SCHEMA_VERSION:
+        return version
+    if players_path.exists():
+        _upgrade_array(players_path, "player", version)
+    if tournaments_path.exists():
+        _upgrade_array(tournaments_path, "tournament", version)
+    for path in sorted((directory / "sections").glob("*/*.json")):
+        _upgrade_json(path, "section", version, indent=2)
+    for path in sorted((directory / "events").glob("*.snap-*.json")):
+        _upgrade_json(path, "tournament", version)
+    for path in sorted((directory / "archive").glob("*.json.gz")):
+        _upgrade_json(path, "tournament", version, compressed=True, separators=(",", ":"))
+    write_version(directory)
+    return version
@@ -0,0 +1,86 @@
+from __future__ import annotations
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from storage.event_log import EventLog
+
+MAX_STALENESS = 0.2  # secondes : délai maximal entre une action et son écriture sur disque
+
+
+class BackgroundWriter:
+    """Write-behind worker for the event journal: callers only enqueue, a thread writes.
+
+    Items queued within MAX_STALENESS of each other are written together (one append per
+    tournament), so nothing stays in memory longer than that plus the write itself.
+    `flush()` blocks until everything queued so far is on disk and re-raises a write error.
+    """
+
+    def __init__(self, events: EventLog, max_staleness: float = MAX_STALENESS) -> None:
+        self.events = events
+        self.max_staleness = max_staleness
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._thread.start()
+
+    def append(self, key: str, record: Dict[str, Any]) -> None:
+        self._queue.put(("append", key, record))
+
+    def call(self, function: Callable[..., None], *args: Any) -> None:
+        """Run a write (snapshot...) on the worker thread, in queue order."""
+        self._queue.put(("call", function, args))
+
+    def flush(self) -> None:
+        self._queue.put(("flush",))  # écourte la fenêtre de regroupement en cours
+        self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_staleness
+            # Regroupe ce qui arrive pendant la fenêtre (une saisie de résultats produit des rafales)
+            while batch[-1] is not None and batch[-1][0] != "flush":
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._write([item for item in batch if item is not None])
+            except BaseException as error:  # remonté à l'appelant par flush()/close()
+                self._error = error
+            for _ in batch:
+                self._queue.task_done()
+            if batch[-1] is None:
+                return
+
+    def _write(self, items: List[tuple]) -> None:
+        pending: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            if item[0] == "flush":
+                continue
+            if item[0] == "append":
+                pending.setdefault(item[1], []).append(item[2])
+                continue
+            # Un appel (instantané) s'écrit après les lignes de journal qui le précèdent
+            self._append_all(pending)
+            item[1](*item[2])
+        self._append_all(pending)
+
+    def _append_all(self, pending: Dict[str, List[Dict[str, Any]]]) -> None:
+        for key, records in pending.items():
+            self.events.append(key, records)
+        pending.clear()
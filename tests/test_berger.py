@@ -0,0 +1,31 @@
+from utils.pairing import berger_table
+
+
+def _colour_histories(table):
+    histories = {}
+    for flat in table:
+        for position in range(0, len(flat), 2):
+            white, black = flat[position], flat[position + 1]
+            if -1 in (white, black):
+                continue
+            histories[white] = histories.get(white, "") + "W"
+            histories[black] = histories.get(black, "") + "B"
+    return histories
+
+
+def test_double_round_robin_never_gives_a_colour_three_times_in_a_row():
+    for player_count in range(2, 31):
+        for player, history in _colour_histories(berger_table(player_count, double=True)).items():
+            assert "WWW" not in history and "BBB" not in history, (player_count, player, history)
+
+
+def test_double_round_robin_meets_every_pair_once_per_colour():
+    for player_count in range(2, 31):
+        whites = {}
+        for flat in berger_table(player_count, double=True):
+            for position in range(0, len(flat), 2):
+                white, black = flat[position], flat[position + 1]
+                if -1 not in (white, black):
+                    whites.setdefault(frozenset((white, black)), []).append(white)
+        assert len(whites) == player_count * (player_count - 1) // 2
+        assert all(len(set(players)) == 2 for players in whites.values()), player_count
@@ -0,0 +1,37 @@
+import pytest
+
+from controllers.tournament_controller import TournamentController
+from models.player import Player
+from storage.json_store import JsonStore
+from utils.simulation import forecast_standings
+
+
+def _controller(tmp_path):
+    store = JsonStore(str(tmp_path / "players.json"), str(tmp_path / "tournaments" / "tournaments.json"))
+    players = {
+        f"ZZ0000{index}": Player(
+            player_id=f"ZZ0000{index}", last_name=f"N{index}", first_name=f"P{index}",
+            birthdate="1990-01-01", rating=1500 + 100 * index,
+        )
+        for index in range(4)
+    }
+    controller = TournamentController(store, players)
+    controller.autosave = False
+    tournament = controller.create_tournament("Open", "Lyon", "2025-06-01", "2025-06-02", num_rounds=3)
+    for player_id in players:
+        controller.register_player(tournament, player_id)
+    controller.start_next_round(tournament)
+    return controller, tournament
+
+
+def test_forecast_rejects_zero_simulations(tmp_path):
+    controller, tournament = _controller(tmp_path)
+    with pytest.raises(ValueError, match="simulation"):
+        controller.forecast(tournament, simulations=0)
+
+
+def test_forecast_standings_with_no_simulation_is_all_zero(tmp_path):
+    _, tournament = _controller(tmp_path)
+    distribution = forecast_standings(tournament, {}, simulations=0)
+    assert sorted(distribution) == sorted(tournament.players)
+    assert all(not any(probabilities) for probabilities in distribution.values())
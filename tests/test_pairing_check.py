@@ -0,0 +1,15 @@
+from benchmarks.pairing_check import CONTRACTS, run_case
+
+
+def test_every_system_keeps_its_contract_over_random_tournaments():
+    systems = tuple(CONTRACTS)
+    for case in range(60):
+        problems, _ = run_case(case, seed=7, systems=systems, min_players=2, max_players=40, max_rounds=9)
+        assert not problems, problems
+
+
+def test_swiss_avoids_rematches_when_an_alternative_exists():
+    for seed in range(1, 4):
+        for case in range(40):
+            problems, _ = run_case(case, seed=seed, systems=("swiss",), min_players=2, max_players=24, max_rounds=9)
+            assert not problems, problems
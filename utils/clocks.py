@@ -0,0 +1,132 @@
+from __future__ import annotations
+import heapq
+import re
+import time
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.pairing import BYE
+
+# Cadence au format PGN (TimeControl) : « base+incrément » en secondes, ex. « 5400+30 » ; vide = inconnue
+_TIME_CONTROL = re.compile(r"^(\d+)(?:\+(\d+))?$")
+NO_CLOCK = 0  # horodatage inconnu (partie non jouée, exempt, données antérieures)
+
+
+def now_epoch() -> int:
+    return int(time.time())
+
+
+def epoch_of(iso_datetime: Optional[str]) -> int:
+    """Horodatage (secondes) d'une date ISO enregistrée, NO_CLOCK si absente ou illisible."""
+    if not iso_datetime:
+        return NO_CLOCK
+    try:
+        return int(datetime.fromisoformat(iso_datetime).timestamp())
+    except ValueError:
+        return NO_CLOCK
+
+
+def parse_time_control(text: str) -> Tuple[int, int]:
+    """(base, incrément) en secondes ; lève ValueError si la cadence n'est pas au format PGN."""
+    match = _TIME_CONTROL.match(text.strip())
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Cadence invalide : {text} (attendu : base+incrément en secondes, ex. 5400+30).")
+    return int(match.group(1)), int(match.group(2) or 0)
+
+
+def time_control_label(text: str) -> str:
+    """Cadence lisible : « 90 min + 30 s », « 5 min », « inconnue »."""
+    if not text:
+        return "inconnue"
+    base, increment = parse_time_control(text)
+    label = f"{base // 60} min" if base % 60 == 0 else f"{base} s"
+    return f"{label} + {increment} s" if increment else label
+
+
+def initial_clocks(matches: List, forfeits: Iterable[int], started_at: int) -> List[List[int]]:
+    """[début, fin] de chaque partie d'un nouveau tour : seules les vraies parties commencent."""
+    unplayed = set(forfeits)
+    return [
+        [NO_CLOCK if side_b[0] == BYE or index in unplayed else started_at, NO_CLOCK]
+        for index, (_, side_b) in enumerate(matches)
+    ]
+
+
+class TimingTable:
+    """Colonnes (array) d'une ligne par partie chronométrée et d'une ligne par tour clôturé.
+
+    Construite en un seul parcours des tournois ; les agrégats se calculent ensuite sur les
+    colonnes, sans revenir aux objets Tournament (qui peuvent être des archives déjà relâchées).
+    """
+
+    def __init__(self, slowest: int = 10) -> None:
+        self.controls: List[str] = []  # cadences rencontrées ; `game_control` y renvoie
+        self._control_indices: Dict[str, int] = {}
+        self.slowest_count = slowest
+        self.game_control = array("I")
+        self.game_seconds = array("q")
+        self.round_seconds = array("q")
+        self.slowest: List[Tuple[int, str, int, int, str, str]] = []  # tas des parties les plus longues
+
+    def _control_index(self, time_control: str) -> int:
+        if time_control not in self._control_indices:
+            self._control_indices[time_control] = len(self.controls)
+            self.controls.append(time_control)
+        return self._control_indices[time_control]
+
+    def add(self, tournaments: Iterable[Any]) -> "TimingTable":
+        """Ajoute les tours et les parties chronométrées des tournois, en un parcours."""
+        for tournament in tournaments:
+            control = self._control_index(tournament.time_control)
+            for round_obj in tournament.rounds:
+                start, end = epoch_of(round_obj.start_datetime), epoch_of(round_obj.end_datetime)
+                if start and end >= start:
+                    self.round_seconds.append(end - start)
+            for _, division in tournament.divisions():
+                for number, round_obj in enumerate(division.rounds, start=1):
+                    for board, (start, finish) in enumerate(round_obj.clocks, start=1):
+                        if not start or finish < start:
+                            continue
+                        self.game_control.append(control)
+                        self.game_seconds.append(finish - start)
+                        (player_a, _), (player_b, _) = round_obj.matches[board - 1]
+                        row = (finish - start, tournament.name, number, board, player_a, player_b)
+                        if len(self.slowest) < self.slowest_count:
+                            heapq.heappush(self.slowest, row)
+                        elif self.slowest_count:
+                            heapq.heappushpop(self.slowest, row)
+        return self
+
+    def report(self) -> Dict[str, Any]:
+        """Répartition des durées de tour, parties les plus longues, durée moyenne par cadence (secondes)."""
+        import statistics  # chargé seulement pour le rapport (coût au démarrage)
+
+        rounds = sorted(self.round_seconds)
+        distribution: Dict[str, float] = {"count": len(rounds)}
+        if rounds:
+            if len(rounds) > 1:
+                quartiles = statistics.quantiles(rounds, n=4, method="inclusive")
+                deciles = statistics.quantiles(rounds, n=10, method="inclusive")
+            else:
+                quartiles, deciles = [rounds[0]] * 3, [rounds[0]] * 9
+            distribution.update(
+                min=rounds[0], q1=quartiles[0], median=quartiles[1], q3=quartiles[2], p90=deciles[8], max=rounds[-1]
+            )
+        totals = [0] * len(self.controls)
+        counts = [0] * len(self.controls)
+        for control, seconds in zip(self.game_control, self.game_seconds):
+            totals[control] += seconds
+            counts[control] += 1
+        per_control = sorted(
+            (
+                (time_control_label(control), counts[index], totals[index] / counts[index])
+                for index, control in enumerate(self.controls) if counts[index]
+            ),
+            key=lambda row: -row[1],
+        )
+        return {
+            "rounds": distribution,
+            "slowest": sorted(self.slowest, reverse=True),
+            "per_control": per_control,
+        }
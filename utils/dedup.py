@@ -0,0 +1,135 @@
+from __future__ import annotations
+import os
+from dataclasses import dataclass
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.search import normalize
+
+NAME_SIMILARITY = 0.85  # même date de naissance : noms au moins aussi proches
+TYPO_DATE_SIMILARITY = 0.95  # date différente d'un seul élément (faute de frappe) : noms quasi identiques
+MAX_BLOCK_SIZE = 500  # au-delà, un bloc est trop peu discriminant pour être comparé paire à paire
+INLINE_LIMIT = 20_000  # en dessous, démarrer des processus coûte plus que la comparaison
+
+PlayerRow = Tuple[str, str, str, str, int]  # (identifiant, prénom, nom normalisés, date de naissance, Elo)
+
+
+@dataclass
+class DuplicateCandidate:
+    """Deux fiches probablement pour la même personne : `drop_id` serait fusionné dans `keep_id`."""
+
+    keep_id: str
+    drop_id: str
+    score: float
+    reason: str
+
+
+def blocking_keys(row: PlayerRow) -> List[tuple]:
+    """Clés de regroupement : seules les fiches partageant une clé sont comparées entre elles."""
+    _, first, last, birthdate, _ = row
+    # La seconde clé rattrape une faute dans la date ; prénom et nom peuvent être inversés
+    return [("date", birthdate), ("nom", birthdate[:4], *sorted((first[:3], last[:3])))]
+
+
+@lru_cache(maxsize=65536)
+def _letters(name: str) -> Counter:
+    return Counter(name)
+
+
+def _dates_differ_once(date_a: str, date_b: str) -> bool:
+    parts_a, parts_b = date_a.split("-"), date_b.split("-")
+    return len(parts_a) == len(parts_b) and sum(a != b for a, b in zip(parts_a, parts_b)) == 1
+
+
+def score_pair(row_a: PlayerRow, row_b: PlayerRow) -> Optional[Tuple[float, str]]:
+    """Similarité des deux fiches et motif, ou None si ce ne sont pas des doublons probables."""
+    same_date = row_a[3] == row_b[3]
+    if not same_date and not _dates_differ_once(row_a[3], row_b[3]):
+        return None
+    threshold = NAME_SIMILARITY if same_date else TYPO_DATE_SIMILARITY
+    reason = "même date de naissance" if same_date else "date de naissance proche"
+    name_a = f"{row_a[2]} {row_a[1]}"
+    names_b = (f"{row_b[2]} {row_b[1]}", f"{row_b[1]} {row_b[2]}")
+    if name_a in names_b:
+        return 1.0, reason
+    # Borne supérieure de la similarité, identique dans les deux ordres (mêmes lettres) :
+    # la plupart des paires s'arrêtent là, sans construire de SequenceMatcher
+    common = sum((_letters(name_a) & _letters(names_b[0])).values())
+    if 2 * common / (len(name_a) + len(names_b[0])) < threshold:
+        return None
+    matcher = SequenceMatcher(None, autojunk=False)
+    matcher.set_seq2(name_a)  # la seconde séquence est celle que SequenceMatcher indexe
+    best = 0.0
+    for name_b in names_b:
+        matcher.set_seq1(name_b)
+        best = max(best, matcher.ratio())
+    return (best, reason) if best >= threshold else None
+
+
+def _keep_first(row_a: PlayerRow, row_b: PlayerRow) -> bool:
+    # On garde la fiche classée, sinon l'identifiant le plus ancien (le plus petit)
+    return (row_a[4] > 0, row_b[0]) >= (row_b[4] > 0, row_a[0])
+
+
+def _score_blocks(blocks: List[List[PlayerRow]]) -> List[DuplicateCandidate]:
+    found: List[DuplicateCandidate] = []
+    for block in blocks:
+        for index, row_a in enumerate(block):
+            for row_b in block[index + 1:]:
+                result = score_pair(row_a, row_b)
+                if result is None:
+                    continue
+                keep, drop = (row_a, row_b) if _keep_first(row_a, row_b) else (row_b, row_a)
+                found.append(DuplicateCandidate(keep[0], drop[0], round(result[0], 3), result[1]))
+    return found
+
+
+def find_duplicates(players: Iterable, workers: Optional[int] = None) -> List[DuplicateCandidate]:
+    """Doublons probables parmi les joueurs, du plus au moins sûr.
+
+    Les fiches sont regroupées par clés (date de naissance ; année et début du prénom et du nom),
+    puis comparées paire à paire à l'intérieur de chaque bloc seulement, en parallèle sur
+    plusieurs processus pour un grand fichier.
+    """
+    rows = [(p.player_id, normalize(p.first_name), normalize(p.last_name), p.birthdate, p.rating) for p in players]
+    blocks: Dict[tuple, List[PlayerRow]] = {}
+    for row in rows:
+        for key in blocking_keys(row):
+            blocks.setdefault(key, []).append(row)
+    comparable = [block for block in blocks.values() if 1 < len(block) <= MAX_BLOCK_SIZE]
+
+    workers = workers or os.cpu_count() or 1
+    if workers < 2 or len(rows) < INLINE_LIMIT:
+        candidates = _score_blocks(comparable)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = [comparable[index::workers * 4] for index in range(workers * 4)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            candidates = [candidate for part in pool.map(_score_blocks, chunks) for candidate in part]
+
+    # Une même paire peut venir de deux blocs
+    seen: Set[Tuple[str, str]] = set()
+    unique = []
+    for candidate in sorted(candidates, key=lambda c: (-c.score, c.keep_id, c.drop_id)):
+        pair = (candidate.keep_id, candidate.drop_id)
+        if pair not in seen:
+            seen.add(pair)
+            unique.append(candidate)
+    return unique
+
+
+def merge_plan(accepted: Iterable[DuplicateCandidate]) -> Dict[str, str]:
+    """Correspondance {identifiant supprimé: identifiant conservé}, chaînes résolues (A->B, B->C : A->C)."""
+    mapping: Dict[str, str] = {}
+    for candidate in accepted:
+        if candidate.keep_id in mapping or candidate.drop_id in mapping:
+            continue  # fiche déjà fusionnée par une proposition plus sûre
+        mapping[candidate.drop_id] = candidate.keep_id
+    for drop_id, keep_id in mapping.items():
+        while keep_id in mapping:
+            keep_id = mapping[keep_id]
+        mapping[drop_id] = keep_id
+    return mapping
@@ -0,0 +1,41 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+DEFAULT_SIZE = 512
+
+
+class VersionedMemo:
+    """Cache LRU borné de vues dérivées, indexé par (version de l'état, vue, paramètres).
+
+    La version change à chaque modification d'un tournoi : les vues de l'ancien état ne sont
+    plus jamais demandées et sortent du cache par ancienneté, sans toucher à celles des
+    autres tournois. Les valeurs renvoyées sont partagées : ne pas les modifier.
+    Utilisable depuis plusieurs fils : le calcul se fait hors du verrou.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -1,18 +1,80 @@
 from __future__ import annotations
+import hashlib
+import json
 import random
-from typing import List, Tuple, Dict
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from utils.matching import max_weight_matching
 
 Match = Tuple[list, list]  # ([player_id, score], [player_id, score])
 
+BYE = "BYE"  # adversaire fictif d'un joueur exempt : [[joueur, points], [BYE, 0.0]]
+BYE_SCORE = 1.0  # point de l'exempt désigné par l'appariement (le toutes-rondes n'en donne pas)
+
+# Coûts du couplage optimal (plus petit = meilleur appariement)
+SCORE_GAP_COST = 1_000  # par demi-point d'écart, au carré
+COLOUR_COST = 50  # deux joueurs dus de la même couleur
+STRONG_COLOUR_COST = 5_000  # deux joueurs dont la couleur due est impérative (voir _colour_is_absolute)
+REMATCH_COST = 10_000_000  # rencontre déjà jouée : utilisée seulement si inévitable
+REPEAT_BYE_COST = 10_000_000  # second exempt pour un même joueur
+COMPLETE_GRAPH_LIMIT = 100  # au-delà, seuls les voisins proches au classement sont candidats
+CANDIDATE_WINDOW = 16
+BLOCK_SIZE = 128  # au-delà de COMPLETE_GRAPH_LIMIT, le classement est apparié par tranches de cette taille
+REMATCH_SEARCH_STEPS = 5_000  # au-delà, next_round laisse optimal_round placer les revanches inévitables
+
+
+def make_rng(seed: int, round_index: int, stream: str = "") -> random.Random:
+    """Générateur isolé et reproductible pour un tournoi (et une section) et un tour donnés."""
+    if stream:
+        return random.Random(f"{seed}:{stream}:{round_index}")
+    return random.Random(f"{seed}:{round_index}")
+
+
+def bye_match(player_id: str, score: float = BYE_SCORE) -> Match:
+    return [[player_id, score], [BYE, 0.0]]
+
+
+def bye_recipients(round_list: list) -> Set[str]:
+    return {
+        player_a
+        for round_obj in round_list
+        for (player_a, _), (player_b, _) in round_obj.matches
+        if player_b == BYE
+    }
 
-def first_round(player_ids: List[str]) -> List[Match]:
+
+def played_games(round_obj) -> Iterator[Tuple[str, str]]:
+    """Parties réellement jouées d'un tour (Blancs, Noirs) : ni exempt, ni forfait."""
+    forfeits = set(getattr(round_obj, "forfeits", ()))
+    for index, ((player_a, _), (player_b, _)) in enumerate(round_obj.matches):
+        if player_b != BYE and index not in forfeits:
+            yield player_a, player_b
+
+
+def _split_bye(
+    ordered: List[str], round_list: list, derived: Optional[Dict[str, Any]] = None
+) -> Tuple[List[str], List[Match]]:
+    """Retire l'exempt d'un effectif impair : le moins bien classé qui ne l'a pas encore été."""
+    if len(ordered) % 2 == 0:
+        return ordered, []
+    already = derived["byes"] if derived else bye_recipients(round_list)
+    index = next(
+        (index for index in range(len(ordered) - 1, -1, -1) if ordered[index] not in already),
+        len(ordered) - 1,
+    )
+    return ordered[:index] + ordered[index + 1:], [bye_match(ordered[index])]
+
+
+def first_round(player_ids: List[str], rng: Optional[random.Random] = None) -> List[Match]:
+    rng = rng or random.Random()
     shuffled_ids = player_ids[:]
-    random.shuffle(shuffled_ids)
+    rng.shuffle(shuffled_ids)
+    shuffled_ids, byes = _split_bye(shuffled_ids, [])
     matches: List[Match] = []
     for index in range(0, len(shuffled_ids), 2):
-        if index + 1 < len(shuffled_ids):
-            matches.append([[shuffled_ids[index], 0.0], [shuffled_ids[index + 1], 0.0]])
-    return matches
+        matches.append([[shuffled_ids[index], 0.0], [shuffled_ids[index + 1], 0.0]])
+    return matches + byes
 
 
 def compute_scores(round_list: list) -> Dict[str, float]:
@@ -21,18 +83,329 @@ def compute_scores(round_list: list) -> Dict[str, float]:
         for (player_a, score_a), (player_b, score_b) in round_obj.matches:
             scores[player_a] = scores.get(player_a, 0.0) + float(score_a)
             scores[player_b] = scores.get(player_b, 0.0) + float(score_b)
+    scores.pop(BYE, None)
     return scores
 
 
-def next_round(player_ids: List[str], round_list: list) -> List[Match]:
-    scores_by_player = compute_scores(round_list)
+def opponents(round_list: list) -> Dict[str, Set[str]]:
+    """Adversaires déjà rencontrés (parties jouées) par joueur."""
+    met: Dict[str, Set[str]] = {}
+    for round_obj in round_list:
+        for player_a, player_b in played_games(round_obj):
+            met.setdefault(player_a, set()).add(player_b)
+            met.setdefault(player_b, set()).add(player_a)
+    return met
+
+
+def tie_breaks(round_list: list, scores_by_player: Dict[str, float]) -> Dict[str, Tuple[float, float]]:
+    """Départages (Buchholz, Sonneborn-Berger) calculés sur les parties jouées."""
+    breaks: Dict[str, List[float]] = {}
+    for round_obj in round_list:
+        forfeits = set(getattr(round_obj, "forfeits", ()))
+        for index, ((player_a, score_a), (player_b, score_b)) in enumerate(round_obj.matches):
+            if player_b == BYE or index in forfeits:
+                continue
+            for player, own, opponent in ((player_a, score_a, player_b), (player_b, score_b, player_a)):
+                opponent_score = scores_by_player.get(opponent, 0.0)
+                totals = breaks.setdefault(player, [0.0, 0.0])
+                totals[0] += opponent_score
+                totals[1] += float(own) * opponent_score
+    return {player: (buchholz, sonneborn) for player, (buchholz, sonneborn) in breaks.items()}
+
+
+def derived_views(round_list: list) -> Dict[str, Any]:
+    """Vues dérivées des tours joués dont se servent les appariements."""
+    return {
+        "scores": compute_scores(round_list),
+        "colours": colour_history(round_list),
+        "opponents": opponents(round_list),
+        "byes": bye_recipients(round_list),
+    }
+
+
+def _pair_in_order(ordered: List[str], met: Dict[str, Set[str]]) -> Optional[List[Tuple[str, str]]]:
+    """Appariement dans l'ordre du classement sans aucune revanche ; None s'il n'y en a pas (ou trop long à trouver).
+
+    Le mieux classé encore libre prend le suivant libre qu'il n'a pas rencontré ; quand le reste ne
+    peut plus être apparié, la recherche revient sur le dernier choix et essaie le candidat suivant.
+    """
+    count = len(ordered)
+    taken = [False] * count
+    stack: List[Tuple[int, int]] = []
+    top, start, steps = 0, 0, 0
+    while True:
+        while top < count and taken[top]:
+            top += 1
+        if top == count:
+            return [(ordered[a], ordered[b]) for a, b in stack]
+        steps += 1
+        if steps > REMATCH_SEARCH_STEPS:
+            return None
+        already = met.get(ordered[top], ())
+        partner = next(
+            (j for j in range(max(start, top + 1), count) if not taken[j] and ordered[j] not in already), None
+        )
+        if partner is not None:
+            taken[top] = taken[partner] = True
+            stack.append((top, partner))
+            start = 0
+            continue
+        if not stack:
+            return None
+        top, previous = stack.pop()
+        taken[top] = taken[previous] = False
+        start = previous + 1
+
+
+def next_round(player_ids: List[str], round_list: list, derived: Optional[Dict[str, Any]] = None) -> List[Match]:
+    """Apparie les voisins au classement en sautant les adversaires déjà rencontrés quand c'est possible.
+
+    S'il n'existe aucun appariement sans revanche, le tour est confié à `optimal_round`, qui réduit
+    au minimum les revanches inévitables sans jamais donner d'exempt évitable.
+    """
+    scores_by_player = derived["scores"] if derived else compute_scores(round_list)
+    met = derived["opponents"] if derived else opponents(round_list)
     # Trie les joueurs par score décroissant, puis par nom pour stabilité
     ordered_players = sorted(
         player_ids,
         key=lambda pid: (-scores_by_player.get(pid, 0.0), pid)
     )
+    remaining, byes = _split_bye(ordered_players, round_list, derived)
+    pairs = _pair_in_order(remaining, met)
+    if pairs is None:
+        # L'exempt se choisit alors avec les parties : un autre exempt peut éviter une revanche
+        return optimal_round(player_ids, round_list, derived, strict_byes=True)
+    return [[[white, 0.0], [black, 0.0]] for white, black in pairs] + byes
+
+
+def colour_history(round_list: list) -> Dict[str, str]:
+    """Historique des couleurs par joueur ("W" = Blancs, premier du match ; "B" = Noirs)."""
+    history: Dict[str, str] = {}
+    for round_obj in round_list:
+        for player_a, player_b in played_games(round_obj):
+            history[player_a] = history.get(player_a, "") + "W"
+            history[player_b] = history.get(player_b, "") + "B"
+    return history
+
+
+def _due_colour(history: str) -> Optional[str]:
+    if not history:
+        return None
+    whites = history.count("W")
+    blacks = len(history) - whites
+    if whites != blacks:
+        return "W" if blacks > whites else "B"
+    return "B" if history[-1] == "W" else "W"
+
+
+def _colour_is_absolute(history: str) -> bool:
+    """Couleur due impérative : même couleur aux deux derniers tours, ou deux parties d'écart entre les couleurs."""
+    return (len(history) >= 2 and history[-1] == history[-2]) or abs(2 * history.count("W") - len(history)) >= 2
+
+
+def _blocks(ordered_players: List[str], half_points: List[int], had_bye: Set[str]) -> List[Tuple[int, int]]:
+    """Tranches du classement appariées séparément (effectifs au-delà de COMPLETE_GRAPH_LIMIT).
+
+    Le coût du couplage croît plus vite que l'effectif : plusieurs tranches d'environ BLOCK_SIZE
+    joueurs coûtent bien moins qu'un seul grand couplage. Chaque coupure tombe à un indice pair,
+    de préférence entre deux groupes de points ; la dernière tranche garde l'éventuel exempt.
+    """
+    count = len(ordered_players)
+    if count <= COMPLETE_GRAPH_LIMIT:
+        return [(0, count)]
+    cuts = [0]
+    while count - cuts[-1] >= BLOCK_SIZE + BLOCK_SIZE // 2:
+        stop = cuts[-1] + BLOCK_SIZE
+        cuts.append(next(
+            (cut for cut in range(stop, stop - BLOCK_SIZE // 4, -2) if half_points[cut - 1] != half_points[cut]),
+            stop,
+        ))
+    blocks = list(zip(cuts, cuts[1:] + [count]))
+    last_start = blocks[-1][0]
+    if count % 2 and had_bye.issuperset(ordered_players[last_start:]) and not had_bye.issuperset(ordered_players):
+        return [(0, count)]  # aucun exempt possible en bas du classement : un seul couplage le place
+    return blocks
+
+
+def optimal_round(
+    player_ids: List[str], round_list: list, derived: Optional[Dict[str, Any]] = None, strict_byes: bool = False
+) -> List[Match]:
+    """Appariement par couplage parfait de coût minimal (écart de points, revanches, couleurs).
+
+    Les joueurs sont triés comme dans `next_round` ; si leur nombre est impair, l'exempt
+    est choisi le plus bas possible au classement parmi ceux qui ne l'ont pas encore été.
+    Un second exempt coûte autant qu'une revanche ; avec `strict_byes`, il n'est possible que
+    si tous les joueurs ont déjà été exempts (règle de `next_round`).
+    `derived` (voir derived_views) évite de recalculer ce que l'appelant a déjà en cache.
+    """
+    derived = derived or derived_views(round_list)
+    scores_by_player = derived["scores"]
+    histories = derived["colours"]
+    ordered_players = sorted(
+        player_ids,
+        key=lambda pid: (-scores_by_player.get(pid, 0.0), pid)
+    )
+    count = len(ordered_players)
+    if count < 2:
+        return [bye_match(pid) for pid in ordered_players]
+    met = derived["opponents"]
+    half_points = [round(2 * scores_by_player.get(pid, 0.0)) for pid in ordered_players]
+    due = [_due_colour(histories.get(pid, "")) for pid in ordered_players]
+    strong = [_colour_is_absolute(histories.get(pid, "")) for pid in ordered_players]
+    window = count if count <= COMPLETE_GRAPH_LIMIT else CANDIDATE_WINDOW
+    had_bye = derived["byes"]
+    strict = strict_byes and not had_bye.issuperset(ordered_players)
+
+    def pair_block(start: int, stop: int) -> Dict[int, int]:
+        # Couplage d'une tranche du classement (indices locaux) ; l'exempt, sommet fictif stop - start,
+        # n'existe que dans la dernière tranche d'un effectif impair
+        costs: List[Tuple[int, int, int]] = []
+        for i in range(start, stop):
+            for j in range(i + 1, min(stop, i + window + 1)):
+                cost = SCORE_GAP_COST * (half_points[i] - half_points[j]) ** 2 + (j - i)
+                if due[i] is not None and due[i] == due[j]:
+                    cost += STRONG_COLOUR_COST if strong[i] and strong[j] else COLOUR_COST
+                if ordered_players[j] in met.get(ordered_players[i], ()):
+                    cost += REMATCH_COST
+                costs.append((i - start, j - start, cost))
+        if (stop - start) % 2:
+            for i in range(start, stop):
+                if strict and ordered_players[i] in had_bye:
+                    continue
+                if i >= count - window or ordered_players[i] not in had_bye:
+                    bye_cost = count - 1 - i + (REPEAT_BYE_COST if ordered_players[i] in had_bye else 0)
+                    costs.append((i - start, stop - start, bye_cost))
+        ceiling = max(cost for _, _, cost in costs) + 1
+        local = max_weight_matching([(i, j, ceiling - cost) for i, j, cost in costs], maxcardinality=True)
+        return {
+            start + i: count if j == stop - start else start + j if j >= 0 else -1
+            for i, j in enumerate(local[:stop - start])
+        }
+
+    mate: Dict[int, int] = {}
+    for start, stop in _blocks(ordered_players, half_points, had_bye):
+        mate.update(pair_block(start, stop))
+
     matches: List[Match] = []
-    for i in range(0, len(ordered_players), 2):
-        if i + 1 < len(ordered_players):
-            matches.append([[ordered_players[i], 0.0], [ordered_players[i + 1], 0.0]])
+    byes: List[Match] = []
+    for i in range(count):
+        j = mate[i]
+        if j == count:
+            byes.append(bye_match(ordered_players[i]))
+        if j <= i or j >= count:
+            continue
+        # Le mieux classé prend les Blancs sauf si la couleur due impose l'inverse ; à couleur due
+        # égale, elle revient d'abord à celui pour qui elle est impérative
+        white, black = i, j
+        if due[i] == due[j] and strong[j] and not strong[i]:
+            if due[j] == "W":
+                white, black = j, i
+        elif due[i] == "B" or (due[j] == "W" and due[i] != "W"):
+            white, black = j, i
+        matches.append([[ordered_players[white], 0.0], [ordered_players[black], 0.0]])
+    return matches + byes
+
+
+def berger_table(player_count: int, double: bool = False) -> List[List[int]]:
+    """Tables de Berger : pour chaque tour, indices aplatis [blanc, noir, blanc, noir, ...].
+
+    Un nombre impair de joueurs ajoute un exempt noté -1. En double toutes-rondes, le
+    second cycle rejoue le premier avec les couleurs inversées, ses deux premiers tours
+    permutés : sinon deux joueurs auraient trois fois de suite la même couleur à la jonction.
+    """
+    size = player_count + player_count % 2
+    last = size - 1
+    table: List[List[int]] = []
+    for round_index in range(last):
+        flat: List[int] = []
+        # Le dernier joueur est fixe et alterne les couleurs ; les autres tournent autour
+        pivot = round_index % last
+        flat.extend([pivot, last] if round_index % 2 == 0 else [last, pivot])
+        for offset in range(1, size // 2):
+            player_a = (round_index + offset) % last
+            player_b = (round_index - offset) % last
+            flat.extend([player_a, player_b] if offset % 2 else [player_b, player_a])
+        table.append(flat)
+    if player_count % 2:
+        table = [[-1 if index == last else index for index in flat] for flat in table]
+    if double:
+        second = table[1::-1] + table[2:]
+        table += [
+            [flat[position + offset] for position in range(0, len(flat), 2) for offset in (1, 0)]
+            for flat in second
+        ]
+    return table
+
+
+def scheduled_round(flat: List[int], player_ids: List[str]) -> List[Match]:
+    """Matchs d'un tour de la table de Berger ; l'exempt joue contre BYE sans marquer."""
+    matches: List[Match] = []
+    for position in range(0, len(flat), 2):
+        white, black = flat[position], flat[position + 1]
+        if black == -1:
+            matches.append([[player_ids[white], 0.0], [BYE, 0.0]])
+        elif white == -1:
+            matches.append([[player_ids[black], 0.0], [BYE, 0.0]])
+        else:
+            matches.append([[player_ids[white], 0.0], [player_ids[black], 0.0]])
     return matches
+
+
+PAIRING_SYSTEMS = {"swiss": next_round, "matching": optimal_round}
+# Systèmes à calendrier précalculé : la valeur indique le double toutes-rondes
+ROUND_ROBIN_SYSTEMS = {"round_robin": False, "double_round_robin": True}
+
+
+def generate_round(
+    pairing_system: str,
+    player_ids: List[str],
+    previous_rounds: list,
+    seed: int,
+    stream: str = "",
+    derived: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Match], float]:
+    """Appariements du prochain tour et durée de calcul (fonction de module : exécutable en processus)."""
+    started = time.perf_counter()
+    # Le matchmaking dépend des résultats précédents (next_round trie selon les scores)
+    if len(previous_rounds) == 0:
+        matches = first_round(player_ids, make_rng(seed, 0, stream))
+    else:
+        matches = PAIRING_SYSTEMS[pairing_system](player_ids, previous_rounds, derived)
+    return matches, time.perf_counter() - started
+
+
+def inputs_hash(seed: int, player_ids: List[str], round_list: list) -> str:
+    """Empreinte courte des entrées d'un appariement (graine, inscrits, résultats précédents)."""
+    payload = json.dumps(
+        [seed, player_ids, [round_obj.matches for round_obj in round_list]],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def pairing_audit(
+    seed: int,
+    player_ids: List[str],
+    round_list: list,
+    matches: List[Match],
+    elapsed: float,
+    scores_by_player: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """Construit la trace d'audit compacte d'un tour généré."""
+    if scores_by_player is None:
+        scores_by_player = compute_scores(round_list)
+    groups: Dict[float, int] = {}
+    for pid in player_ids:
+        score = scores_by_player.get(pid, 0.0)
+        groups[score] = groups.get(score, 0) + 1
+    # Un flotteur est un joueur apparié hors de son groupe de points
+    floaters: List[str] = []
+    for (player_a, _), (player_b, _) in matches:
+        if player_b != BYE and scores_by_player.get(player_a, 0.0) != scores_by_player.get(player_b, 0.0):
+            floaters.extend([player_a, player_b])
+    return {
+        "inputs_hash": inputs_hash(seed, player_ids, round_list),
+        "score_groups": [[score, count] for score, count in sorted(groups.items(), reverse=True)],
+        "floaters": floaters,
+        "elapsed_ms": round(elapsed * 1000, 3),
+    }
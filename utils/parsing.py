@@ -0,0 +1,54 @@
+from __future__ import annotations
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Optional
+
+# Motifs compilés une seule fois pour tout le programme
+NATIONAL_ID_PATTERN = re.compile(r"^[A-Z]{2}\d{5}$")
+ISO_DATE_PATTERN = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+FREE_TEXT_CACHE_SIZE = 4096
+
+
+def is_valid_national_id(player_id: str) -> bool:
+    """Vérifie le format d'un identifiant national (AB12345)."""
+    return NATIONAL_ID_PATTERN.match(player_id) is not None
+
+
+def parse_iso_date(raw: str) -> Optional[date]:
+    """Date au format YYYY-MM-DD, ou None si le texte est invalide (chemin rapide, sans strptime)."""
+    match = ISO_DATE_PATTERN.match(raw)
+    if not match:
+        return None
+    year, month, day = match.groups()
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _french_parser():
+    # dateparser est lourd à importer et à configurer : une seule instance, créée au premier besoin
+    from dateparser.date import DateDataParser
+
+    return DateDataParser(languages=["fr"])
+
+
+@lru_cache(maxsize=FREE_TEXT_CACHE_SIZE)
+def _parse_free_text(text: str, today: str) -> Optional[date]:
+    # `today` fait partie de la clé : « hier » ou « lundi prochain » changent chaque jour
+    parsed = _french_parser().get_date_data(text).date_obj
+    return parsed.date() if parsed else None
+
+
+def parse_date(raw: str) -> Optional[date]:
+    """Date ISO ou en français libre (« 3 mars 2025 », « demain »), None si non reconnue."""
+    parsed = parse_iso_date(raw.strip())
+    if parsed is not None:
+        return parsed
+    text = WHITESPACE_PATTERN.sub(" ", raw.strip().lower())
+    if not text:
+        return None
+    return _parse_free_text(text, date.today().isoformat())
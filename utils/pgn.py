@@ -0,0 +1,68 @@
+from __future__ import annotations
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Résultats PGN et scores correspondants ; « * » = partie en cours ou inconnue
+RESULTS = {"1-0": (1.0, 0.0), "0-1": (0.0, 1.0), "1/2-1/2": (0.5, 0.5)}
+UNKNOWN_RESULT = "*"
+_TAG = re.compile(r'^\[(\w+)\s+"((?:[^"\\]|\\.)*)"\]\s*$')
+
+
+def split_games(text: str) -> List[str]:
+    """Découpe un fichier PGN en parties (en-têtes puis coups), chacune terminée par une ligne vide."""
+    games: List[str] = []
+    current: List[str] = []
+    in_moves = False
+    for line in text.replace("\r\n", "\n").split("\n"):
+        stripped = line.strip()
+        if stripped.startswith("[") and in_moves:
+            # Une balise après des coups : début de la partie suivante
+            games.append("\n".join(current).strip() + "\n\n")
+            current, in_moves = [], False
+        if stripped and not stripped.startswith("["):
+            in_moves = True
+        if stripped or current:
+            current.append(line.rstrip())
+    if any(line.strip() for line in current):
+        games.append("\n".join(current).strip() + "\n\n")
+    return games
+
+
+def read_tags(game: str) -> Dict[str, str]:
+    """Balises d'en-tête d'une partie ({"White": ..., "Result": ...})."""
+    tags: Dict[str, str] = {}
+    for line in game.split("\n"):
+        match = _TAG.match(line.strip())
+        if match is None:
+            break
+        tags[match.group(1)] = match.group(2).replace('\\"', '"').replace("\\\\", "\\")
+    return tags
+
+
+def round_and_board(tags: Dict[str, str]) -> Tuple[Optional[int], Optional[int]]:
+    """Ronde et table d'après « Round » (« 3 » ou « 3.5 ») et « Board » ; None si absentes."""
+    round_text, _, board_text = tags.get("Round", "").partition(".")
+    board_text = tags.get("Board", board_text)
+    return (
+        int(round_text) if round_text.isdigit() else None,
+        int(board_text) if board_text.isdigit() else None,
+    )
+
+
+def format_tags(tags: List[Tuple[str, str]]) -> str:
+    return "".join(
+        '[{} "{}"]\n'.format(name, value.replace("\\", "\\\\").replace('"', '\\"')) for name, value in tags
+    )
+
+
+def result_token(score_a: float, score_b: float) -> str:
+    """Résultat PGN d'un score enregistré ; « * » tant qu'il n'est pas saisi."""
+    for token, scores in RESULTS.items():
+        if scores == (score_a, score_b):
+            return token
+    return UNKNOWN_RESULT
+
+
+def stub_game(tags: List[Tuple[str, str]]) -> str:
+    """Partie sans coups (seul le résultat, balise « Result », est connu), au format d'export standard."""
+    return format_tags(tags) + "\n" + dict(tags).get("Result", UNKNOWN_RESULT) + "\n\n"
@@ -0,0 +1,125 @@
+from __future__ import annotations
+import math
+import unicodedata
+from bisect import bisect_left, insort
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+PREFIX_SCAN_LIMIT = 1000  # entrées examinées au plus pour une recherche par préfixe
+FUZZY_MIN_SIMILARITY = 0.5  # part minimale des trigrammes de la requête retrouvés chez le joueur
+
+
+@lru_cache(maxsize=65536)
+def normalize(text: str) -> str:
+    """Lowercase text without accents or extra spaces ("Éloïse  Dupré" -> "eloise dupre")."""
+    if not text.isascii():
+        decomposed = unicodedata.normalize("NFKD", text)
+        text = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(text.lower().split())
+
+
+@lru_cache(maxsize=65536)
+def _word_trigrams(word: str) -> FrozenSet[str]:
+    padded = f"  {word} "
+    return frozenset(padded[index:index + 3] for index in range(len(padded) - 2))
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Trigrams of each word, padded with spaces so that word starts weigh more."""
+    return frozenset().union(*map(_word_trigrams, text.split()))
+
+
+class PlayerSearchIndex:
+    """Player search index: prefix lookup (sorted array), then trigrams (typos).
+
+    Indexed keys are the last name, the first name, "last first", "first last" and the player id,
+    all normalised. The index is kept up to date one player at a time, never rebuilt.
+    """
+
+    def __init__(self, players: Iterable = ()) -> None:
+        self._keys: List[Tuple[str, str]] = []  # (clé normalisée, identifiant), trié
+        self._postings: Dict[str, set] = {}  # trigramme -> identifiants
+        self._grams: Dict[str, FrozenSet[str]] = {}  # identifiant -> trigrammes du joueur
+        for player in players:
+            self._index(player)
+        self._keys.sort()
+
+    @staticmethod
+    def _keys_of(player) -> Tuple[str, str, List[str]]:
+        first, last = normalize(player.first_name), normalize(player.last_name)
+        keys = {first, last, f"{last} {first}".strip(), f"{first} {last}".strip(), player.player_id.lower()}
+        keys.discard("")
+        return first, last, sorted(keys)
+
+    def _index(self, player, keep_sorted: bool = False) -> None:
+        first, last, keys = self._keys_of(player)
+        if keep_sorted:
+            for key in keys:
+                insort(self._keys, (key, player.player_id))
+        else:
+            self._keys.extend((key, player.player_id) for key in keys)
+        grams = trigrams(f"{last} {first}")  # identifiants : recherche par préfixe seulement
+        self._grams[player.player_id] = grams
+        postings = self._postings
+        for gram in grams:
+            if gram in postings:
+                postings[gram].add(player.player_id)
+            else:
+                postings[gram] = {player.player_id}
+
+    def add(self, player) -> None:
+        self._index(player, keep_sorted=True)
+
+    def remove(self, player) -> None:
+        """Remove a player (call it with the old values before changing them)."""
+        for key in self._keys_of(player)[2]:
+            position = bisect_left(self._keys, (key, player.player_id))
+            if position < len(self._keys) and self._keys[position] == (key, player.player_id):
+                del self._keys[position]
+        for gram in self._grams.pop(player.player_id, ()):
+            self._postings[gram].discard(player.player_id)
+
+    def exact(self, text: str) -> List[str]:
+        """Ids with a key exactly equal to the normalised text."""
+        key = normalize(text)
+        position = bisect_left(self._keys, (key, ""))
+        found = []
+        while position < len(self._keys) and self._keys[position][0] == key:
+            found.append(self._keys[position][1])
+            position += 1
+        return found
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """Ranked ids: exact match, then prefix (shortest key first), then approximate match."""
+        text = normalize(query)
+        if not text or limit <= 0:
+            return []
+        best: Dict[str, Tuple] = {}
+        position = bisect_left(self._keys, (text, ""))
+        end = min(len(self._keys), position + PREFIX_SCAN_LIMIT)
+        while position < end and self._keys[position][0].startswith(text):
+            key, player_id = self._keys[position]
+            rank = (0 if key == text else 1, len(key), key)
+            if player_id not in best or rank < best[player_id]:
+                best[player_id] = rank
+            position += 1
+        if len(best) < limit:
+            self._fuzzy(text, best)
+        return [player_id for player_id, _ in sorted(best.items(), key=lambda item: item[1])[:limit]]
+
+    def _fuzzy(self, text: str, best: Dict[str, Tuple]) -> None:
+        query_grams = trigrams(text)
+        if not query_grams:
+            return
+        required = math.ceil(FUZZY_MIN_SIMILARITY * len(query_grams))
+        # Tout candidat partage au moins un des trigrammes les plus rares (filtrage par préfixe) :
+        # seules ces listes, les plus courtes, sont parcourues
+        rarest = sorted(query_grams, key=lambda gram: len(self._postings.get(gram, ())))
+        candidates = set().union(*(self._postings.get(gram, ()) for gram in rarest[:len(query_grams) - required + 1]))
+        for player_id in candidates:
+            if player_id in best:
+                continue
+            grams = self._grams[player_id]
+            shared = len(query_grams & grams)
+            if shared >= required:
+                best[player_id] = (2, -shared / len(query_grams), len(grams), player_id)
@@ -0,0 +1,205 @@
+from __future__ import annotations
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.pairing import (
+    BYE, PAIRING_SYSTEMS, ROUND_ROBIN_SYSTEMS, derived_views, first_round, make_rng, scheduled_round,
+)
+
+DEFAULT_RATING = 1500  # Elo supposé des joueurs non classés
+DRAW_RATE = 0.3  # probabilité de nulle entre deux joueurs de même force
+INLINE_LIMIT = 2_000  # en dessous, le coût de démarrage des processus n'est pas rentable
+PAIRING_MEMO_LIMIT = 100_000  # tours simulés gardés par lot (même suite de résultats = mêmes appariements)
+
+
+def result_probabilities(rating_a: int, rating_b: int) -> Tuple[float, float]:
+    """Probabilités (gain de A, nulle) selon l'écart Elo ; la nulle diminue avec l'écart."""
+    expected = 1.0 / (1.0 + 10 ** ((rating_b - rating_a) / 400))
+    draw = DRAW_RATE * (1.0 - abs(expected - 0.5) * 2)
+    return max(0.0, expected - draw / 2), draw
+
+
+def _pairing_state(views: Dict[str, Any]) -> Dict[str, Any]:
+    # Copie propre à une simulation : les appariements simulés la modifient
+    return {
+        "scores": dict(views["scores"]),
+        "colours": dict(views["colours"]),
+        "opponents": {pid: set(met) for pid, met in views["opponents"].items()},
+        "byes": set(views["byes"]),
+    }
+
+
+def _simulate_chunk(task: tuple) -> List[List[int]]:
+    """Joue `simulations` fins de tournoi et compte les places finales (index = joueur)."""
+    (
+        player_ids, half_points, ratings, pending, rounds_left, simulations, seed,
+        schedule, system, active_ids, views, first, pairing_seed, stream,
+    ) = task
+    rng = random.Random(seed)
+    count = len(half_points)
+    index_of = {pid: index for index, pid in enumerate(player_ids)}
+    counts = [[0] * count for _ in range(count)]
+    probabilities: Dict[Tuple[int, int], Tuple[float, float]] = {}
+    # Les appariements ne dépendent que des résultats tirés depuis l'état de départ : deux simulations
+    # à la même suite de résultats reçoivent les mêmes, sans rappeler le moteur
+    pairings: Dict[Tuple[int, ...], list] = {}
+
+    def play(a: int, b: int, scores: List[int]) -> Tuple[int, int]:
+        key = (a, b)
+        if key not in probabilities:
+            probabilities[key] = result_probabilities(ratings[a], ratings[b])
+        win, draw = probabilities[key]
+        roll = rng.random()
+        points = (2, 0) if roll < win else (1, 1) if roll < win + draw else (0, 2)
+        scores[a] += points[0]
+        scores[b] += points[1]
+        return points
+
+    for _ in range(simulations):
+        scores = half_points[:]
+        state = _pairing_state(views) if schedule is None else None
+        history: List[int] = []
+        for a, b in pending:
+            points_a, points_b = play(a, b, scores)
+            history.append(points_a)
+            if state is not None:
+                # Couleurs et adversaires du tour en cours sont déjà dans l'état de départ
+                state["scores"][player_ids[a]] += points_a / 2
+                state["scores"][player_ids[b]] += points_b / 2
+        if schedule is not None:
+            # Toutes-rondes : les appariements restants sont ceux de la table de Berger
+            for pairs in schedule:
+                for a, b in pairs:
+                    play(a, b, scores)
+        else:
+            for round_number in range(rounds_left):
+                # Le moteur réel du tournoi apparie chaque tour simulé (comme generate_round)
+                key = tuple(history)
+                matches = pairings.get(key)
+                if matches is None:
+                    if first and round_number == 0:
+                        matches = first_round(active_ids, make_rng(pairing_seed, 0, stream))
+                    else:
+                        matches = PAIRING_SYSTEMS[system](active_ids, [], state)
+                    if len(pairings) < PAIRING_MEMO_LIMIT:
+                        pairings[key] = matches
+                for (player_a, score_a), (player_b, _) in matches:
+                    if player_b == BYE:
+                        scores[index_of[player_a]] += round(2 * score_a)
+                        state["scores"][player_a] = state["scores"].get(player_a, 0.0) + score_a
+                        state["byes"].add(player_a)
+                        continue
+                    points_a, points_b = play(index_of[player_a], index_of[player_b], scores)
+                    history.append(points_a)
+                    state["scores"][player_a] = state["scores"].get(player_a, 0.0) + points_a / 2
+                    state["scores"][player_b] = state["scores"].get(player_b, 0.0) + points_b / 2
+                    state["colours"][player_a] = state["colours"].get(player_a, "") + "W"
+                    state["colours"][player_b] = state["colours"].get(player_b, "") + "B"
+                    state["opponents"].setdefault(player_a, set()).add(player_b)
+                    state["opponents"].setdefault(player_b, set()).add(player_a)
+        # Place partagée : 1 + nombre de joueurs ayant strictement plus de points
+        rank_of: Dict[int, int] = {}
+        for position, score in enumerate(sorted(scores, reverse=True)):
+            rank_of.setdefault(score, position)
+        for index, score in enumerate(scores):
+            counts[index][rank_of[score]] += 1
+    return counts
+
+
+def forecast_standings(
+    tournament,
+    ratings: Dict[str, int],
+    simulations: int = 10_000,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    stream: str = "",
+) -> Dict[str, List[float]]:
+    """Distribution des places finales par joueur, par simulation Monte-Carlo des tours restants.
+
+    Les tours restants suivent les appariements que le tournoi produira : table de Berger
+    enregistrée pour les toutes-rondes (parties d'un joueur ayant abandonné perdues par forfait),
+    moteur du système (`next_round`, `optimal_round`) pour les autres, rejoué à chaque tour de
+    chaque simulation ; le coût d'une prévision suit donc celui d'un appariement. `stream` est
+    le flux aléatoire de la division (nom de section), pour un premier tour identique au réel.
+    Un tour en cours garde ses appariements ; ses matchs encore à 0-0 sont simulés.
+    Retourne `{player_id: [P(1re place), P(2e place), ...]}`.
+    """
+    player_ids = sorted(tournament.players)
+    count = len(player_ids)
+    index_of = {pid: index for index, pid in enumerate(player_ids)}
+    half_points = [0] * count
+    pending: List[Tuple[int, int]] = []
+    in_progress = bool(tournament.rounds) and tournament.rounds[-1].end_datetime is None
+    for round_obj in tournament.rounds:
+        forfeits = set(round_obj.forfeits)
+        for match_index, ((player_a, score_a), (player_b, score_b)) in enumerate(round_obj.matches):
+            if (
+                round_obj is tournament.rounds[-1] and in_progress and float(score_a) + float(score_b) == 0
+                and match_index not in forfeits and player_a in index_of and player_b in index_of
+            ):
+                pending.append((index_of[player_a], index_of[player_b]))
+                continue
+            # Un exempt ou un forfait compte comme un résultat ordinaire pour le joueur présent
+            for player_id, score in ((player_a, score_a), (player_b, score_b)):
+                if player_id in index_of:
+                    half_points[index_of[player_id]] += round(2 * float(score))
+    withdrawn = set(getattr(tournament, "withdrawn", ()))
+    rounds_left = max(0, tournament.num_rounds - tournament.current_round_index - int(in_progress))
+    player_ratings = [ratings.get(pid) or DEFAULT_RATING for pid in player_ids]
+
+    schedule: Optional[List[List[Tuple[int, int]]]] = None
+    views: Optional[Dict[str, Any]] = None
+    if tournament.pairing_system in ROUND_ROBIN_SYSTEMS:
+        schedule = []
+        start = tournament.current_round_index + int(in_progress)
+        for flat in tournament.schedule[start:start + rounds_left]:
+            pairs: List[Tuple[int, int]] = []
+            for (player_a, _), (player_b, _) in scheduled_round(flat, tournament.players):
+                if player_b == BYE:
+                    continue  # exempt du toutes-rondes : aucun point
+                if withdrawn & {player_a, player_b}:
+                    # Forfait certain (voir _start_scheduled_round) : le point est acquis d'avance
+                    for player_id in (player_a, player_b):
+                        if player_id not in withdrawn:
+                            half_points[index_of[player_id]] += 2
+                    continue
+                pairs.append((index_of[player_a], index_of[player_b]))
+            schedule.append(pairs)
+    else:
+        views = derived_views(tournament.rounds)
+    # Même ordre que TournamentController.start_next_round : le premier tour mélange cette liste
+    active_ids = [pid for pid in tournament.players if pid not in withdrawn]
+
+    workers = workers or os.cpu_count() or 1
+    if simulations < INLINE_LIMIT:
+        workers = 1
+    rng = random.Random(seed)
+    chunk_sizes = [simulations // workers + (1 if index < simulations % workers else 0) for index in range(workers)]
+    tasks = [
+        (
+            player_ids, half_points, player_ratings, pending, rounds_left, size, rng.getrandbits(64),
+            schedule, tournament.pairing_system, active_ids, views, not tournament.rounds, tournament.seed, stream,
+        )
+        for size in chunk_sizes
+        if size
+    ]
+    if not tasks:
+        results = []  # aucune simulation demandée : distributions nulles
+    elif len(tasks) == 1:
+        results = [_simulate_chunk(tasks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=len(tasks)) as pool:
+            results = list(pool.map(_simulate_chunk, tasks))
+
+    total = max(1, simulations)
+    distribution: Dict[str, List[float]] = {}
+    for index, pid in enumerate(player_ids):
+        distribution[pid] = [sum(chunk[index][rank] for chunk in results) / total for rank in range(len(player_ids))]
+    return distribution
+
+
+def top_probability(distribution: List[float], places: int) -> float:
+    """Probabilité de finir dans les `places` premiers (podium, qualification...)."""
+    return sum(distribution[:places])
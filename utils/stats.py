@@ -0,0 +1,216 @@
+from __future__ import annotations
+import math
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.pairing import BYE
+
+WHITE, BLACK = 1, -1
+MAX_PERFORMANCE_GAP = 800  # écart maximal à la moyenne des adversaires (100 % ou 0 %)
+LEADERBOARD_METRICS = ("performance", "points", "score_rate", "win_streak", "unbeaten_streak", "opponent_rating")
+
+
+@dataclass
+class PlayerStats:
+    """Statistiques d'un joueur sur les parties réellement jouées (ni exempts ni forfaits)."""
+
+    player_id: str
+    games: int = 0
+    points: float = 0.0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    white_games: int = 0
+    white_points: float = 0.0
+    black_games: int = 0
+    black_points: float = 0.0
+    opponent_rating: Optional[float] = None  # moyenne des adversaires classés
+    performance: Optional[int] = None
+    win_streak: int = 0  # plus longue série de victoires
+    unbeaten_streak: int = 0  # plus longue série sans défaite
+
+    @property
+    def score_rate(self) -> float:
+        return self.points / self.games if self.games else 0.0
+
+
+def performance_rating(opponent_average: float, score_rate: float) -> int:
+    """Performance : moyenne des adversaires plus l'écart Elo qui correspond au pourcentage marqué."""
+    if score_rate >= 1.0:
+        gap = MAX_PERFORMANCE_GAP
+    elif score_rate <= 0.0:
+        gap = -MAX_PERFORMANCE_GAP
+    else:
+        gap = max(-MAX_PERFORMANCE_GAP, min(MAX_PERFORMANCE_GAP, -400 * math.log10(1 / score_rate - 1)))
+    return round(opponent_average + gap)
+
+
+class _Block:
+    """Colonnes des parties d'un tournoi : deux lignes par partie, une pour chaque joueur."""
+
+    __slots__ = ("version", "start", "player", "opponent", "colour", "half_points", "day")
+
+    def __init__(self, version: int, start: str) -> None:
+        self.version = version
+        self.start = start
+        self.player = array("I")
+        self.opponent = array("I")
+        self.colour = array("b")
+        self.half_points = array("B")  # 0, 1 ou 2 demi-points
+        self.day = array("I")  # jour (ordinal) de la ronde
+
+
+class ResultsTable:
+    """Table en colonnes de toutes les parties jouées, un bloc par tournoi.
+
+    Les joueurs sont des indices dans `players`. Un bloc n'est reconstruit que lorsque la
+    version de son tournoi change ; les statistiques de tous les tournois sont calculées en un
+    parcours des colonnes, dans l'ordre chronologique, puis gardées jusqu'à la modification suivante.
+    """
+
+    def __init__(self) -> None:
+        self.players: List[str] = []
+        self._indices: Dict[str, int] = {}
+        self._blocks: Dict[str, _Block] = {}
+        self._all: Optional[Tuple[List[int], Dict[str, PlayerStats]]] = None
+
+    def _index(self, player_id: str) -> int:
+        index = self._indices.get(player_id)
+        if index is None:
+            index = self._indices[player_id] = len(self.players)
+            self.players.append(player_id)
+        return index
+
+    def version(self, key: str) -> Optional[int]:
+        block = self._blocks.get(key)
+        return block.version if block is not None else None
+
+    def set_tournament(self, key: str, version: int, start_date: str, rounds: Iterable[Tuple[str, object]]) -> None:
+        """(Re)construit le bloc d'un tournoi à partir de ses tours, donnés dans l'ordre de jeu."""
+        block = _Block(version, start_date)
+        for start_datetime, round_obj in rounds:
+            day = _day(start_datetime or start_date)
+            forfeits = set(round_obj.forfeits)
+            for index, ((player_a, score_a), (player_b, score_b)) in enumerate(round_obj.matches):
+                score_a, score_b = float(score_a), float(score_b)
+                if player_b == BYE or index in forfeits or score_a + score_b == 0:
+                    continue
+                index_a, index_b = self._index(player_a), self._index(player_b)
+                for player, opponent, colour, score in (
+                    (index_a, index_b, WHITE, score_a), (index_b, index_a, BLACK, score_b)
+                ):
+                    block.player.append(player)
+                    block.opponent.append(opponent)
+                    block.colour.append(colour)
+                    block.half_points.append(int(score * 2))
+                    block.day.append(day)
+        self._blocks[key] = block
+        self._all = None
+
+    def drop(self, key: str) -> None:
+        if self._blocks.pop(key, None) is not None:
+            self._all = None
+
+    def rows(self) -> int:
+        return sum(len(block.player) for block in self._blocks.values())
+
+    def stats(
+        self, ratings: Dict[str, int], key: Optional[str] = None, since: Optional[str] = None
+    ) -> Dict[str, PlayerStats]:
+        """Statistiques par joueur : tous les tournois, le seul tournoi `key`, ou les parties depuis `since`."""
+        rating_of = [ratings.get(player_id, 0) for player_id in self.players]
+        if key is not None:
+            block = self._blocks.get(key)
+            return self._aggregate([block] if block else [], rating_of, 0)
+        if since is not None:
+            blocks = sorted(self._blocks.values(), key=lambda block: block.start)
+            return self._aggregate(blocks, rating_of, _day(since))
+        # Vue complète gardée tant qu'aucun bloc ni aucun classement ne change
+        if self._all is None or self._all[0] != rating_of:
+            blocks = sorted(self._blocks.values(), key=lambda block: block.start)
+            self._all = (rating_of, self._aggregate(blocks, rating_of, 0))
+        return self._all[1]
+
+    def _aggregate(self, blocks: List[_Block], rating_of: List[int], first_day: int) -> Dict[str, PlayerStats]:
+        size = len(self.players)
+        games, half_points = [0] * size, [0] * size
+        wins, draws = [0] * size, [0] * size
+        white_games, white_half = [0] * size, [0] * size
+        rated_games, opponent_total, rated_half = [0] * size, [0] * size, [0] * size
+        win_run, unbeaten_run = [0] * size, [0] * size
+        best_win, best_unbeaten = [0] * size, [0] * size
+        for block in blocks:
+            # Lignes dans l'ordre des rondes : les séries se lisent directement
+            for player, opponent, colour, half, day in zip(
+                block.player, block.opponent, block.colour, block.half_points, block.day
+            ):
+                if day < first_day:
+                    continue
+                games[player] += 1
+                half_points[player] += half
+                if colour == WHITE:
+                    white_games[player] += 1
+                    white_half[player] += half
+                opponent_rating = rating_of[opponent]
+                if opponent_rating:
+                    rated_games[player] += 1
+                    opponent_total[player] += opponent_rating
+                    rated_half[player] += half
+                if half == 2:
+                    wins[player] += 1
+                    win_run[player] += 1
+                    unbeaten_run[player] += 1
+                    if win_run[player] > best_win[player]:
+                        best_win[player] = win_run[player]
+                elif half == 1:
+                    draws[player] += 1
+                    win_run[player] = 0
+                    unbeaten_run[player] += 1
+                else:
+                    win_run[player] = unbeaten_run[player] = 0
+                if unbeaten_run[player] > best_unbeaten[player]:
+                    best_unbeaten[player] = unbeaten_run[player]
+        result: Dict[str, PlayerStats] = {}
+        for index, player_id in enumerate(self.players):
+            if not games[index]:
+                continue
+            average = opponent_total[index] / rated_games[index] if rated_games[index] else None
+            result[player_id] = PlayerStats(
+                player_id=player_id,
+                games=games[index],
+                points=half_points[index] / 2,
+                wins=wins[index],
+                draws=draws[index],
+                losses=games[index] - wins[index] - draws[index],
+                white_games=white_games[index],
+                white_points=white_half[index] / 2,
+                black_games=games[index] - white_games[index],
+                black_points=(half_points[index] - white_half[index]) / 2,
+                opponent_rating=average,
+                performance=(
+                    performance_rating(average, rated_half[index] / 2 / rated_games[index])
+                    if average is not None else None
+                ),
+                win_streak=best_win[index],
+                unbeaten_streak=best_unbeaten[index],
+            )
+        return result
+
+
+def leaderboard(
+    stats: Dict[str, PlayerStats], metric: str = "performance", min_games: int = 9, limit: int = 20
+) -> List[PlayerStats]:
+    """Meilleurs joueurs pour une statistique (voir LEADERBOARD_METRICS), à partir de `min_games` parties."""
+    if metric not in LEADERBOARD_METRICS:
+        raise ValueError(f"Statistique inconnue : {metric}.")
+    eligible = [row for row in stats.values() if row.games >= min_games and getattr(row, metric) is not None]
+    return sorted(eligible, key=lambda row: (-getattr(row, metric), -row.games, row.player_id))[:limit]
+
+
+def _day(iso_datetime: str) -> int:
+    try:
+        return date.fromisoformat(iso_datetime[:10]).toordinal()
+    except ValueError:
+        return 0
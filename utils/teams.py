@@ -0,0 +1,126 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.pairing import BYE
+
+# Résultat d'un échiquier, un caractère, du point de vue de l'équipe nommée en premier
+BOARD_RESULTS = {
+    "1": (1.0, 0.0),
+    "0": (0.0, 1.0),
+    "N": (0.5, 0.5),  # nulle
+    "+": (1.0, 0.0),  # gagné par forfait
+    "-": (0.0, 1.0),  # perdu par forfait
+    "*": (0.0, 0.0),  # double forfait
+}
+UNPLAYED = "."
+MATCH_POINTS_PER_WIN = 2  # points de match : 2 la victoire, 1 le nul, 0 la défaite
+
+
+def board_points(results: str) -> Tuple[float, float]:
+    """Points de partie des deux équipes pour une chaîne de résultats d'échiquiers."""
+    points_a = points_b = 0.0
+    for code in results:
+        score_a, score_b = BOARD_RESULTS.get(code, (0.0, 0.0))
+        points_a += score_a
+        points_b += score_b
+    return points_a, points_b
+
+
+def match_result(results: str) -> Optional[Tuple[float, float]]:
+    """Résultat du match (1, ½ ou 0 par équipe) une fois tous les échiquiers joués, sinon None."""
+    if not results or UNPLAYED in results:
+        return None
+    points_a, points_b = board_points(results)
+    if points_a == points_b:
+        return 0.5, 0.5
+    return (1.0, 0.0) if points_a > points_b else (0.0, 1.0)
+
+
+def first_team_has_white(board_index: int) -> bool:
+    # L'équipe nommée en premier a les Blancs aux échiquiers impairs (1, 3...)
+    return board_index % 2 == 0
+
+
+def default_lineup(roster: Sequence[str], boards: int) -> List[str]:
+    """Composition par défaut : les premiers joueurs de l'ordre des échiquiers."""
+    return list(roster[:boards])
+
+
+def validate_lineup(roster: Sequence[str], lineup: Sequence[str], boards: int) -> None:
+    """Lève ValueError si la composition ne respecte pas l'ordre des échiquiers déclaré."""
+    if len(lineup) != boards:
+        raise ValueError(f"La composition doit compter {boards} joueurs.")
+    positions = {player_id: position for position, player_id in enumerate(roster)}
+    unknown = [player_id for player_id in lineup if player_id not in positions]
+    if unknown:
+        raise ValueError(f"Joueur absent de l'équipe : {', '.join(unknown)}.")
+    if len(set(lineup)) != len(lineup):
+        raise ValueError("Un joueur ne peut occuper qu'un échiquier.")
+    order = [positions[player_id] for player_id in lineup]
+    for board, (previous, current) in enumerate(zip(order, order[1:]), start=2):
+        if current < previous:
+            raise ValueError(f"Ordre des échiquiers non respecté à l'échiquier {board} ({lineup[board - 1]}).")
+
+
+def _contributions(round_obj, match_index: int, boards: int) -> Tuple[Tuple[str, float, float], ...]:
+    """(équipe, points de match, points de partie) apportés par un match."""
+    (team_a, score_a), (team_b, score_b) = round_obj.matches[match_index]
+    match_a = float(score_a) * MATCH_POINTS_PER_WIN
+    match_b = float(score_b) * MATCH_POINTS_PER_WIN
+    if team_b == BYE:
+        # L'exempt vaut une victoire par la moitié des échiquiers
+        return ((team_a, match_a, float(score_a) * boards / 2),)
+    results = round_obj.boards[match_index] if match_index < len(round_obj.boards) else ""
+    if match_index in round_obj.forfeits and UNPLAYED in results:
+        # Match perdu par forfait (abandon d'une équipe) : tous les échiquiers au vainqueur
+        return (team_a, match_a, float(score_a) * boards), (team_b, match_b, float(score_b) * boards)
+    points_a, points_b = board_points(results)
+    return (team_a, match_a, points_a), (team_b, match_b, points_b)
+
+
+class TeamStandings:
+    """Match and game points per team, kept current one board result at a time.
+
+    `rebuild` walks every match once; `update_match` only takes back the previous
+    contribution of the changed match and adds its new one, so entering a board result
+    costs O(boards) whatever the length of the season.
+    """
+
+    def __init__(self, tournament) -> None:
+        self.boards = tournament.boards
+        self.match_points: Dict[str, float] = {}
+        self.game_points: Dict[str, float] = {}
+        self._matches: Dict[Tuple[int, int], Tuple[Tuple[str, float, float], ...]] = {}
+        self.version = 0  # version du tournoi pour laquelle les totaux sont à jour
+        self.rebuild(tournament)
+
+    def _add(self, contributions: Tuple[Tuple[str, float, float], ...], sign: int) -> None:
+        for team, match_points, game_points in contributions:
+            self.match_points[team] = self.match_points.get(team, 0.0) + sign * match_points
+            self.game_points[team] = self.game_points.get(team, 0.0) + sign * game_points
+
+    def rebuild(self, tournament) -> None:
+        self.match_points = {team: 0.0 for team in tournament.players}
+        self.game_points = {team: 0.0 for team in tournament.players}
+        self._matches.clear()
+        for round_index, round_obj in enumerate(tournament.rounds):
+            for match_index in range(len(round_obj.matches)):
+                contributions = _contributions(round_obj, match_index, self.boards)
+                self._matches[(round_index, match_index)] = contributions
+                self._add(contributions, 1)
+        self.version = tournament.version
+
+    def update_match(self, tournament, round_index: int, match_index: int) -> None:
+        key = (round_index, match_index)
+        self._add(self._matches.get(key, ()), -1)
+        contributions = _contributions(tournament.rounds[round_index], match_index, self.boards)
+        self._matches[key] = contributions
+        self._add(contributions, 1)
+        self.version = tournament.version
+
+    def ranking(self) -> List[Tuple[str, float, float]]:
+        """(équipe, points de match, points de partie), du premier au dernier."""
+        return sorted(
+            ((team, self.match_points[team], self.game_points[team]) for team in self.match_points),
+            key=lambda row: (-row[1], -row[2], row[0]),
+        )
@@ -1,14 +1,13 @@
 from __future__ import annotations
-import re
-from datetime import datetime, date
+from datetime import date
+from utils.parsing import is_valid_national_id, parse_iso_date
 
 
 def ask_national_id() -> str:
     """Demande un identifiant national valide (AA12345)."""
-    pattern = r"^[A-Z]{2}\d{5}$"
     while True:
         player_id = input("Identifiant national (2 lettres + 5 chiffres) : ").strip().upper()
-        if re.match(pattern, player_id):
+        if is_valid_national_id(player_id):
             return player_id
         print("Format invalide. L'identifiant doit comporter 2 lettres suivies de 5 chiffres (ex: AB12345).")
 
@@ -17,9 +16,8 @@ def ask_birthdate() -> str:
     """Demande une date de naissance valide (YYYY-MM-DD) et vérifie la majorité (18 ans ou plus)."""
     while True:
         birthdate_str = input("Date de naissance (YYYY-MM-DD) : ").strip()
-        try:
-            birthdate = datetime.strptime(birthdate_str, "%Y-%m-%d").date()
-        except Exception:
+        birthdate = parse_iso_date(birthdate_str)
+        if birthdate is None:
             print("Format invalide. Exemple attendu : 2000-05-21.")
             continue
         today = date.today()
@@ -41,13 +39,28 @@ def ask_tournament_dates() -> tuple[str, str]:
         if end_str == "":
             end_str = start_str
             print(f"Date de fin par défaut : {end_str}")
-        try:
-            start = datetime.strptime(start_str, "%Y-%m-%d").date()
-            end = datetime.strptime(end_str, "%Y-%m-%d").date()
-        except Exception:
+        start = parse_iso_date(start_str)
+        end = parse_iso_date(end_str)
+        if start is None or end is None:
             print("Format invalide. Exemple attendu : 2025-10-03.")
             continue
         if end < start:
             print("La date de fin doit être identique ou postérieure à la date de début.")
             continue
         return start_str, end_str
+
+
+def ask_time_control() -> str:
+    """Demande la cadence au format PGN (« 5400+30 », base et incrément en secondes) ; vide = inconnue."""
+    from utils.clocks import parse_time_control
+
+    while True:
+        text = input("Cadence en secondes, base+incrément (ex: 5400+30) [inconnue] : ").strip()
+        if not text:
+            return ""
+        try:
+            parse_time_control(text)
+        except ValueError as error:
+            print(error)
+            continue
+        return text
@@ -0,0 +1,58 @@
+from __future__ import annotations
+from typing import List
+
+from controllers.player_controller import PlayerController
+from controllers.tournament_controller import TournamentController
+from utils.dedup import DuplicateCandidate, find_duplicates, merge_plan
+
+
+class DedupView:
+    """Recherche des doublons de joueurs puis fusion après confirmation."""
+
+    def __init__(self, player_controller: PlayerController, tournament_controller: TournamentController) -> None:
+        self.player_controller = player_controller
+        self.tournament_controller = tournament_controller
+
+    def _describe(self, player_id: str) -> str:
+        player = self.player_controller.get(player_id)
+        return (
+            f"{player.last_name} {player.first_name} [{player.player_id}] "
+            f"né(e) le {player.birthdate}, Elo {player.rating}"
+        )
+
+    def _confirm(self, candidates: List[DuplicateCandidate], accept_all: bool) -> List[DuplicateCandidate]:
+        accepted = []
+        for number, candidate in enumerate(candidates, start=1):
+            print(f"\n{number}/{len(candidates)} — similarité {candidate.score:.2f} ({candidate.reason})")
+            print(f"  garder    : {self._describe(candidate.keep_id)}")
+            print(f"  fusionner : {self._describe(candidate.drop_id)}")
+            if accept_all:
+                accepted.append(candidate)
+                continue
+            answer = input("Fusionner ? [o]ui, [n]on, [i]nverser, [t]out accepter, [q]uitter : ").strip().lower()
+            if answer == "q":
+                break
+            if answer == "i":
+                candidate = DuplicateCandidate(candidate.drop_id, candidate.keep_id, candidate.score, candidate.reason)
+            if answer == "t":
+                accept_all = True
+            if answer in ("o", "i", "t"):
+                accepted.append(candidate)
+        return accepted
+
+    def run(self, accept_all: bool = False) -> int:
+        """Propose les fusions, applique celles acceptées ; renvoie le nombre de fiches fusionnées."""
+        candidates = find_duplicates(self.player_controller.players)
+        if not candidates:
+            print("Aucun doublon probable.")
+            return 0
+        print(f"{len(candidates)} doublon(s) probable(s).")
+        mapping = merge_plan(self._confirm(candidates, accept_all))
+        if not mapping:
+            print("Aucune fusion.")
+            return 0
+        # Les tournois d'abord : si l'écriture échoue, aucune fiche joueur n'a disparu
+        changed = self.tournament_controller.merge_players(mapping)
+        self.player_controller.remove_players(mapping)
+        print(f"{len(mapping)} fiche(s) fusionnée(s), {changed} tournoi(s) mis à jour.")
+        return len(mapping)
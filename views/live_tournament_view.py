@@ -1,14 +1,26 @@
 from __future__ import annotations
 from typing import Dict, List, Tuple
 from datetime import datetime
-import dateparser
 import random
 import string
 from controllers.tournament_controller import TournamentController
 from controllers.player_controller import PlayerController
-from utils.validators import ask_birthdate, ask_tournament_dates
+from utils.validators import ask_birthdate, ask_time_control, ask_tournament_dates
 from settings import ENABLE_AUTOCOMPLETE
 from models.tournament import Tournament
+from utils.simulation import top_probability
+from utils.pairing import BYE
+from utils.teams import UNPLAYED, first_team_has_white
+from utils.parsing import parse_date, parse_iso_date
+from views.pager import Pager, write_lines
+
+FULL_LIST_LIMIT = 30  # au-delà, les joueurs sont choisis par recherche
+SEARCH_RESULTS = 10
+# Saisie rapide : A/B = gain du joueur 1/2, N = nulle, préfixe F = par forfait (partie non jouée)
+RESULT_CODES = {
+    "A": (1.0, 0.0), "B": (0.0, 1.0), "N": (0.5, 0.5),
+    "FA": (1.0, 0.0), "FB": (0.0, 1.0), "FF": (0.0, 0.0),
+}
 
 
 def read_int(prompt: str, default: int | None = None) -> int:
@@ -29,23 +41,21 @@ def read_date_text(prompt: str, allow_empty: bool = True) -> str:
     if not raw:
         print("Date vide non autorisée.")
         return read_date_text(prompt, allow_empty)
-    dt = dateparser.parse(raw, languages=["fr"])
-    if not dt:
+    parsed = parse_date(raw)
+    if not parsed:
         print("Date invalide.")
         return read_date_text(prompt, allow_empty)
-    return dt.strftime("%Y-%m-%d")
+    return parsed.isoformat()
 
 
 def read_birthdate(prompt: str) -> str:
     raw = input(prompt).strip()
     if not raw:
         return ""
-    try:
-        datetime.strptime(raw, "%Y-%m-%d")
+    if parse_iso_date(raw):
         return raw
-    except ValueError:
-        print("Format invalide. Attendu: YYYY-MM-DD.")
-        return read_birthdate(prompt)
+    print("Format invalide. Attendu: YYYY-MM-DD.")
+    return read_birthdate(prompt)
 
 
 def _auto_or_input(prompt: str, default: str = "") -> str:
@@ -77,26 +87,44 @@ class LiveTournamentView:
             print("(Aucun joueur.)")
             return
         self._player_num_map = {}
+        if len(self.player_index) > FULL_LIST_LIMIT:
+            # Liste complète illisible : on passe par la recherche
+            print(f"({len(self.player_index)} joueurs : saisir un nom, un prénom ou un identifiant pour chercher.)")
+            return
         for idx, (pid, p) in enumerate(self.player_index.items(), 1):
             first = getattr(p, "first_name", "")
             last = getattr(p, "last_name", "")
             print(f"{idx}. {pid}: {(first + ' ' + last).strip()}")
             self._player_num_map[str(idx)] = pid
 
+    def _search_player(self, query: str) -> str | None:
+        matches = self.player_controller.search(query, limit=SEARCH_RESULTS)
+        if not matches:
+            print("Aucun joueur trouvé.")
+            return None
+        for idx, p in enumerate(matches, 1):
+            print(f"{idx}. {p.player_id}: {p.full_name} ({p.birthdate})")
+        choice = input("Numéro du joueur (Entrée pour annuler) : ").strip()
+        if choice.isdigit() and 1 <= int(choice) <= len(matches):
+            return matches[int(choice) - 1].player_id
+        return None
+
     def _select_existing_player(self) -> str | None:
         if not self.player_index:
             print("(Aucun joueur existant.)")
             return None
         # Affiche la liste numérotée si elle n'est pas déjà affichée
-        if not hasattr(self, "_player_num_map") or not self._player_num_map:
+        if not hasattr(self, "_player_num_map"):
             self._list_players()
-        choice = input("Numéro du joueur (existant) : ").strip()
+        choice = input("Numéro, identifiant ou nom du joueur : ").strip()
         if choice in getattr(self, "_player_num_map", {}):
             return self._player_num_map[choice]
-        # Fallback: accepte aussi l'ID complet
+        # Fallback: accepte aussi l'ID complet, sinon recherche par nom
         pid = choice.upper()
         if pid in self.player_index:
             return pid
+        if choice:
+            return self._search_player(choice)
         print("Numéro ou ID introuvable.")
         return None
 
@@ -126,14 +154,10 @@ class LiveTournamentView:
             last_name = input("Nom: ").strip().capitalize()
             birthdate = ask_birthdate()
         # Vérification des doublons par nom/date
-        for p in self.player_index.values():
-            if (
-                p.first_name.lower() == first_name.lower()
-                and p.last_name.lower() == last_name.lower()
-                and p.birthdate == birthdate
-            ):
-                print(f"Joueur déjà existant sélectionné : {p.full_name} [{p.player_id}]")
-                return p.player_id
+        p = self.player_controller.find_duplicate(first_name, last_name, birthdate)
+        if p:
+            print(f"Joueur déjà existant sélectionné : {p.full_name} [{p.player_id}]")
+            return p.player_id
         # Création du nouveau joueur
         try:
             created = self.player_controller.create_player(player_id, first_name, last_name, birthdate)
@@ -227,11 +251,43 @@ class LiveTournamentView:
         full = f"{first} {last}".strip()
         return full or player_id
 
+    @staticmethod
+    def _locator(rows: List):
+        """Recherche pour le pager : numéro de ligne (1 = première) ou identifiant d'un joueur de la ligne."""
+        positions = {}
+
+        def locate(text: str):
+            if text.isdigit():
+                return int(text) - 1
+            if not positions:
+                for index, row in enumerate(rows):
+                    positions.update((pid, index) for pid in ((row,) if isinstance(row, str) else row))
+            return positions.get(text.upper())
+
+        return locate
+
     def _print_pairings(self, pairings: List[Tuple[list, list]]) -> None:
-        for i, (a, b) in enumerate(pairings, start=1):
-            a_id, _ = a
-            b_id, _ = b
-            print(f"Table {i}: {self._name_of(a_id)} (Blancs) vs {self._name_of(b_id)} (Noirs)")
+        def render(start: int, stop: int) -> List[str]:
+            lines = []
+            for i in range(start, stop):
+                (a_id, _), (b_id, _) = pairings[i]
+                if b_id == BYE:
+                    lines.append(f"Exempt : {self._name_of(a_id)}")
+                else:
+                    lines.append(f"Table {i + 1}: {self._name_of(a_id)} (Blancs) vs {self._name_of(b_id)} (Noirs)")
+            return lines
+
+        Pager(len(pairings), render, self._locator([(a[0], b[0]) for a, b in pairings])).show()
+
+    def _print_player_list(self, player_ids: List[str]) -> None:
+        Pager(
+            len(player_ids),
+            lambda start, stop: [
+                f"{idx}. {self._name_of(pid)} [{pid}]"
+                for idx, pid in enumerate(player_ids[start:stop], start + 1)
+            ],
+            self._locator(player_ids),
+        ).show()
 
     def _ask_result_for_match(self, table_index: int, white_id: str, black_id: str) -> str:
         valid = {"1-0", "0-1", "0.5-0.5"}
@@ -244,13 +300,49 @@ class LiveTournamentView:
                 return r
             print("Format invalide.")
 
-    def _print_scores(self, score_map: Dict[str, float]) -> None:
-        if not score_map:
+    def _print_scores(self, rows: List[Tuple[str, float, float, float]], withdrawn: List[str] = ()) -> None:
+        if not rows:
             print("(Pas de scores)")
             return
-        sorted_items = sorted(score_map.items(), key=lambda kv: (-kv[1], self._name_of(kv[0])))
-        for rank, (pid, pts) in enumerate(sorted_items, start=1):
-            print(f"{rank}. {self._name_of(pid)} — {pts} pts")
+        withdrawn = set(withdrawn)
+        Pager(
+            len(rows),
+            lambda start, stop: [
+                f"{rank}. {self._name_of(pid)} — {pts} pts (Buchholz {buchholz:g}, S-B {sonneborn:g})"
+                + (" (abandon)" if pid in withdrawn else "")
+                for rank, (pid, pts, buchholz, sonneborn) in enumerate(rows[start:stop], start=start + 1)
+            ],
+            self._locator([row[0] for row in rows]),
+        ).show()
+
+    def _print_forecast(self, tournament) -> None:
+        section = input("Section: ").strip() if tournament.sections else None
+        # Le couplage optimal est rejoué à chaque tour simulé : moins de simulations par défaut
+        default = 1_000 if tournament.pairing_system == "matching" else 10_000
+        simulations = read_int(f"Nombre de simulations [{default}]: ", default=default)
+        try:
+            distribution = self.controller.forecast(tournament, simulations=simulations, section=section)
+        except ValueError as error:
+            print(f"Erreur: {error}")
+            return
+        if not distribution:
+            print("(Aucun joueur inscrit)")
+            return
+        expected_rank = {
+            pid: sum(rank * proba for rank, proba in enumerate(probas, start=1))
+            for pid, probas in distribution.items()
+        }
+        print("\nPrévisions (1re place / podium) :")
+        ranked = sorted(distribution, key=lambda p: expected_rank[p])
+        Pager(
+            len(ranked),
+            lambda start, stop: [
+                f"- {self._name_of(pid)} — {distribution[pid][0]:.1%} / {top_probability(distribution[pid], 3):.1%} "
+                f"(place moyenne {expected_rank[pid]:.1f})"
+                for pid in ranked[start:stop]
+            ],
+            self._locator(ranked),
+        ).show()
 
     # ----- Entrée -----
 
@@ -298,6 +390,8 @@ class LiveTournamentView:
             start_date, end_date = ask_tournament_dates()
             num_rounds = read_int("Nombre de rondes [3]: ", default=3)
             description = input("Description (optionnelle): ").strip() or ""
+        boards = 0 if ENABLE_AUTOCOMPLETE else read_int("Échiquiers par match, épreuve par équipes (0 = non) [0]: ", 0)
+        time_control = "" if ENABLE_AUTOCOMPLETE else ask_time_control()
         tournament = self.controller.create_tournament(
             name=name,
             location=location,
@@ -305,6 +399,8 @@ class LiveTournamentView:
             end_date=end_date,
             num_rounds=num_rounds,
             description=description,
+            boards=boards,
+            time_control=time_control,
         )
         print(f"Tournoi créé: {tournament.name}")
         return tournament
@@ -343,6 +439,17 @@ class LiveTournamentView:
             else:
                 print("Choix invalide.")
 
+    def _add_team_to_tournament(self, tournament):
+        name = input("Nom de l'équipe: ").strip()
+        if not name:
+            return
+        raw_ids = input(f"Identifiants des joueurs dans l'ordre des échiquiers (au moins {tournament.boards}) : ")
+        try:
+            self.controller.register_team(tournament, name, raw_ids.upper().split())
+            print(f"Équipe {name} inscrite.")
+        except ValueError as error:
+            print(f"Erreur: {error}")
+
     def _remove_player_from_tournament(self, tournament):
         if not tournament.players:
             print("Aucun joueur à retirer.")
@@ -360,8 +467,7 @@ class LiveTournamentView:
                 idx = int(choice)
                 if 1 <= idx <= len(tournament.players):
                     pid = tournament.players[idx - 1]
-                    tournament.players.remove(pid)
-                    self.controller._save()
+                    self.controller.remove_player(tournament, pid)
                     print(f"Joueur {pid} retiré.")
                     return
                 else:
@@ -383,55 +489,96 @@ class LiveTournamentView:
             try:
                 r_idx = int(r_idx) - 1
                 if 0 <= r_idx < len(tournament.rounds):
-                    round_obj = tournament.rounds[r_idx]
                     break
                 else:
                     print("Numéro de tour invalide.")
             except ValueError:
                 print("Veuillez entrer un numéro valide.")
 
+        if tournament.boards:
+            self._enter_board_results(tournament, r_idx)
+            return
         # Numérotation et saisie rapide des résultats
         print("Saisissez le résultat pour chaque match :")
         print("A = joueur 1 gagne, B = joueur 2 gagne, N = nul")
+        print("FA / FB = gain par forfait de A / B, FF = double forfait")
+        for section_name, division in tournament.divisions():
+            if section_name:
+                print(f"\n— Section {section_name} —")
+            self._enter_round_results(tournament, r_idx, division.rounds[r_idx], section_name or None)
+        print("Tous les résultats du tour ont été saisis.")
+
+    def _enter_round_results(self, tournament, r_idx: int, round_obj, section: str | None) -> None:
         for m_idx, match in enumerate(round_obj.matches, 1):
             a, b = match
+            if b[0] == BYE:
+                continue
             name_a = self._name_of(a[0])
             name_b = self._name_of(b[0])
             while True:
-                res = input(f"{m_idx}. {name_a} [A] vs {name_b} [B] (A/B/N) : ").strip().upper()
-                if res == "A":
-                    score_a, score_b = 1.0, 0.0
-                    break
-                elif res == "B":
-                    score_a, score_b = 0.0, 1.0
+                res = input(f"{m_idx}. {name_a} [A] vs {name_b} [B] (A/B/N/FA/FB/FF) : ").strip().upper()
+                if res in RESULT_CODES:
+                    score_a, score_b = RESULT_CODES[res]
                     break
-                elif res == "N":
-                    score_a, score_b = 0.5, 0.5
-                    break
-                else:
-                    print("Réponse invalide. Tapez A, B ou N.")
+                print("Réponse invalide. Tapez A, B, N, FA, FB ou FF.")
             try:
                 self.controller.enter_result(
-                    tournament, r_idx, m_idx - 1, score_a, score_b
+                    tournament, r_idx, m_idx - 1, score_a, score_b, section=section, forfeit=res.startswith("F")
                 )
             except Exception as e:
                 print(f"Erreur: {e}")
-        print("Tous les résultats du tour ont été saisis.")
+
+    def _enter_board_results(self, tournament, r_idx: int) -> None:
+        round_obj = tournament.rounds[r_idx]
+        print("Un caractère par échiquier, du point de vue de la première équipe :")
+        print("1 gain, 0 perte, N nulle, + gain par forfait, - perte par forfait, * double forfait, . à venir")
+        for m_idx, ((team_a, _), (team_b, _)) in enumerate(round_obj.matches):
+            if team_b == BYE:
+                continue
+            current = round_obj.boards[m_idx]
+            lineup_a, lineup_b = round_obj.lineups[m_idx]
+            for board, (player_a, player_b) in enumerate(zip(lineup_a, lineup_b), 1):
+                colours = "Blancs" if first_team_has_white(board - 1) else "Noirs"
+                print(f"   Éch. {board} : {self._name_of(player_a)} ({colours}) — {self._name_of(player_b)}")
+            raw = input(f"{m_idx + 1}. {team_a} vs {team_b} [{current}] : ").strip().upper()
+            for board, (old, new) in enumerate(zip(current, raw)):
+                if new == old or new == UNPLAYED:
+                    continue
+                try:
+                    self.controller.enter_board_result(tournament, r_idx, m_idx, board, new)
+                except ValueError as error:
+                    print(f"Erreur échiquier {board + 1}: {error}")
+
+    def _print_team_standings(self, tournament) -> None:
+        rows = self.controller.team_standings(tournament)
+        withdrawn = set(tournament.withdrawn)
+        Pager(
+            len(rows),
+            lambda start, stop: [
+                f"{rank}. {team} — {match_points:g} pts de match, {game_points:g} pts de partie"
+                + (" (abandon)" if team in withdrawn else "")
+                for rank, (team, match_points, game_points) in enumerate(rows[start:stop], start=start + 1)
+            ],
+        ).show()
 
     def _autocomplete_player_id(self, tournament, prompt="ID du joueur à retirer: "):
         # Fonction inutile si on ne veut pas d'autocomplete partiel, donc on peut la supprimer
         pass
 
     def _show_tournament_details(self, tournament):
-        print(f"\nNom: {tournament.name}")
-        print(f"Lieu: {tournament.location}")
-        print(f"Dates: {tournament.start_date} → {tournament.end_date}")
-        print(f"Description: {tournament.description}")
-        print(f"Nombre de tours: {tournament.num_rounds}")
-        print(f"Joueurs inscrits ({len(tournament.players)}):")
-        for pid in tournament.players:
-            print(f"- {self._name_of(pid)} [{pid}]")
-        print(f"Tours joués: {len(tournament.rounds)}")
+        write_lines([
+            f"\nNom: {tournament.name}",
+            f"Lieu: {tournament.location}",
+            f"Dates: {tournament.start_date} → {tournament.end_date}",
+            f"Description: {tournament.description}",
+            f"Nombre de tours: {tournament.num_rounds}",
+            f"Tours joués: {len(tournament.rounds)}",
+            f"Joueurs inscrits ({len(tournament.players)}):",
+        ] + [
+            f"Section {section.name} (Elo ≥ {section.rating_floor}) : {len(section.players)} joueurs"
+            for section in tournament.sections
+        ])
+        self._print_player_list(tournament.players)
 
     def menu(self) -> None:
         try:
@@ -442,25 +589,29 @@ class LiveTournamentView:
 
             while True:
                 print(f"\n=== Gestion du tournoi: {tournament.name} ===")
-                print("1. Ajouter un joueur")
-                print("2. Retirer un joueur")
+                print("1. Ajouter une équipe" if tournament.boards else "1. Ajouter un joueur")
+                print("2. Retirer une équipe" if tournament.boards else "2. Retirer un joueur")
                 print("3. Lister les joueurs inscrits")
                 print("4. Démarrer le prochain tour")
                 print("5. Saisir/modifier un résultat de match")
                 print("6. Clôturer le tour en cours")
                 print("7. Afficher le classement")
                 print("8. Détails du tournoi")
+                print("9. Prévisions de classement")
+                print("10. Annuler la dernière action")
+                print("11. Rétablir l'action annulée")
                 print("0. Retour au menu principal")
-                choice = input("Votre choix (0-8) : ").strip()
+                choice = input("Votre choix (0-11) : ").strip()
 
-                if choice == "1":
+                if choice == "1" and tournament.boards:
+                    self._add_team_to_tournament(tournament)
+                elif choice == "1":
                     self._add_player_to_tournament(tournament)
                 elif choice == "2":
                     self._remove_player_from_tournament(tournament)
                 elif choice == "3":
                     print("Joueurs inscrits :")
-                    for idx, pid in enumerate(tournament.players, 1):
-                        print(f"{idx}. {self._name_of(pid)} [{pid}]")
+                    self._print_player_list(tournament.players)
                 elif choice == "4":
                     try:
                         round_obj = self.controller.start_next_round(tournament)
@@ -479,15 +630,25 @@ class LiveTournamentView:
                         print("Tour clôturé.")
                     except Exception as error:
                         print(f"Erreur: {error}")
+                elif choice == "7" and tournament.boards:
+                    print("\nClassement par équipes :")
+                    self._print_team_standings(tournament)
                 elif choice == "7":
                     try:
-                        scores = self.controller.tournament_scores(tournament)
-                        print("\nClassement :")
-                        self._print_scores(scores)
+                        for section_name, _ in tournament.divisions():
+                            rows = self.controller.standings(tournament, section_name or None)
+                            print(f"\nClassement section {section_name} :" if section_name else "\nClassement :")
+                            self._print_scores(rows, tournament.withdrawn)
                     except Exception as error:
                         print(f"Erreur: {error}")
                 elif choice == "8":
                     self._show_tournament_details(tournament)
+                elif choice == "9":
+                    self._print_forecast(tournament)
+                elif choice == "10":
+                    print("Action annulée." if self.controller.undo(tournament) else "Rien à annuler.")
+                elif choice == "11":
+                    print("Action rétablie." if self.controller.redo(tournament) else "Rien à rétablir.")
                 elif choice == "0":
                     break
                 else:
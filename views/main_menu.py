@@ -2,21 +2,20 @@ from __future__ import annotations
 from storage.json_store import JsonStore
 from controllers.player_controller import PlayerController
 from controllers.tournament_controller import TournamentController
-from views.player_view import PlayerView
-from views.tournament_view import TournamentView
-from views.live_tournament_view import LiveTournamentView
 
 
 class MainMenu:
     """Main menu for the Centre Échecs CLI application."""
 
-    def __init__(self) -> None:
-        self.store = JsonStore()
+    def __init__(self, store: JsonStore | None = None) -> None:
+        self.store = store or JsonStore()
         self.player_controller = PlayerController(self.store)
         self.player_index = {player.player_id: player for player in self.player_controller.players}
         self.tournament_controller = TournamentController(self.store, self.player_index)
 
     def run(self) -> None:
+        # Les saisies en direct n'attendent plus le disque : le journal est écrit en arrière-plan
+        self.tournament_controller.start_background_writer()
         try:
             while True:
                 print("\n=== Chess Manager ===")
@@ -25,13 +24,17 @@ class MainMenu:
                 print("3. Tournoi (en direct)")
                 print("0. Quitter")
                 user_choice = input("> ").strip()
+                # Les vues secondaires ne sont importées qu'à leur première ouverture
                 if user_choice == "1":
+                    from views.player_view import PlayerView
                     PlayerView(self.player_controller).menu()
                     self.player_index = {player.player_id: player for player in self.player_controller.players}
                     self.tournament_controller.player_index = self.player_index
                 elif user_choice == "2":
+                    from views.tournament_view import TournamentView
                     TournamentView(self.tournament_controller).menu()
                 elif user_choice == "3":
+                    from views.live_tournament_view import LiveTournamentView
                     LiveTournamentView(self.tournament_controller, self.player_controller, self.player_index).menu()
                 elif user_choice == "0":
                     break
@@ -39,3 +42,6 @@ class MainMenu:
                     print("Choix invalide.")
         except KeyboardInterrupt:
             print("\nAu revoir.")
+        finally:
+            # Vide la file d'écriture puis point de contrôle complet : rien à rejouer au prochain démarrage
+            self.tournament_controller.close()
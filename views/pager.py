@@ -0,0 +1,68 @@
+from __future__ import annotations
+import sys
+from typing import Callable, Iterable, List, Optional
+
+PAGE_SIZE = 25
+
+
+def write_lines(lines: Iterable[str]) -> None:
+    """Écrit un bloc de lignes en une seule écriture sur la sortie standard."""
+    text = "\n".join(lines)
+    if text:
+        sys.stdout.write(text + "\n")
+        sys.stdout.flush()
+
+
+class Pager:
+    """Affichage paginé d'une liste déjà triée : seule la page visible est mise en forme.
+
+    `render(start, stop)` produit les lignes des éléments [start, stop) ; `locate(texte)`
+    (facultatif) renvoie la position d'un élément cherché (rang, identifiant...) ou None.
+    Une liste qui tient sur une page est affichée d'un bloc, sans invite.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        render: Callable[[int, int], List[str]],
+        locate: Optional[Callable[[str], Optional[int]]] = None,
+        page_size: int = PAGE_SIZE,
+    ) -> None:
+        self.count = count
+        self.render = render
+        self.locate = locate
+        self.page_size = page_size
+
+    def show(self) -> None:
+        if self.count <= self.page_size:
+            write_lines(self.render(0, self.count))
+            return
+        pages = (self.count + self.page_size - 1) // self.page_size
+        page = 0
+        while True:
+            start = page * self.page_size
+            stop = min(start + self.page_size, self.count)
+            footer = f"— Page {page + 1}/{pages} ({start + 1}-{stop} sur {self.count}) —"
+            write_lines(self.render(start, stop) + [footer])
+            hint = "[Entrée] suivante, p précédente, numéro de page"
+            if self.locate:
+                hint += ", /recherche (rang ou identifiant)"
+            answer = input(f"{hint}, q quitter : ").strip()
+            if answer.lower() == "q":
+                return
+            if not answer:
+                if page + 1 >= pages:
+                    return
+                page += 1
+            elif answer.lower() == "p":
+                page = max(page - 1, 0)
+            elif answer.isdigit() and 1 <= int(answer) <= pages:
+                page = int(answer) - 1
+            elif answer.startswith("/") and self.locate:
+                position = self.locate(answer[1:].strip())
+                if position is None or not 0 <= position < self.count:
+                    print("Introuvable.")
+                else:
+                    page = position // self.page_size
+            else:
+                print("Choix invalide.")
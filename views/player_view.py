@@ -1,19 +1,28 @@
 from __future__ import annotations
-from datetime import datetime
 from controllers.player_controller import PlayerController
 from utils.validators import ask_national_id, ask_birthdate
+from utils.parsing import parse_iso_date
 
 
 def read_date_or_empty(prompt: str) -> str:
     raw_value = input(prompt).strip()
     if not raw_value:
         return ""
-    try:
-        datetime.strptime(raw_value, "%Y-%m-%d")
+    if parse_iso_date(raw_value):
         return raw_value
+    print("Format invalide. Attendu: YYYY-MM-DD. Valeur ignorée.")
+    return ""
+
+
+def read_rating(prompt: str, default: int) -> int:
+    raw_value = input(prompt).strip()
+    if not raw_value:
+        return default
+    try:
+        return max(0, int(raw_value))
     except ValueError:
-        print("Format invalide. Attendu: YYYY-MM-DD. Valeur ignorée.")
-        return ""
+        print("Valeur invalide. Classement inchangé.")
+        return default
 
 
 class PlayerView:
@@ -29,6 +38,7 @@ class PlayerView:
                 print("1. Lister (alphabétique)")
                 print("2. Créer un joueur")
                 print("3. Modifier un joueur")
+                print("4. Rechercher un joueur")
                 print("0. Retour")
                 user_choice = input("> ").strip()
                 if user_choice == "1":
@@ -45,9 +55,10 @@ class PlayerView:
                     first_name = input("Prénom: ").strip().capitalize()
                     last_name = input("Nom: ").strip().capitalize()
                     birthdate = ask_birthdate()
+                    rating = read_rating("Classement Elo [0]: ", 0)
                     try:
                         created = self.controller.create_player(
-                            player_id, first_name, last_name, birthdate
+                            player_id, first_name, last_name, birthdate, rating
                         )
                         print(f"Créé: {created.full_name} [{created.player_id}]")
                     except Exception as error:
@@ -62,13 +73,22 @@ class PlayerView:
                     first_name = input(f"Prénom [{player.first_name}]: ").strip().capitalize() or player.first_name
                     last_name = input(f"Nom [{player.last_name}]: ").strip().capitalize() or player.last_name
                     birthdate = input(f"Date de naissance [{player.birthdate}]: ").strip() or player.birthdate
+                    rating = read_rating(f"Classement Elo [{player.rating}]: ", player.rating)
                     self.controller.update_player(
                         player_id,
                         first_name=first_name,
                         last_name=last_name,
                         birthdate=birthdate,
+                        rating=rating,
                     )
                     print("Joueur mis à jour.")
+                elif user_choice == "4":
+                    query = input("Nom, prénom ou identifiant : ").strip()
+                    found = self.controller.search(query)
+                    if not found:
+                        print("Aucun joueur trouvé.")
+                    for player in found:
+                        print(f"- {player.full_name} [{player.player_id}] ({player.birthdate})")
                 elif user_choice == "0":
                     break
                 else:
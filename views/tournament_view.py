@@ -1,7 +1,20 @@
 from __future__ import annotations
 from controllers.tournament_controller import TournamentController
 from models.tournament import Tournament
-from utils.validators import ask_tournament_dates, ask_national_id
+from utils.validators import ask_tournament_dates, ask_national_id, ask_time_control
+from views.pager import Pager
+from utils.pairing import BYE
+from storage.archive import ArchivedTournament
+
+PAIRING_CHOICES = {1: "swiss", 2: "matching", 3: "round_robin", 4: "double_round_robin"}
+LEADERBOARD_CHOICES = [
+    ("performance", "Performance"),
+    ("points", "Points"),
+    ("score_rate", "Pourcentage de points"),
+    ("win_streak", "Série de victoires"),
+    ("unbeaten_streak", "Série sans défaite"),
+    ("opponent_rating", "Force moyenne des adversaires"),
+]
 
 
 def read_int(prompt: str, default: int | None = None) -> int:
@@ -15,6 +28,22 @@ def read_int(prompt: str, default: int | None = None) -> int:
         return read_int(prompt, default)
 
 
+def read_sections(prompt: str) -> list[tuple[str, int]]:
+    """Lit des sections au format « A:1800,B:1400,C:0 » (vide = aucune section)."""
+    raw_value = input(prompt).strip()
+    if not raw_value:
+        return []
+    sections = []
+    try:
+        for item in raw_value.split(","):
+            name, floor = item.split(":")
+            sections.append((name.strip(), int(floor)))
+    except ValueError:
+        print("Format invalide. Exemple attendu : A:1800,B:1400,C:0.")
+        return read_sections(prompt)
+    return sections
+
+
 def read_float(prompt: str) -> float:
     raw_value = input(prompt).strip()
     try:
@@ -30,8 +59,8 @@ class TournamentView:
     def __init__(self, controller: TournamentController) -> None:
         self.controller = controller
 
-    def _select_tournament(self) -> Tournament | None:
-        tournaments = self.controller.list_tournaments()
+    def _select_tournament(self, include_archived: bool = False) -> Tournament | None:
+        tournaments = self.controller.list_tournaments(include_archived)
         if not tournaments:
             print("Aucun tournoi.")
             return None
@@ -47,6 +76,55 @@ class TournamentView:
         print("Choix invalide.")
         return None
 
+    @staticmethod
+    def _page_players(players: list) -> None:
+        positions = {player.player_id: index for index, player in enumerate(players)}
+        Pager(
+            len(players),
+            lambda start, stop: [
+                f"- {player.last_name.upper()}, {player.first_name} [{player.player_id}]"
+                for player in players[start:stop]
+            ],
+            lambda text: int(text) - 1 if text.isdigit() else positions.get(text.upper()),
+        ).show()
+
+    @staticmethod
+    def _print_timing(report: dict) -> None:
+        def minutes(seconds: float) -> str:
+            return f"{seconds / 60:.0f} min"
+
+        rounds = report["rounds"]
+        if not rounds["count"]:
+            print("Aucun tour clôturé.")
+        else:
+            print(
+                f"\nDurée des tours ({rounds['count']}) : min {minutes(rounds['min'])}, "
+                f"Q1 {minutes(rounds['q1'])}, médiane {minutes(rounds['median'])}, Q3 {minutes(rounds['q3'])}, "
+                f"P90 {minutes(rounds['p90'])}, max {minutes(rounds['max'])}"
+            )
+        if not report["per_control"]:
+            print("Aucune partie chronométrée.")
+            return
+        print("\nDurée moyenne des parties par cadence :")
+        for label, games, mean in report["per_control"]:
+            print(f"  {label} : {minutes(mean)} ({games} parties)")
+        print("\nParties les plus longues :")
+        for seconds, name, round_number, table, player_a, player_b in report["slowest"]:
+            print(f"  {minutes(seconds)} — {name}, ronde {round_number}, table {table} : {player_a} - {player_b}")
+
+    @staticmethod
+    def _print_stats(title: str, stats) -> None:
+        if stats is None:
+            print(f"{title} : aucune partie jouée.")
+            return
+        print(
+            f"\n{title} : {stats.points:g}/{stats.games} (+{stats.wins} ={stats.draws} -{stats.losses}), "
+            f"Blancs {stats.white_points:g}/{stats.white_games}, Noirs {stats.black_points:g}/{stats.black_games}"
+        )
+        if stats.performance is not None:
+            print(f"  Performance {stats.performance}, adversaires {stats.opponent_rating:.0f} de moyenne")
+        print(f"  Plus longues séries : {stats.win_streak} victoire(s), {stats.unbeaten_streak} sans défaite")
+
     def reports(self) -> None:
         try:
             while True:
@@ -56,30 +134,35 @@ class TournamentView:
                 print("3. Nom et dates d’un tournoi")
                 print("4. Joueurs d’un tournoi (alphabétique)")
                 print("5. Tours et matchs d’un tournoi")
+                print("6. Durées des tours et des parties (tous tournois)")
+                print("7. Exporter les parties d’un tournoi (PGN)")
+                print("8. Statistiques d’un joueur")
+                print("9. Classements fédéraux (performance, séries...)")
                 print("0. Retour")
                 user_choice = input("> ").strip()
                 if user_choice == "1":
                     from controllers.player_controller import PlayerController
                     from storage.json_store import JsonStore
                     player_controller = PlayerController(JsonStore())
-                    for player in player_controller.list_players_alpha():
-                        print(
-                            f"- {player.last_name.upper()}, "
-                            f"{player.first_name} [{player.player_id}]"
-                        )
+                    self._page_players(player_controller.list_players_alpha())
                 elif user_choice == "2":
-                    for tournament in self.controller.list_tournaments():
-                        print(
+                    tournaments = self.controller.list_tournaments(include_archived=True)
+                    Pager(
+                        len(tournaments),
+                        lambda start, stop: [
                             f"- {tournament.name} "
                             f"({tournament.start_date} → {tournament.end_date}) "
                             f"@ {tournament.location}"
-                        )
+                            + (" [archivé]" if isinstance(tournament, ArchivedTournament) else "")
+                            for tournament in tournaments[start:stop]
+                        ],
+                    ).show()
                 elif user_choice == "3":
-                    tournament = self._select_tournament()
+                    tournament = self._select_tournament(include_archived=True)
                     if tournament:
                         print(f"{tournament.name}: {tournament.start_date} → {tournament.end_date}")
                 elif user_choice == "4":
-                    tournament = self._select_tournament()
+                    tournament = self._select_tournament(include_archived=True)
                     if tournament:
                         from storage.json_store import JsonStore
                         from controllers.player_controller import PlayerController
@@ -89,32 +172,85 @@ class TournamentView:
                         tournament_players.sort(
                             key=lambda p: (p.last_name.lower(), p.first_name.lower())
                         )
-                        for player in tournament_players:
-                            print(
-                                f"- {player.last_name.upper()}, "
-                                f"{player.first_name} [{player.player_id}]"
-                            )
+                        self._page_players(tournament_players)
                 elif user_choice == "5":
-                    tournament = self._select_tournament()
+                    tournament = self._select_tournament(include_archived=True)
                     if tournament:
                         from storage.json_store import JsonStore
                         from controllers.player_controller import PlayerController
                         player_controller = PlayerController(JsonStore())
-                        for round_obj in tournament.rounds:
-                            print(
-                                f"\n{round_obj.name} "
-                                f"({round_obj.start_datetime} → {round_obj.end_datetime or '...'})"
-                            )
-                            for match_index, match in enumerate(round_obj.matches, start=1):
-                                (player_a_id, score_a), (player_b_id, score_b) = match
-                                player_a = player_controller.get(player_a_id)
-                                player_b = player_controller.get(player_b_id)
-                                name_a = f"{player_a.full_name} [{player_a_id}]" if player_a else player_a_id
-                                name_b = f"{player_b.full_name} [{player_b_id}]" if player_b else player_b_id
-                                print(
-                                    f"  {match_index}. {name_a} {score_a} - "
-                                    f"{score_b} {name_b}"
-                                )
+                        rounds = [
+                            (f"{round_obj.name} — section {name}" if name else round_obj.name, round_obj)
+                            for name, division in tournament.divisions()
+                            for round_obj in division.rounds
+                        ]
+                        # Une ligne par titre de tour ou par match ; seules les lignes visibles sont formatées
+                        rows = [
+                            row
+                            for title, round_obj in rounds
+                            for row in [(title, round_obj, None, False)] + [
+                                (None, match, match_index, match_index - 1 in round_obj.forfeits)
+                                for match_index, match in enumerate(round_obj.matches, 1)
+                            ]
+                        ]
+
+                        def name_of(player_id: str) -> str:
+                            player = player_controller.get(player_id)
+                            return f"{player.full_name} [{player_id}]" if player else player_id
+
+                        def render(start: int, stop: int) -> list[str]:
+                            lines = []
+                            for title, item, match_index, forfeited in rows[start:stop]:
+                                if title is not None:
+                                    lines.append(f"\n{title} ({item.start_datetime} → {item.end_datetime or '...'})")
+                                else:
+                                    (player_a_id, score_a), (player_b_id, score_b) = item
+                                    if player_b_id == BYE:
+                                        lines.append(f"  {match_index}. {name_of(player_a_id)} exempt ({score_a})")
+                                        continue
+                                    lines.append(
+                                        f"  {match_index}. {name_of(player_a_id)} {score_a} - "
+                                        f"{score_b} {name_of(player_b_id)}"
+                                        + (" (forfait)" if forfeited else "")
+                                    )
+                            return lines
+
+                        Pager(len(rows), render).show()
+                elif user_choice == "6":
+                    self._print_timing(self.controller.timing_report())
+                elif user_choice == "7":
+                    tournament = self._select_tournament(include_archived=True)
+                    if tournament:
+                        path = input("Fichier PGN [parties.pgn]: ").strip() or "parties.pgn"
+                        try:
+                            with open(path, "wb") as handle:
+                                copied = self.controller.export_pgn(tournament, handle)
+                            print(f"Exporté dans {path} ({copied} partie(s) avec les coups).")
+                        except (OSError, ValueError) as error:
+                            print(f"Erreur: {error}")
+                elif user_choice == "8":
+                    player_id = ask_national_id()
+                    self._print_stats("Toutes compétitions", self.controller.player_stats(player_id))
+                    tournament = self._select_tournament(include_archived=True)
+                    if tournament:
+                        self._print_stats(tournament.name, self.controller.player_stats(player_id, tournament))
+                elif user_choice == "9":
+                    print("Statistique : " + ", ".join(
+                        f"{number}. {label}" for number, (_, label) in enumerate(LEADERBOARD_CHOICES, start=1)
+                    ))
+                    choice = read_int("> ", default=1)
+                    if not 1 <= choice <= len(LEADERBOARD_CHOICES):
+                        print("Choix invalide.")
+                        continue
+                    metric, label = LEADERBOARD_CHOICES[choice - 1]
+                    min_games = read_int("Parties jouées au minimum [9]: ", default=9)
+                    since = input("Depuis le (YYYY-MM-DD) [toujours]: ").strip() or None
+                    rows = self.controller.leaderboard(metric, min_games, limit=20, since=since)
+                    print(f"\n{label} (au moins {min_games} parties) :")
+                    for rank, row in enumerate(rows, start=1):
+                        value = getattr(row, metric)
+                        value = f"{value:.0%}" if metric == "score_rate" else f"{value:.0f}"
+                        print(f"{rank:>3}. {row.player_id}  {value}  ({row.games} parties, {row.points:g} pts)")
                 elif user_choice == "0":
                     break
                 else:
@@ -134,6 +270,7 @@ class TournamentView:
                 print("6. Terminer le tour en cours")
                 print("7. Réinitialiser un tournoi")
                 print("8. Rapports")
+                print("9. Importer des parties (PGN)")
                 print("0. Retour")
                 user_choice = input("> ").strip()
                 if user_choice == "1":
@@ -142,8 +279,17 @@ class TournamentView:
                     start_date, end_date = ask_tournament_dates()
                     num_rounds = read_int("Nombre de tours [4]: ", default=4)
                     description = input("Description: ").strip()
+                    print("Appariement : 1. Suisse  2. Couplage optimal  3. Toutes-rondes  4. Double toutes-rondes")
+                    system_choice = read_int("Système [1]: ", default=1)
+                    pairing_system = PAIRING_CHOICES.get(system_choice, "swiss")
+                    sections = []
+                    if pairing_system in ("swiss", "matching"):
+                        sections = read_sections("Sections par classement (ex: A:1800,B:1400,C:0) [aucune]: ")
                     tournament = self.controller.create_tournament(
-                        name, location, start_date, end_date, num_rounds, description
+                        name, location, start_date, end_date, num_rounds, description,
+                        pairing_system=pairing_system,
+                        sections=sections,
+                        time_control=ask_time_control(),
                     )
                     print(f"Créé: {tournament.name}")
                 elif user_choice == "2":
@@ -178,6 +324,7 @@ class TournamentView:
                 elif user_choice == "5":
                     tournament = self._select_tournament()
                     if tournament:
+                        section = input("Section: ").strip() if tournament.sections else None
                         round_index = read_int("Index du tour (1…n): ") - 1
                         match_index = read_int("Index du match (1…n): ") - 1
                         score_player_a = read_float("Score joueur 1 (1/0.5/0): ")
@@ -189,6 +336,7 @@ class TournamentView:
                                 match_index,
                                 score_player_a,
                                 score_player_b,
+                                section=section,
                             )
                             print("Résultat enregistré.")
                         except Exception as error:
@@ -211,6 +359,17 @@ class TournamentView:
                             print(f"Erreur: {error}")
                 elif user_choice == "8":
                     self.reports()
+                elif user_choice == "9":
+                    tournament = self._select_tournament()
+                    if tournament:
+                        section = input("Section: ").strip() if tournament.sections else None
+                        path = input("Fichier PGN: ").strip()
+                        try:
+                            with open(path, encoding="utf-8") as handle:
+                                imported = self.controller.import_pgn(tournament, handle.read(), section)
+                            print(f"{imported} partie(s) importée(s).")
+                        except (OSError, ValueError) as error:
+                            print(f"Erreur: {error}")
                 elif user_choice == "0":
                     break
                 else: